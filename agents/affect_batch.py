@@ -0,0 +1,137 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from agents.affect_vector_agent import AffectVectorAgent, AffectState
+from agents.regulation_agent import RegulationAgent, RegulationTarget
+
+
+DIMS = AffectVectorAgent.DIMS
+SOURCES = ("emotion", "event", "micro", "context")
+EMOTIONS = tuple(AffectVectorAgent.EMO_MAP)
+GUIDANCE_KEYS = tuple(RegulationAgent.GUIDANCE)
+
+# Skaler calculate() ile birebir aynı katsayılar (boyut sırası: DIMS)
+_EMO_TABLE = np.array(
+    [[AffectVectorAgent.EMO_MAP[e][d] for d in DIMS] for e in EMOTIONS],
+    dtype=np.int64
+)
+_EVENT_UP = np.array([+10, +6, 0, 0, +4], dtype=np.float64)
+_EVENT_DOWN = np.array([-10, +8, -10, -14, +10], dtype=np.float64)
+_MICRO = np.array([3, 1, 7, 2, -1], dtype=np.int64)
+_CTX_DARK = np.array([0, -3, -2, +2, 0], dtype=np.int64)
+_CTX_COLD = np.array([0, 0, -5, -2, 0], dtype=np.int64)
+_CTX_COOL = np.array([0, 0, -3, -1, 0], dtype=np.int64)
+_CTX_WEEKDAY = np.array([0, 0, 0, -2, +2], dtype=np.int64)
+
+
+@dataclass
+class AffectBatch:
+    state: np.ndarray           # (N, 5) 0–100
+    breakdown: np.ndarray       # (N, 4, 5) SOURCES × DIMS; base her zaman 50
+    delta: np.ndarray           # (N, 5) target - state
+    guidance_mask: np.ndarray   # (N, len(GUIDANCE_KEYS)) bool
+
+    def __len__(self) -> int:
+        return self.state.shape[0]
+
+    def affect_state(self, i: int) -> AffectState:
+        return AffectState(*(int(v) for v in self.state[i]))
+
+    def breakdown_dict(self, i: int) -> Dict[str, Dict[str, int]]:
+        out = {"base": {d: 50 for d in DIMS}}
+        for s, src in enumerate(SOURCES):
+            out[src] = {d: int(v) for d, v in zip(DIMS, self.breakdown[i, s])}
+        return out
+
+    def delta_dict(self, i: int) -> Dict[str, int]:
+        return {d: int(v) for d, v in zip(DIMS, self.delta[i])}
+
+    def guidance(self, i: int) -> List[str]:
+        return [
+            RegulationAgent.GUIDANCE[k]
+            for k, on in zip(GUIDANCE_KEYS, self.guidance_mask[i]) if on
+        ]
+
+
+def _encode(values: Sequence, vocab: Sequence[str], default: int) -> np.ndarray:
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int64)
+    # Benzersiz değerleri bir kez eşle → N büyük olsa da sözlük araması az
+    uniques, inverse = np.unique(arr.astype(str), return_inverse=True)
+    index = {v: i for i, v in enumerate(vocab)}
+    codes = np.array([index.get(u, default) for u in uniques], dtype=np.int64)
+    return codes[inverse]
+
+
+def score_batch(
+    emotions: Sequence,
+    event_types: Sequence,
+    event_intensities: Sequence[float],
+    micro_scores: Sequence[int],
+    is_dark: Sequence[bool],
+    temperatures: Sequence[float],
+    weekday: Sequence[bool],
+    target: RegulationTarget | None = None
+) -> AffectBatch:
+    """
+    AffectVectorAgent.calculate + RegulationAgent.plan'in vektörize hali.
+    emotions: etiket ya da EMOTIONS sırasına göre id. Sonuçlar skaler yol
+    ile birebir aynıdır.
+    """
+    emo_ids = _encode(emotions, EMOTIONS, EMOTIONS.index("nötr"))
+    n = emo_ids.shape[0]
+
+    ev = np.asarray(["" if e is None else e for e in event_types], dtype=str)
+    up = ev == "energy_up"
+    down = np.isin(ev, ("pressure", "stress", "energy_down"))
+
+    breakdown = np.zeros((n, len(SOURCES), len(DIMS)), dtype=np.int64)
+
+    # 1) DUYGU
+    breakdown[:, 0] = _EMO_TABLE[emo_ids]
+
+    # 2) OLAY — int() sıfıra doğru keser → np.trunc
+    it = np.clip(np.asarray(event_intensities, dtype=np.float64), 0.0, 1.0)
+    eff_up = np.maximum(it, 0.3)[:, None]
+    eff_down = np.maximum(it, 0.4)[:, None]
+    event = np.zeros((n, len(DIMS)), dtype=np.float64)
+    event = np.where(up[:, None], np.trunc(_EVENT_UP * eff_up), event)
+    event = np.where(down[:, None], np.trunc(_EVENT_DOWN * eff_down), event)
+    breakdown[:, 1] = event.astype(np.int64)
+
+    # 3) MİKRO SİNYAL
+    breakdown[:, 2] = np.asarray(micro_scores, dtype=np.int64)[:, None] * _MICRO
+
+    # 4) BAĞLAM
+    temp = np.asarray(temperatures, dtype=np.float64)
+    cold = temp < 5
+    cool = ~cold & (temp < 10)
+    breakdown[:, 3] = (
+        np.asarray(is_dark, dtype=bool)[:, None] * _CTX_DARK
+        + cold[:, None] * _CTX_COLD
+        + cool[:, None] * _CTX_COOL
+        + np.asarray(weekday, dtype=bool)[:, None] * _CTX_WEEKDAY
+    )
+
+    state = np.clip(50 + breakdown.sum(axis=1), 0, 100)
+
+    # REGÜLASYON
+    t = target or RegulationAgent().default_target
+    target_vec = np.array([getattr(t, d) for d in DIMS], dtype=np.int64)
+    delta = target_vec - state
+
+    v, a, pc, ec, ei = (delta[:, k] for k in range(len(DIMS)))
+    mask = np.stack([
+        v >= 10, v <= -10,
+        a >= 10, a <= -10,
+        pc >= 10,
+        ec >= 10,
+        ei <= -10, ei >= 10,
+    ], axis=1)
+    mask = np.concatenate([mask, ~mask.any(axis=1, keepdims=True)], axis=1)
+
+    return AffectBatch(state=state, breakdown=breakdown, delta=delta, guidance_mask=mask)
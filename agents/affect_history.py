@@ -0,0 +1,348 @@
+from __future__ import annotations
+import os
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:   # Windows: süreçler arası kilit yok, thread kilidi yeterli
+    fcntl = None
+
+from agents.affect_vector_agent import AffectVectorAgent, AffectState
+
+
+DIMS = AffectVectorAgent.DIMS
+EMOTIONS = tuple(AffectVectorAgent.EMO_MAP)
+UNKNOWN_EMOTION = 255
+DAY = 86400.0
+
+# Sabit genişlikli kayıt (32 bayt): zaman, duygu id, 5 boyut state, 5 boyut delta, parça hash
+RECORD_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("emotion", "u1"),
+    ("state", "u1", (5,)),
+    ("delta", "i1", (5,)),
+    ("_pad", "V5"),
+    ("track", "<u8"),
+])
+assert RECORD_DTYPE.itemsize == 32
+
+
+def default_history_dir() -> str:
+    return os.getenv(
+        "MOOD2MUSIC_HISTORY_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "mood2music", "history")
+    )
+
+
+def track_hash(track_id: str | None) -> int:
+    if not track_id:
+        return 0
+    return int.from_bytes(hashlib.blake2b(track_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class AffectHistory:
+    """
+    Append-only, memory-mapped affect geçmişi.
+
+    records.bin  : RECORD_DTYPE kayıtları (zaman sırasına göre)
+    days.npy     : gün başına ilk kayıt indeksi (yalnızca hızlandırıcı; veriden
+                   yeniden kurulabilir)
+    tracks.tsv   : parça hash → id (her parça bir kez yazılır)
+
+    Sorgular np.memmap üzerinde vektörize çalışır; kayıtlar Python nesnesine
+    dönüştürülmez. Zaman damgaları azalmayan tutulur (geri giden saat son
+    kaydın zamanına çekilir) → aralıklar searchsorted ile bulunur.
+    """
+
+    def __init__(self, path: str | None = None, tz_offset: float | None = None):
+        self.path = path or default_history_dir()
+        os.makedirs(self.path, exist_ok=True)
+        self.data_path = os.path.join(self.path, "records.bin")
+        self.days_path = os.path.join(self.path, "days.npy")
+        self.tracks_path = os.path.join(self.path, "tracks.tsv")
+
+        # Gün sınırları yerel saate göre (varsayılan: sistem saat dilimi)
+        self.tz_offset = time.localtime().tm_gmtoff if tz_offset is None else tz_offset
+
+        self._lock = threading.Lock()
+        self._map: Optional[np.memmap] = None
+        self._n = 0
+        self._days = np.empty(0, dtype=np.int64)     # gün numarası
+        self._day_start = np.empty(0, dtype=np.int64)  # o günün ilk kayıt indeksi
+        self._tracks: Optional[Dict[int, str]] = None
+
+        self._repair()
+        self._load_day_index()
+        self._sync()
+
+    # ================= WRITE =================
+    def append(
+        self,
+        emotion: str,
+        state: AffectState,
+        delta: Dict[str, int],
+        track_id: str | None = None,
+        ts: float | None = None
+    ) -> None:
+        rec = np.zeros(1, dtype=RECORD_DTYPE)
+        rec["emotion"] = EMOTIONS.index(emotion) if emotion in EMOTIONS else UNKNOWN_EMOTION
+        rec["state"] = [getattr(state, d) for d in DIMS]
+        rec["delta"] = [max(-128, min(127, int(delta.get(d, 0)))) for d in DIMS]
+        rec["track"] = track_hash(track_id)
+
+        with self._lock, open(self.data_path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._sync()
+                now = time.time() if ts is None else ts
+                last = float(self._map["ts"][-1]) if self._n else now
+                rec["ts"] = max(now, last)
+                f.write(rec.tobytes())
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+        if track_id:
+            self._remember_track(rec["track"][0], track_id)
+
+    def append_result(self, result, ts: float | None = None) -> None:
+        """CoordinatorResult → tek kayıt."""
+        music = result.music or {}
+        self.append(
+            emotion=result.final_emotion,
+            state=result.affect_state,
+            delta=result.regulation.delta,
+            track_id=music.get("spotify_url") or music.get("track"),
+            ts=ts,
+        )
+
+    # ================= READ =================
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return self._n
+
+    def records(self) -> np.ndarray:
+        """Tüm kayıtlar (salt okunur memmap görünümü)."""
+        with self._lock:
+            self._sync()
+            return self._view(0, self._n)
+
+    def last(self, n: int) -> np.ndarray:
+        with self._lock:
+            self._sync()
+            return self._view(max(0, self._n - n), self._n)
+
+    def between(self, t0: float, t1: float) -> np.ndarray:
+        """[t0, t1) aralığındaki kayıtlar; önce gün indeksi, sonra ikili arama."""
+        with self._lock:
+            self._sync()
+            lo, hi = self._range(t0, t1)
+            return self._view(lo, hi)
+
+    def mean_by_period(
+        self,
+        t0: float,
+        t1: float,
+        period: float = 7 * DAY,
+        dims: Sequence[str] = DIMS
+    ) -> List[Tuple[float, int, Dict[str, float]]]:
+        """
+        Aralığı period uzunluğunda kovalara böler; her kova için
+        (kova başlangıcı, kayıt sayısı, boyut ortalamaları). Boş kovalar atlanır.
+        """
+        recs = self.between(t0, t1)
+        if not len(recs):
+            return []
+
+        bucket = ((recs["ts"] - t0) // period).astype(np.int64)
+        n_buckets = int(bucket[-1]) + 1
+        counts = np.bincount(bucket, minlength=n_buckets)
+        cols = [DIMS.index(d) for d in dims]
+        state = recs["state"][:, cols].astype(np.float64)
+        sums = np.stack(
+            [np.bincount(bucket, weights=state[:, j], minlength=n_buckets) for j in range(len(cols))],
+            axis=1
+        )
+
+        out = []
+        for b in np.flatnonzero(counts):
+            means = sums[b] / counts[b]
+            out.append((
+                t0 + b * period,
+                int(counts[b]),
+                {d: float(m) for d, m in zip(dims, means)},
+            ))
+        return out
+
+    def weekly_means(self, weeks: int = 52, now: float | None = None, dims: Sequence[str] = DIMS):
+        """Örn. son bir yıl için haftalık ortalama valence: weekly_means(52, dims=["valence"])."""
+        t1 = time.time() if now is None else now
+        return self.mean_by_period(t1 - weeks * 7 * DAY, t1, 7 * DAY, dims)
+
+    def emotion_name(self, emotion_id: int) -> str:
+        return EMOTIONS[emotion_id] if emotion_id < len(EMOTIONS) else "?"
+
+    def track_id(self, h: int) -> Optional[str]:
+        return self._load_tracks().get(int(h))
+
+    # ================= INTERNAL =================
+    def _day(self, ts):
+        return np.floor((np.asarray(ts) + self.tz_offset) / DAY).astype(np.int64)
+
+    def _view(self, lo: int, hi: int) -> np.ndarray:
+        if self._map is None or hi <= lo:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return self._map[lo:hi]
+
+    def _range(self, t0: float, t1: float) -> Tuple[int, int]:
+        if not self._n:
+            return 0, 0
+        # Gün indeksiyle kaba aralık → yalnızca o günlerin içinde ikili arama
+        d0, d1 = int(self._day(t0)), int(self._day(t1))
+        i0 = np.searchsorted(self._days, d0, side="right") - 1
+        i1 = np.searchsorted(self._days, d1, side="right")
+        lo = int(self._day_start[i0]) if i0 >= 0 else 0
+        hi = int(self._day_start[i1]) if i1 < len(self._days) else self._n
+        ts = self._map["ts"][lo:hi]
+        return lo + int(np.searchsorted(ts, t0, "left")), lo + int(np.searchsorted(ts, t1, "left"))
+
+    def _repair(self) -> None:
+        # Yarım yazılmış son kayıt (çökme) → kes. append ile aynı kilit altında:
+        # başka sürecin o an yazmakta olduğu kayıt yarım sanılıp kesilmesin
+        if not os.path.exists(self.data_path):
+            return
+        try:
+            with open(self.data_path, "r+b") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    size = os.fstat(f.fileno()).st_size
+                    extra = size % RECORD_DTYPE.itemsize
+                    if extra:
+                        f.truncate(size - extra)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+        except OSError:
+            pass
+
+    def _sync(self) -> None:
+        """Dosya büyüdüyse (bu ya da başka süreç) memmap'i ve gün indeksini güncelle."""
+        try:
+            n = os.path.getsize(self.data_path) // RECORD_DTYPE.itemsize
+        except OSError:
+            n = 0
+        if n == self._n and self._map is not None:
+            return
+        if n == 0:
+            self._map, self._n = None, 0
+            return
+
+        old_n = self._n
+        self._map = np.memmap(self.data_path, dtype=RECORD_DTYPE, mode="r", shape=(n,))
+        self._n = n
+
+        # Yeni kuyruktaki gün değişimlerini indekse ekle (vektörize);
+        # bilinen son kayıttan başlanır → onun günü indekste zaten var
+        scan_from = max(old_n - 1, 0)
+        days = self._day(self._map["ts"][scan_from:n])
+        starts = np.flatnonzero(np.diff(days)) + 1
+        new_days, new_starts = days[starts], starts + scan_from
+        if not len(self._days):
+            new_days = np.concatenate((days[:1], new_days))
+            new_starts = np.concatenate(([scan_from], new_starts))
+        if len(new_days):
+            self._days = np.concatenate((self._days, new_days))
+            self._day_start = np.concatenate((self._day_start, new_starts))
+            self._save_day_index()
+
+    def _load_day_index(self) -> None:
+        try:
+            idx = np.load(self.days_path)
+            n = os.path.getsize(self.data_path) // RECORD_DTYPE.itemsize
+        except (OSError, ValueError):
+            return
+        if idx.ndim != 2 or idx.shape[1] != 2 or not len(idx) or idx[-1, 1] >= n:
+            return  # bozuk ya da veriden ileride (kesilmiş dosya) → veriden kurulur
+
+        # Son günün ilk kaydı indeksle uyuşmuyorsa (ör. saat dilimi değişti) kullanma
+        rec = np.fromfile(
+            self.data_path, dtype=RECORD_DTYPE, count=1,
+            offset=int(idx[-1, 1]) * RECORD_DTYPE.itemsize
+        )
+        if int(self._day(rec["ts"][0])) != int(idx[-1, 0]):
+            return
+
+        self._days = idx[:, 0].astype(np.int64)
+        self._day_start = idx[:, 1].astype(np.int64)
+        # Tarama son günün ilk kaydından sonra devam eder
+        self._n = int(self._day_start[-1]) + 1
+
+    def _save_day_index(self) -> None:
+        # Süreç / thread'e özgü geçici dosya: eşzamanlı yazanlar birbirinin
+        # yarım dosyasını yerine taşımasın
+        tmp = f"{self.days_path}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+        try:
+            np.save(tmp, np.stack([self._days, self._day_start], axis=1))
+            os.replace(tmp, self.days_path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _load_tracks(self) -> Dict[int, str]:
+        if self._tracks is None:
+            tracks: Dict[int, str] = {}
+            try:
+                with open(self.tracks_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        h, _, tid = line.rstrip("\n").partition("\t")
+                        if tid:
+                            tracks[int(h)] = tid
+            except (OSError, ValueError):
+                pass
+            self._tracks = tracks
+        return self._tracks
+
+    def _remember_track(self, h, track_id: str) -> None:
+        h = int(h)
+        with self._lock:
+            tracks = self._load_tracks()
+            if h in tracks:
+                return
+            tracks[h] = track_id
+            try:
+                with open(self.tracks_path, "a", encoding="utf-8") as f:
+                    f.write(f"{h}\t{track_id}\n")
+            except OSError:
+                pass
+
+
+_default_history: Optional[AffectHistory] = None
+_default_lock = threading.Lock()
+
+
+def get_default_history() -> Optional[AffectHistory]:
+    """
+    Süreç içinde paylaşılan varsayılan geçmiş.
+    MOOD2MUSIC_HISTORY_DISABLED=1 ise None döner.
+    """
+    global _default_history
+    if os.getenv("MOOD2MUSIC_HISTORY_DISABLED") == "1":
+        return None
+    with _default_lock:
+        if _default_history is None:
+            try:
+                _default_history = AffectHistory()
+            except OSError:
+                return None
+        return _default_history
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import math
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+from agents.affect_vector_agent import AffectState
+from agents.regulation_agent import RegulationAgent
+from agents import affect_batch
+
+
+# Olay grupları: (kesme eşikleri için katsayı mutlak değerleri, eff alt sınırı)
+EVENT_GROUPS = {
+    "energy_up": ((10, 6, 4), 0.3),
+    "down": ((10, 8, 14), 0.4),
+}
+DOWN_EVENTS = ("pressure", "stress", "energy_down")
+
+
+@dataclass(frozen=True)
+class AffectTableEntry:
+    # Paylaşılan nesneler: agent'lar çağırana kopyalarını döner
+    state: AffectState
+    breakdown: Dict[str, Dict[str, int]]
+    delta: Dict[str, int]
+    guidance: List[str]
+    debug: str                 # "AffectState: ..." satırı, önceden biçimlenmiş
+
+
+def _threshold(c: int, k: int) -> float:
+    """int(c * x) >= k olan en küçük float x (float yuvarlaması dahil)."""
+    x = k / c
+    if int(c * x) < k:
+        while int(c * x) < k:
+            x = math.nextafter(x, math.inf)
+        return x
+    while int(c * math.nextafter(x, 0.0)) >= k:
+        x = math.nextafter(x, 0.0)
+    return x
+
+
+def _buckets(coefs: Tuple[int, ...], floor: float) -> List[float]:
+    """eff ∈ [floor, 1] aralığında kesilmiş olay deltasının değiştiği noktalar."""
+    points = {
+        _threshold(c, k)
+        for c in set(coefs)
+        for k in range(1, c + 1)
+    }
+    return sorted(p for p in points if floor < p <= 1.0)
+
+
+class AffectTable:
+    """
+    AffectVectorAgent.calculate + RegulationAgent.plan için önceden hesaplanmış tablo.
+    Girdi uzayı ayrık: duygu × olay grubu × yoğunluk kovası × mikro × karanlık ×
+    sıcaklık bandı × hafta içi. Yoğunluk yalnızca int() kesmesinden geçtiği için
+    kesme eşikleri arasında sonuç sabittir → tek sözlük araması yeterli.
+    """
+
+    MICRO_SCORES = (-1, 0, 1)
+
+    def __init__(self):
+        self.breaks = {g: _buckets(c, f) for g, (c, f) in EVENT_GROUPS.items()}
+        self._emo_index = {e: i for i, e in enumerate(affect_batch.EMOTIONS)}
+        self._neutral = self._emo_index["nötr"]
+        self._entries: Dict[tuple, AffectTableEntry] = {}
+        self._plans: Dict[tuple, Tuple[Dict[str, int], List[str], List[str]]] = {}
+        self.target = RegulationAgent().default_target
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ================= LOOKUP =================
+    def lookup(
+        self,
+        emotion: str,
+        event_type: str | None,
+        event_intensity: float,
+        micro_score: int,
+        context: dict
+    ) -> Optional[AffectTableEntry]:
+        """Tablo dışı girdi (ör. mikro skor ∉ {-1,0,1}) için None döner."""
+        if micro_score not in self.MICRO_SCORES:
+            return None
+        temp = context.get("temperature", 10)
+        if not isinstance(temp, (int, float)):
+            return None
+
+        if event_type == "energy_up":
+            group = "energy_up"
+        elif event_type in DOWN_EVENTS:
+            group = "down"
+        else:
+            group = None
+
+        bucket = 0
+        if group is not None:
+            it = max(0.0, min(event_intensity, 1.0))
+            bucket = bisect_right(self.breaks[group], max(it, EVENT_GROUPS[group][1]))
+
+        key = (
+            self._emo_index.get(emotion, self._neutral),
+            group,
+            bucket,
+            micro_score,
+            bool(context.get("is_dark")),
+            0 if temp < 5 else 1 if temp < 10 else 2,
+            context.get("day_type") == "weekday",
+        )
+        return self._entries.get(key)
+
+    def plan_for(self, state: AffectState) -> Optional[Tuple[Dict[str, int], List[str], List[str]]]:
+        """Varsayılan hedefe göre (delta, guidance, debug); tabloda olmayan state → None."""
+        return self._plans.get((
+            state.valence, state.arousal, state.physical_comfort,
+            state.environmental_calm, state.emotional_intensity,
+        ))
+
+    # ================= BUILD =================
+    def _build(self) -> None:
+        # (grup, kova, temsilci yoğunluk, temsilci event_type)
+        events = [(None, 0, 0.0, None)]
+        for group, (_, floor) in EVENT_GROUPS.items():
+            ev = "energy_up" if group == "energy_up" else DOWN_EVENTS[0]
+            reps = [floor] + self.breaks[group]
+            events += [(group, b, x, ev) for b, x in enumerate(reps)]
+
+        temps = (0.0, 5.0, 10.0)   # her bandın temsilcisi
+        keys, cols = [], ([], [], [], [], [], [], [])
+        for emo_id, (group, bucket, it, ev), micro, dark, band, weekday in product(
+            range(len(affect_batch.EMOTIONS)), events, self.MICRO_SCORES,
+            (False, True), range(3), (False, True)
+        ):
+            keys.append((emo_id, group, bucket, micro, dark, band, weekday))
+            for col, v in zip(cols, (emo_id, ev, it, micro, dark, temps[band], weekday)):
+                col.append(v)
+
+        batch = affect_batch.score_batch(*cols, target=self.target)
+        for i, key in enumerate(keys):
+            state = batch.affect_state(i)
+            state_key = tuple(int(v) for v in batch.state[i])
+            if state_key not in self._plans:
+                delta = batch.delta_dict(i)
+                self._plans[state_key] = (
+                    delta,
+                    batch.guidance(i),
+                    [f"Target: {self.target}", f"Delta: {delta}"],
+                )
+            delta, guidance, _ = self._plans[state_key]
+            self._entries[key] = AffectTableEntry(
+                state=state,
+                breakdown=batch.breakdown_dict(i),
+                delta=delta,
+                guidance=guidance,
+                debug=f"AffectState: {state}",
+            )
+
+
+_default_table: Optional[AffectTable] = None
+_default_lock = threading.Lock()
+_warm_lock = threading.Lock()
+_warm_thread: Optional[threading.Thread] = None
+
+
+def get_default_table() -> AffectTable:
+    """Süreç içinde paylaşılan tablo; hazır değilse kurulana kadar bekler."""
+    global _default_table
+    with _default_lock:
+        if _default_table is None:
+            _default_table = AffectTable()
+        return _default_table
+
+
+def warm_default_table() -> Optional[AffectTable]:
+    """
+    Tablo hazırsa döner; değilse kurulumu (tek sefer) arka planda başlatıp
+    None döner. İstek yolu beklemez: tablo hazır olana kadar skaler hesap
+    kullanılır (sonuçlar birebir aynı).
+    """
+    global _warm_thread
+    if _default_table is not None:
+        return _default_table
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(
+                target=get_default_table, name="affect-table", daemon=True
+            )
+            _warm_thread.start()
+    return _default_table
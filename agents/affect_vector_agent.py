@@ -1,5 +1,5 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict, List
 
 
@@ -26,8 +26,22 @@ class AffectVectorAgent:
     Tek skor yok. Her boyut ayrı.
     """
 
-    def __init__(self):
+    DIMS = ("valence", "arousal", "physical_comfort", "environmental_calm", "emotional_intensity")
+
+    EMO_MAP = {
+        "mutluluk":  {"valence": +18, "arousal": +8,  "physical_comfort": +10, "environmental_calm": +6,  "emotional_intensity": +6},
+        "nötr":      {"valence": +0,  "arousal": +0,  "physical_comfort": +0,  "environmental_calm": +0,  "emotional_intensity": +0},
+        "şaşkınlık": {"valence": +2,  "arousal": +10, "physical_comfort": -2,  "environmental_calm": -4, "emotional_intensity": +12},
+        "hüzün":     {"valence": -18, "arousal": -8,  "physical_comfort": -10, "environmental_calm": -6, "emotional_intensity": +6},
+        "korku":     {"valence": -15, "arousal": +12, "physical_comfort": -12, "environmental_calm": -15, "emotional_intensity": +16},
+        "öfke":      {"valence": -12, "arousal": +16, "physical_comfort": -10, "environmental_calm": -12, "emotional_intensity": +18},
+    }
+
+    def __init__(self, use_table: bool = True):
         self.debug: List[str] = []
+        # Ayrık girdi uzayı için önceden hesaplanmış tablo (arka planda kurulur)
+        self.use_table = use_table
+        self._table = None
 
     def calculate(
         self,
@@ -37,6 +51,20 @@ class AffectVectorAgent:
         micro_score: int,
         context: dict
     ) -> AffectOutput:
+        table = self._get_table() if self.use_table else None
+        if table is not None:
+            entry = table.lookup(
+                emotion, event_type, event_intensity, micro_score, context
+            )
+            if entry is not None:
+                self.debug = [entry.debug]
+                # Tablo süreç genelinde paylaşılır → çağırana her seferinde yeni kopya
+                return AffectOutput(
+                    state=replace(entry.state),
+                    breakdown={k: dict(v) for k, v in entry.breakdown.items()},
+                    debug=self.debug
+                )
+
         self.debug = []
         breakdown: Dict[str, Dict[str, int]] = {}
 
@@ -56,15 +84,7 @@ class AffectVectorAgent:
         }
 
         # 1) DUYGU
-        emo_map = {
-            "mutluluk":  {"valence": +18, "arousal": +8,  "physical_comfort": +10, "environmental_calm": +6,  "emotional_intensity": +6},
-            "nötr":      {"valence": +0,  "arousal": +0,  "physical_comfort": +0,  "environmental_calm": +0,  "emotional_intensity": +0},
-            "şaşkınlık": {"valence": +2,  "arousal": +10, "physical_comfort": -2,  "environmental_calm": -4, "emotional_intensity": +12},
-            "hüzün":     {"valence": -18, "arousal": -8,  "physical_comfort": -10, "environmental_calm": -6, "emotional_intensity": +6},
-            "korku":     {"valence": -15, "arousal": +12, "physical_comfort": -12, "environmental_calm": -15, "emotional_intensity": +16},
-            "öfke":      {"valence": -12, "arousal": +16, "physical_comfort": -10, "environmental_calm": -12, "emotional_intensity": +18},
-        }
-        emo_delta = emo_map.get(emotion, emo_map["nötr"])
+        emo_delta = self.EMO_MAP.get(emotion, self.EMO_MAP["nötr"])
         breakdown["emotion"] = dict(emo_delta)
         self._apply(base, emo_delta)
 
@@ -134,6 +154,12 @@ class AffectVectorAgent:
         self.debug.append(f"AffectState: {final}")
         return AffectOutput(state=final, breakdown=breakdown, debug=self.debug)
 
+    def _get_table(self):
+        if self._table is None:
+            from agents.affect_table import warm_default_table
+            self._table = warm_default_table()
+        return self._table
+
     def _apply(self, s: AffectState, d: Dict[str, int]) -> None:
         s.valence += d.get("valence", 0)
         s.arousal += d.get("arousal", 0)
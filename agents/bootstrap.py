@@ -0,0 +1,90 @@
+"""
+Süreç başı ortak kurulum ve başlangıç ölçümü.
+
+- load_env(): .env süreçte bir kez okunur
+- gemini_model(): google.generativeai yalnızca ilk kullanımda import edilir
+- StartupTimer: aşama bazında duvar saati + o aşamada yüklenen modül sayısı
+  (MOOD2MUSIC_STARTUP_REPORT=1 → stderr'e yazılır)
+"""
+from __future__ import annotations
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+
+_env_loaded = False
+_genai = None
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """.env'i yükler; ikinci ve sonraki çağrılar no-op."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def gemini_model(name: str):
+    """
+    GOOGLE_API_KEY yoksa ya da paket kurulu değilse None (import da edilmez).
+    genai.configure süreçte bir kez çağrılır; model oluşturma hatası çağırana fırlar.
+    """
+    global _genai
+    load_env()
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        return None
+
+    with _lock:
+        if _genai is None:
+            try:
+                import google.generativeai as genai
+            except Exception:
+                return None
+            genai.configure(api_key=api_key)
+            _genai = genai
+    return _genai.GenerativeModel(name)
+
+
+# ================= STARTUP REPORT =================
+class StartupTimer:
+    """Başlangıç aşamaları: (ad, süre ms, yeni yüklenen modül sayısı)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, int]] = []
+        self.enabled = os.getenv("MOOD2MUSIC_STARTUP_REPORT") == "1"
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        modules = len(sys.modules)
+        try:
+            yield
+        finally:
+            self._add(name, (time.perf_counter() - start) * 1000.0, len(sys.modules) - modules)
+
+    def mark(self, name: str) -> None:
+        """Süreç başından bu ana kadar geçen süre (örn. ilk pencere çizimi)."""
+        self._add(name, (time.perf_counter() - self.started) * 1000.0, 0)
+
+    def _add(self, name: str, ms: float, modules: int) -> None:
+        with self._lock:
+            self.phases.append((name, ms, modules))
+        if self.enabled:
+            extra = f" (+{modules} modül)" if modules > 0 else ""
+            print(f"[startup] {name:<20} {ms:8.1f} ms{extra}", file=sys.stderr)
+
+    def report(self) -> str:
+        with self._lock:
+            lines = [f"{name:<20} {ms:8.1f} ms  +{modules} modül" for name, ms, modules in self.phases]
+        return "\n".join(lines)
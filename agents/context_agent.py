@@ -3,13 +3,18 @@ from agents.weather_agent import WeatherAgent
 
 
 class ContextAgent:
-    def __init__(self):
-        self.weather_agent = WeatherAgent()
+    def __init__(self, weather_agent: WeatherAgent | None = None):
+        self.weather_agent = weather_agent or WeatherAgent()
 
     def collect(self, city: str) -> dict:
-        now = datetime.now()
+        return self._build(city, self.weather_agent.get_weather(city))
+
+    def fallback(self, city: str) -> dict:
+        """Süre bütçesi dolduğunda: hava durumu beklenmeden varsayılan context."""
+        return self._build(city, WeatherAgent.FALLBACK)
 
-        weather = self.weather_agent.get_weather(city)
+    def _build(self, city: str, weather: dict) -> dict:
+        now = datetime.now()
 
         return {
             "city": city,
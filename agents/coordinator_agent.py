@@ -1,4 +1,8 @@
-from dataclasses import dataclass
+import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import nullcontext
+from dataclasses import dataclass, field, asdict
 from typing import Dict, List
 
 from agents.emotion_agent import EmotionAgent
@@ -8,6 +12,10 @@ from agents.event_agent import EventAgent
 from agents.micro_signal_agent import MicroSignalAgent
 from agents.affect_vector_agent import AffectVectorAgent, AffectState
 from agents.regulation_agent import RegulationAgent, RegulationPlan
+from agents.affect_history import AffectHistory, get_default_history
+from agents.resilience import Deadline, current_deadline
+from agents.bootstrap import load_env
+from agents import telemetry
 
 
 @dataclass
@@ -20,19 +28,96 @@ class CoordinatorResult:
     music: Dict
     micro_activity: str
     debug: List[str]
+    spans: List[telemetry.Span] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        # JSON'a yazılabilir düz sözlük (batch CLI / HTTP API)
+        return asdict(self)
 
 
 class CoordinatorAgent:
-    def __init__(self):
-        self.emotion_agent = EmotionAgent(use_gpu=False)
-        self.context_agent = ContextAgent()
-        self.event_agent = EventAgent()
+    DEADLINE = 8.0          # sn; uçtan uca istek bütçesi (MOOD2MUSIC_DEADLINE, 0 → sınırsız)
+    PARALLEL_SHARE = 0.6    # bütçenin Emotion / Event / Context aşamasına ayrılan payı
+
+    def __init__(
+        self,
+        parallel_stages: bool = True,
+        background_model_load: bool = True,
+        wait_for_model: bool = False,
+        emotion_agent: EmotionAgent | None = None,
+        event_agent: EventAgent | None = None,
+        context_agent: ContextAgent | None = None,
+        spotify_agent: SpotifyAgent | None = None,
+        history: AffectHistory | None = None,
+        deadline: float | None = None
+    ):
+        load_env()
+        # Agent'lar dışarıdan verilebilir (benchmark / test sahteleri için)
+        # BERT arka planda ısınır; hazır olana kadar Rule + LLM sonucu döner
+        self.emotion_agent = emotion_agent or EmotionAgent(
+            use_gpu=False, background_load=background_model_load
+        )
+        self.wait_for_model = wait_for_model
+        self.context_agent = context_agent or ContextAgent()
+        self.event_agent = event_agent or EventAgent()
         self.micro_agent = MicroSignalAgent()
         self.affect_agent = AffectVectorAgent()
         self.regulation_agent = RegulationAgent()
-        self.spotify_agent = SpotifyAgent()
+        # Affect / regulation tablosu başlangıçta arka planda kurulur; hazır
+        # olana kadar istekler skaler hesaba düşer (istek yolunda kurulmaz)
+        from agents.affect_table import warm_default_table
+        warm_default_table()
+        self.spotify_agent = spotify_agent or SpotifyAgent()
+
+        # Emotion / Event / Context birbirinden bağımsız → aynı anda başlatılır
+        self.parallel_stages = parallel_stages
+        self._executor = (
+            ThreadPoolExecutor(max_workers=3, thread_name_prefix="coordinator")
+            if parallel_stages else None
+        )
+
+        # Stage süreleri → telemetry.METRICS (+ MOOD2MUSIC_TRACE_FILE varsa JSONL)
+        self.metrics = telemetry.METRICS
+        self.trace_writer = telemetry.default_trace_writer()
+
+        # Bağımlılıklar (Gemini / WeatherAPI / Spotify) kalan bütçeyle sınırlanır;
+        # süre dolan aşama beklenmez, fallback sonucu kullanılır
+        self.deadline = (
+            deadline if deadline is not None
+            else float(os.getenv("MOOD2MUSIC_DEADLINE", self.DEADLINE))
+        )
+
+        # Her sonuç append-only geçmişe tek kayıt (MOOD2MUSIC_HISTORY_DISABLED=1 → kapalı)
+        self.history = history if history is not None else get_default_history()
 
     def process(
+        self,
+        user_text: str,
+        city: str,
+        event_text: str | None,
+        micro_input: int,
+        deadline: float | None = None
+    ) -> CoordinatorResult:
+        """deadline: bu çağrı için süre bütçesi (sn); verilmezse self.deadline."""
+
+        budget = self.deadline if deadline is None else deadline
+        scope = Deadline(budget).activate() if budget > 0 else nullcontext()
+        trace = telemetry.Trace()
+        with trace.activate(), scope, telemetry.span("total"):
+            result = self._process(user_text, city, event_text, micro_input)
+
+        result.spans = list(trace.spans)
+        self.metrics.observe_trace(trace)
+        if self.trace_writer is not None:
+            self.trace_writer.write(trace)
+        if self.history is not None:
+            try:
+                self.history.append_result(result)
+            except OSError:
+                pass  # geçmiş yazılamazsa sonuç yine döner
+        return result
+
+    def _process(
         self,
         user_text: str,
         city: str,
@@ -42,47 +127,74 @@ class CoordinatorAgent:
 
         debug: List[str] = []
 
-        # 1️⃣ Emotion
-        emo = self.emotion_agent.analyze(user_text)
-        debug.extend(emo.debug)
+        # Paralel aşama kalan bütçenin bir payıyla sınırlı; worker'lar bu
+        # deadline'ı contextvars kopyasıyla görür
+        outer = current_deadline()
+        stage_deadline = outer.sub(self.PARALLEL_SHARE) if outer is not None else None
+        scope = stage_deadline.activate() if stage_deadline is not None else nullcontext()
 
-        # 2️⃣ Event
-        event = self.event_agent.analyze(event_text)
-        debug.extend(event.debug)
+        with scope:
+            if self._executor is not None:
+                emo_f = self._submit("emotion", self.emotion_agent.analyze, user_text, self.wait_for_model)
+                event_f = self._submit("event", self.event_agent.analyze, event_text)
+                context_f = self._submit("context", self.context_agent.collect, city)
+            else:
+                emo_f = event_f = context_f = None
 
-        # 3️⃣ Micro signal
-        micro_score = self.micro_agent.score(micro_input)
-        debug.append(f"Mikro sinyal skoru: {micro_score}")
+            # 1️⃣ Emotion
+            emo = self._stage_result(
+                "emotion", emo_f, stage_deadline,
+                (self.emotion_agent.analyze, user_text, self.wait_for_model),
+                (self.emotion_agent.analyze_fallback, user_text)
+            )
+            debug.extend(emo.debug)
 
-        # 4️⃣ Context
-        context = self.context_agent.collect(city)
-        debug.append(f"Context: {context}")
+            # 2️⃣ Event
+            event = self._stage_result(
+                "event", event_f, stage_deadline,
+                (self.event_agent.analyze, event_text),
+                (self.event_agent.analyze_rules, event_text)
+            )
+            debug.extend(event.debug)
+
+            # 3️⃣ Micro signal
+            micro_score = self._timed("micro", self.micro_agent.score, micro_input)
+            debug.append(f"Mikro sinyal skoru: {micro_score}")
+
+            # 4️⃣ Context
+            context = self._stage_result(
+                "context", context_f, stage_deadline,
+                (self.context_agent.collect, city),
+                (self.context_agent.fallback, city)
+            )
+            debug.append(f"Context: {context}")
 
         # 5️⃣ Affect vector
-        affect = self.affect_agent.calculate(
-            emotion=emo.final_emotion,
-            event_type=event.event_type,
-            event_intensity=event.intensity,
-            micro_score=micro_score,
-            context=context
-        )
+        with telemetry.span("affect"):
+            affect = self.affect_agent.calculate(
+                emotion=emo.final_emotion,
+                event_type=event.event_type,
+                event_intensity=event.intensity,
+                micro_score=micro_score,
+                context=context
+            )
         debug.extend(affect.debug)
 
         # 6️⃣ Regulation
-        regulation = self.regulation_agent.plan(affect.state)
+        regulation = self._timed("regulation", self.regulation_agent.plan, affect.state)
         debug.extend(regulation.debug)
 
         # 7️⃣ Music
-        music = self.spotify_agent.recommend(
-            emotion=emo.final_emotion,
-            state=affect.state,
-            plan=regulation
-        )
+        with telemetry.span("spotify"):
+            music = self.spotify_agent.recommend(
+                emotion=emo.final_emotion,
+                state=affect.state,
+                plan=regulation
+            )
 
         # 8️⃣ MICRO ACTIVITY
-        micro_activity = self._micro_activity(
-            emo.final_emotion,
-            regulation
+        micro_activity = self._timed(
+            "micro_activity", self._micro_activity, emo.final_emotion, regulation
         )
 
         return CoordinatorResult(
@@ -96,6 +208,55 @@ class CoordinatorAgent:
             debug=debug
         )
 
+    # ================= STAGES =================
+    def _timed(self, stage: str, fn, *args):
+        with telemetry.span(stage):
+            return fn(*args)
+
+    def _stage_result(self, stage: str, future, deadline: Deadline | None, call: tuple, fallback: tuple):
+        """
+        Paralel aşamanın sonucunu deadline'a kadar bekler; süre dolarsa
+        (ya da sıralı modda aşama başlamadan bütçe bittiyse) fallback döner.
+        """
+        if future is not None:
+            try:
+                result, spans, error = future.result(
+                    timeout=deadline.remaining() if deadline is not None else None
+                )
+            except FutureTimeout:
+                future.cancel()
+            else:
+                trace = telemetry.current_trace()
+                if trace is not None:
+                    trace.extend(spans)
+                if error is not None:
+                    raise error
+                return result
+        elif deadline is None or not deadline.expired():
+            return self._timed(stage, *call)
+
+        with telemetry.span(stage) as sp:
+            sp.outcome = telemetry.TIMEOUT
+            return fallback[0](*fallback[1:])
+
+    def _submit(self, stage: str, fn, *args):
+        # Deadline worker thread'e contextvars kopyası ile taşınır
+        ctx = contextvars.copy_context()
+        return self._executor.submit(ctx.run, self._run_stage, stage, fn, *args)
+
+    def _run_stage(self, stage: str, fn, *args):
+        """
+        Worker span'lerini kendi trace'ine yazar; (sonuç, span'ler, hata) döner.
+        Span'ler isteğin trace'ine ancak sonuç deadline içinde alınırsa eklenir:
+        süresi dolup terk edilen aşamanın geç kayıtları trace'e karışmaz.
+        """
+        trace = telemetry.Trace()
+        try:
+            with trace.activate():
+                return self._timed(stage, fn, *args), trace.spans, None
+        except Exception as e:
+            return None, trace.spans, e
+
     # ================= MICRO ACTIVITY =================
     def _micro_activity(
         self,
@@ -2,19 +2,27 @@ from __future__ import annotations
 import os
 import re
 import json
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from dotenv import load_dotenv
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from agents import telemetry
+from agents.bootstrap import gemini_model, load_env
+from agents.llm_batch import classify_in_batches
+from agents.micro_batcher import MicroBatcher
+from agents.resilience import (
+    DeadlineExceeded, CircuitOpenError, call_with_timeout, current_deadline, get_breaker,
+    timeout_for
+)
+from agents.result_cache import ResultCache, get_default_cache
+from agents.phrase_matcher import PhraseMatcher, SUBSTRING, TOKEN, WORD
 
-load_dotenv()
+if TYPE_CHECKING:
+    from agents.sentiment_backends import BackendReport
 
-try:
-    import google.generativeai as genai
-except Exception:
-    genai = None
+# torch / transformers / sentiment_backends yalnızca model yüklenirken import
+# edilir (background_load=True ise arka plan thread'inde)
 
 
 # ================= OUTPUT =================
@@ -27,23 +35,77 @@ class EmotionOutput:
     debug: List[str]
 
 
+@dataclass
+class EmotionPreview:
+    text: str                   # normalize edilmiş metin
+    rule_label: str
+    ml_label: Optional[str]     # BERT çalışmadıysa None
+
+
 # ================= AGENT =================
 class EmotionAgent:
     HF_MODEL = "savasy/bert-base-turkish-sentiment-cased"
     EMOTIONS = ["mutluluk", "hüzün", "öfke", "korku", "şaşkınlık", "nötr"]
-
-    def __init__(self, use_gpu: bool = False):
+    ML_BATCH_SIZE = 16
+    LLM_BATCH_SIZE = 20
+    WARMUP_TEXT = "bugün kendimi iyi hissediyorum"
+    ML_CACHE_VERSION = "v1"
+    ML_MEMO_SIZE = 256          # süreç içi son BERT sonuçları (önizleme → analiz)
+    LLM_PROMPT_VERSION = "v1"    # prompt değişirse artır → eski cache geçersiz
+    LLM_TIMEOUT = 6.0            # sn; generate_content'in kendi timeout'u yok
+
+    def __init__(
+        self,
+        use_gpu: bool = False,
+        background_load: bool = False,
+        backend: str | None = None,
+        cache: ResultCache | None = None,
+        llm=None,
+        micro_batch: bool | None = None
+    ):
+        load_env()
         self.debug: List[str] = []
 
-        # ---------- ML MODEL ----------
-        self.tokenizer = AutoTokenizer.from_pretrained(self.HF_MODEL)
-        self.model = AutoModelForSequenceClassification.from_pretrained(self.HF_MODEL)
-        self.model.eval()
+        # ---------- RESULT CACHE ----------
+        self.cache = cache if cache is not None else get_default_cache()
 
-        self.device = torch.device(
-            "cuda" if use_gpu and torch.cuda.is_available() else "cpu"
-        )
-        self.model.to(self.device)
+        # ---------- ML MODEL ----------
+        # backend: eager | torchscript | onnx | int8 (eager dışındakiler CPU)
+        self.backend_name = backend or os.getenv("EMOTION_BACKEND", "eager")
+        self.use_gpu = use_gpu
+        self.device = "cpu"     # cuda kontrolü torch yüklenince (_load_model)
+        self.tokenizer = None
+        self.model = None
+        self.backend = None
+        self.model_error: Optional[Exception] = None
+        self._model_ready = threading.Event()
+
+        # Önizlemede hesaplanan BERT sonuçları analyze'da tekrar kullanılır;
+        # disk cache kapalı olsa bile çalışır
+        self._ml_memo: "OrderedDict[str, str]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+        # ---------- MICRO-BATCHING ----------
+        # Eşzamanlı analyze çağrılarının BERT adımı tek padding'li batch'te birleşir
+        # (agent birden çok thread arasında paylaşıldığında anlamlı)
+        if micro_batch is None:
+            micro_batch = os.getenv("EMOTION_MICRO_BATCH") == "1"
+        self.batcher: Optional[MicroBatcher] = None
+        if micro_batch:
+            self.batcher = MicroBatcher(
+                lambda texts: self._ml_infer_batch(texts, len(texts)),
+                max_batch_size=int(os.getenv("EMOTION_MICRO_BATCH_SIZE", self.ML_BATCH_SIZE)),
+                max_wait_ms=float(os.getenv("EMOTION_MICRO_BATCH_WAIT_MS", "2")),
+                name="emotion.ml",
+            )
+
+        if background_load:
+            # Model arka planda yüklenir; pencere / ilk sonuç beklemez
+            threading.Thread(
+                target=self._load_model, name="bert-warmup", daemon=True
+            ).start()
+        else:
+            self._load_model(raise_errors=True)
 
         # ---------- RULE-BASED ----------
         self.negations = [
@@ -88,32 +150,178 @@ class EmotionAgent:
             ],
         }
 
-        # ---------- LLM ----------
-        api_key = os.getenv("GOOGLE_API_KEY")
-        self.llm_enabled = bool(api_key) and genai is not None
+        # Tüm rule sözlükleri tek seferde derlenir → tek geçişte eşleşme
+        self.matcher = self._build_matcher()
 
-        if self.llm_enabled:
-            genai.configure(api_key=api_key)
+        # ---------- LLM ----------
+        # llm verilirse (örn. llm_batch.LocalStubModel) Gemini yerine kullanılır
+        # Anahtar yoksa google.generativeai hiç import edilmez
+        if llm is not None:
+            self.llm_model_name = getattr(llm, "model_name", type(llm).__name__)
+            self.llm = llm
+        else:
             try:
-                self.llm = genai.GenerativeModel("gemini-2.5-flash-lite")
+                self.llm_model_name = "gemini-2.5-flash-lite"
+                self.llm = gemini_model(self.llm_model_name)
             except Exception:
-                self.llm = genai.GenerativeModel("models/gemini-flash-latest")
-        else:
-            self.llm = None
+                self.llm_model_name = "models/gemini-flash-latest"
+                self.llm = gemini_model(self.llm_model_name)
+            if self.llm is None:
+                self.llm_model_name = None
+        self.llm_enabled = self.llm is not None
+        # Gemini art arda hata / zaman aşımı verirse bir süre atlanır (EventAgent ile ortak)
+        self.llm_breaker = get_breaker("gemini")
+
+    # ================= MODEL =================
+    def _load_model(self, raise_errors: bool = False) -> None:
+        try:
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+            from agents.sentiment_backends import create_backend
+
+            if self.use_gpu and self.backend_name == "eager" and torch.cuda.is_available():
+                self.device = torch.device("cuda")
+            self.tokenizer = AutoTokenizer.from_pretrained(self.HF_MODEL)
+            model = AutoModelForSequenceClassification.from_pretrained(self.HF_MODEL)
+            model.eval()
+            model.to(self.device)
+            self.model = model
+            self.backend = create_backend(
+                self.backend_name, model, self.tokenizer, self.HF_MODEL
+            )
+
+            # Dummy inference → ilk gerçek istek lazy-init maliyeti ödemez
+            self._ml_infer(self.WARMUP_TEXT)
+        except Exception as e:
+            self.model_error = e
+            if raise_errors:
+                raise
+        finally:
+            self._model_ready.set()
+
+    def is_ready(self) -> bool:
+        return self._model_ready.is_set() and self.model_error is None
+
+    def wait_until_ready(self, timeout: float | None = None) -> bool:
+        self._model_ready.wait(timeout)
+        return self.is_ready()
+
+    def backend_report(self, texts: List[str] | None = None) -> BackendReport:
+        """Aktif backend'in eager modele göre parity / gecikme / bellek raporu."""
+        from agents.sentiment_backends import EagerBackend, evaluate_backend
+
+        self.wait_until_ready()
+        return evaluate_backend(
+            self.backend, EagerBackend(self.model), self.tokenizer, texts
+        )
 
     # ================= PUBLIC =================
-    def analyze(self, text: str) -> EmotionOutput:
-        self.debug = []
+    def analyze(self, text: str, wait_for_model: bool = True) -> EmotionOutput:
+        """
+        wait_for_model=False iken model henüz ısınıyorsa ML adımı atlanır
+        ve sonuç Rule + LLM füzyonundan üretilir.
+        """
+        clean = self._normalize(text)
+        if wait_for_model:
+            # Aktif istek bütçesi varsa model en fazla o kadar beklenir
+            deadline = current_deadline()
+            self._model_ready.wait(deadline.remaining() if deadline is not None else None)
+        if not self.is_ready():
+            return self._analyze_clean(clean, ml_available=False)
+        return self._analyze_clean(clean)
+
+    def analyze_fallback(self, text: str) -> EmotionOutput:
+        """
+        Süre bütçesi dolduğunda: LLM ve yeni BERT çağrısı yapılmaz; Rule ile
+        (varsa önizlemeden kalan) ML sonucunun füzyonu döner.
+        """
+        clean = self._normalize(text)
+        with self._memo_lock:
+            ml_label = self._ml_memo.get(clean)
+        out = self._analyze_clean(
+            clean, ml_label=ml_label, ml_available=ml_label is not None, llm_skipped=True
+        )
+        out.debug.insert(0, "Süre bütçesi doldu → Rule/ML füzyonu (LLM atlandı)")
+        return out
+
+    def analyze_batch(
+        self,
+        texts: List[str],
+        batch_size: int | None = None,
+        llm_batch_size: int | None = None
+    ) -> List[EmotionOutput]:
+        """
+        analyze() ile aynı çıktıyı üretir; BERT adımı uzunluğa göre
+        gruplanmış, padding'li batch'ler halinde, LLM adımı ise birden çok
+        metni tek prompt'a paketleyerek çalıştırılır.
+        """
+        cleans = [self._normalize(t) for t in texts]
+        ml_available = self.wait_until_ready()
+
+        # Kısa & anlamsız metinler ML / LLM'e hiç gitmez (analyze ile aynı filtre)
+        idx = [i for i, c in enumerate(cleans) if not self._is_trivial(c)]
+
+        ml_pre: Dict[int, str] = {}
+        if ml_available:
+            ml_labels = self._ml_predict_batch(
+                [cleans[i] for i in idx],
+                batch_size or self.ML_BATCH_SIZE
+            )
+            ml_pre = dict(zip(idx, ml_labels))
+
+        llm_pre: Dict[int, str] = {}
+        if self.llm_enabled:
+            llm_labels = self._llm_predict_batch(
+                [cleans[i] for i in idx],
+                llm_batch_size or self.LLM_BATCH_SIZE
+            )
+            llm_pre = dict(zip(idx, llm_labels))
+
+        return [
+            self._analyze_clean(
+                c,
+                ml_label=ml_pre.get(i),
+                ml_available=ml_available,
+                llm_label=llm_pre.get(i)
+            )
+            for i, c in enumerate(cleans)
+        ]
+
+    def preview(self, text: str, with_ml: bool = False) -> EmotionPreview:
+        """
+        Yazarken önizleme. Rule yolu her çağrıda (µs), BERT yalnızca with_ml
+        ile ve model hazırsa çalışır; sonucu memo'ya düşer → aynı metin için
+        sonraki analyze() BERT'i tekrar çalıştırmaz. LLM çağrılmaz.
+        """
         clean = self._normalize(text)
+        rule_label = self._rule_predict(clean)
+        ml_label = None
+        if with_ml and self.is_ready() and not self._is_trivial(clean):
+            ml_label = self._ml_predict(clean)
+        return EmotionPreview(text=clean, rule_label=rule_label, ml_label=ml_label)
+
+    # ================= PIPELINE =================
+    def _analyze_clean(
+        self,
+        clean: str,
+        ml_label: str | None = None,
+        ml_available: bool = True,
+        llm_label: str | None = None,
+        llm_skipped: bool = False
+    ) -> EmotionOutput:
+        # Yerel liste: agent birden çok thread'den çağrılabilir
+        debug: List[str] = []
+        self.debug = debug
+        hits = self.matcher.match(clean)
 
         # ---------- AJANDA: KISA METİN FİLTRESİ ----------
         if len(clean) < 5:
-            if self._contains_any(clean, self._all_lexicon_words()):
-                self.debug.append(
+            if self._has_lexicon_hit(hits):
+                debug.append(
                     "Ajanda: Kısa ama anlamlı kelime → analiz devam"
                 )
             else:
-                self.debug.append(
+                debug.append(
                     "Ajanda: Kısa & anlamsız metin → nötr"
                 )
                 return EmotionOutput(
@@ -121,49 +329,138 @@ class EmotionAgent:
                     llm_label="nötr",
                     rule_label="nötr",
                     final_emotion="nötr",
-                    debug=self.debug
+                    debug=debug
                 )
 
         # ---------- ML ----------
-        ml_label = self._ml_predict(clean)
-        self.debug.append(f"ML(BERT) sonucu: {ml_label}")
+        with telemetry.span("emotion.ml") as sp:
+            if not ml_available:
+                sp.outcome = telemetry.FALLBACK
+                ml_label = "nötr"
+                debug.append("ML(BERT) hazır değil → Rule + LLM ile devam")
+            else:
+                if ml_label is None:
+                    ml_label = self._ml_predict(clean)
+                debug.append(f"ML(BERT) sonucu: {ml_label}")
 
         # ---------- RULE ----------
-        rule_label = self._rule_predict(clean)
-        self.debug.append(f"Rule-based sonucu: {rule_label}")
+        with telemetry.span("emotion.rule"):
+            rule_label = self._rule_predict(clean, hits)
+        debug.append(f"Rule-based sonucu: {rule_label}")
 
         # ---------- LLM ----------
-        llm_label = "nötr"
-        if self.llm_enabled:
-            llm_label = self._llm_predict(clean)
-            self.debug.append(f"LLM(Gemini) sonucu: {llm_label}")
-        else:
-            self.debug.append("LLM(Gemini) devre dışı")
+        with telemetry.span("emotion.llm") as sp:
+            if llm_skipped:
+                sp.outcome = telemetry.SKIPPED
+                llm_label = "nötr"
+                debug.append("LLM(Gemini) atlandı (süre bütçesi)")
+            elif self.llm_enabled:
+                if llm_label is None:
+                    llm_label = self._llm_predict(clean)
+                debug.append(f"LLM(Gemini) sonucu: {llm_label}")
+            else:
+                sp.outcome = telemetry.SKIPPED
+                llm_label = "nötr"
+                debug.append("LLM(Gemini) devre dışı")
 
         # ---------- FUSION ----------
-        final_emotion = self._fusion(rule_label, ml_label, llm_label)
-        self.debug.append(f"FINAL: {final_emotion}")
+        final_emotion = self._fusion(rule_label, ml_label, llm_label, debug)
+        debug.append(f"FINAL: {final_emotion}")
 
         return EmotionOutput(
             ml_label=ml_label,
             llm_label=llm_label,
             rule_label=rule_label,
             final_emotion=final_emotion,
-            debug=self.debug
+            debug=debug
+        )
+
+    def _is_trivial(self, clean: str) -> bool:
+        return len(clean) < 5 and not self._has_lexicon_hit(
+            self.matcher.match(clean)
         )
 
     # ================= ML =================
     def _ml_predict(self, text: str) -> str:
+        with self._memo_lock:
+            label = self._ml_memo.get(text)
+            if label is not None:
+                self._ml_memo.move_to_end(text)
+        if label is not None:
+            telemetry.set_outcome(telemetry.CACHE_HIT)
+            return label
+
+        key = self._cache_key("bert", self._ml_cache_model(), self.ML_CACHE_VERSION, text)
+        label = self._cache_get("bert", key)
+        if label is None:
+            label = self.batcher.submit(text) if self.batcher else self._ml_infer(text)
+            self._cache_set("bert", key, label)
+
+        with self._memo_lock:
+            self._ml_memo[text] = label
+            while len(self._ml_memo) > self.ML_MEMO_SIZE:
+                self._ml_memo.popitem(last=False)
+        return label
+
+    def _ml_cache_model(self) -> str:
+        # int8 / ONNX / TorchScript etiketleri eager'dan ayrışabilir
+        # (bkz. compare_backends) → her backend kendi cache kaydını kullanır
+        return f"{self.HF_MODEL}@{self.backend_name}"
+
+    def _ml_infer(self, text: str) -> str:
         inputs = self.tokenizer(
             text, return_tensors="pt",
             truncation=True, padding=True
         )
         inputs = {k: v.to(self.device) for k, v in inputs.items()}
 
-        with torch.no_grad():
-            logits = self.model(**inputs).logits
-            pred_id = int(torch.argmax(logits, dim=1).item())
+        logits = self.backend.logits(inputs)
+        pred_id = int(logits.argmax(dim=1).item())
 
+        return self._label_from_id(pred_id)
+
+    def _ml_predict_batch(self, texts: List[str], batch_size: int) -> List[str]:
+        # Cache'te olanlar modele hiç gitmez
+        keys = [
+            self._cache_key("bert", self._ml_cache_model(), self.ML_CACHE_VERSION, t)
+            for t in texts
+        ]
+        labels: List[str] = [self._cache_get("bert", k) for k in keys]
+        miss = [i for i, label in enumerate(labels) if label is None]
+
+        predicted = self._ml_infer_batch([texts[i] for i in miss], batch_size)
+        for i, label in zip(miss, predicted):
+            labels[i] = label
+            self._cache_set("bert", keys[i], label)
+        return labels
+
+    def _ml_infer_batch(self, texts: List[str], batch_size: int) -> List[str]:
+        if not texts:
+            return []
+
+        # Tek tokenizasyon; padding her batch içinde en uzun örneğe göre yapılır
+        enc = self.tokenizer(texts, truncation=True)
+        keys = list(enc.keys())
+
+        # Uzunluğa göre sırala → benzer uzunluklar aynı batch'e düşer
+        order = sorted(range(len(texts)), key=lambda i: len(enc["input_ids"][i]))
+        labels: List[str] = [""] * len(texts)
+
+        for start in range(0, len(order), max(1, batch_size)):
+            bucket = order[start:start + max(1, batch_size)]
+            features = [{k: enc[k][i] for k in keys} for i in bucket]
+            inputs = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+            logits = self.backend.logits(inputs)
+            pred_ids = logits.argmax(dim=1).tolist()
+
+            for i, pred_id in zip(bucket, pred_ids):
+                labels[i] = self._label_from_id(int(pred_id))
+
+        return labels
+
+    def _label_from_id(self, pred_id: int) -> str:
         raw = self.model.config.id2label.get(pred_id, "").lower()
 
         if "positive" in raw:
@@ -173,24 +470,22 @@ class EmotionAgent:
         return "nötr"
 
     # ================= RULE =================
-    def _rule_predict(self, text: str) -> str:
-        for p in self.neutral_phrases:
-            if p in text:
-                return "nötr"
+    def _rule_predict(self, text: str, hits: Dict[str, List[str]] | None = None) -> str:
+        if hits is None:
+            hits = self.matcher.match(text)
 
-        for p in self.irony_phrases:
-            if p in text:
-                return "hüzün"
+        if hits["neutral"]:
+            return "nötr"
 
-        if any(n in text.split() for n in self.negations):
-            if self._contains_any(text, self.emotion_lexicon["mutluluk"]):
-                return "hüzün"
+        if hits["irony"]:
+            return "hüzün"
+
+        if hits["negation"] and hits["emo:mutluluk"]:
+            return "hüzün"
 
         scores = {e: 0 for e in self.EMOTIONS}
-        for emo, words in self.emotion_lexicon.items():
-            for w in words:
-                if re.search(rf"\b{re.escape(w)}\b", text):
-                    scores[emo] += 1
+        for emo in self.emotion_lexicon:
+            scores[emo] += len(hits[f"emo:{emo}"])
 
         best = max(scores.items(), key=lambda x: x[1])
         return best[0] if best[1] > 0 else "nötr"
@@ -212,8 +507,18 @@ Cümle:
 JSON:
 {{"label":"nötr"}}
 """
+        key = self._cache_key(
+            "gemini_emotion", self.llm_model_name, self.LLM_PROMPT_VERSION, text
+        )
+        cached = self._cache_get("gemini_emotion", key)
+        if cached is not None:
+            return cached
+
         try:
-            resp = self.llm.generate_content(prompt)
+            timeout = timeout_for(self.LLM_TIMEOUT)
+            resp = self.llm_breaker.call(
+                lambda: call_with_timeout(self.llm.generate_content, timeout, prompt)
+            )
             raw = (resp.text or "").strip()
 
             start, end = raw.find("{"), raw.rfind("}")
@@ -222,36 +527,107 @@ JSON:
 
             data = json.loads(raw)
             label = str(data.get("label", "nötr")).lower()
-            return label if label in self.EMOTIONS else "nötr"
-        except Exception:
+            label = label if label in self.EMOTIONS else "nötr"
+        except CircuitOpenError:
+            return "nötr"   # outcome=circuit_open işaretli; füzyon Rule + ML ile kalır
+        except DeadlineExceeded as e:
+            telemetry.set_outcome(telemetry.TIMEOUT, str(e))
+            return "nötr"
+        except Exception as e:
+            # Hatalı çağrı cache'e yazılmaz; sonraki denemede tekrar sorulur
+            telemetry.set_outcome(telemetry.FALLBACK, str(e))
             return "nötr"
 
+        self._cache_set("gemini_emotion", key, label)
+        return label
+
+    def _llm_predict_batch(self, texts: List[str], batch_size: int) -> List[str]:
+        if not self.llm:
+            return ["nötr"] * len(texts)
+
+        keys = [
+            self._cache_key(
+                "gemini_emotion", self.llm_model_name, self.LLM_PROMPT_VERSION, t
+            )
+            for t in texts
+        ]
+        labels: List[str | None] = [self._cache_get("gemini_emotion", k) for k in keys]
+        miss = [i for i, label in enumerate(labels) if label is None]
+
+        def validate(obj: Dict) -> str | None:
+            label = str(obj.get("label", "")).lower()
+            return label if label in self.EMOTIONS else None
+
+        predicted = classify_in_batches(
+            self.llm,
+            [texts[i] for i in miss],
+            instructions=(
+                "Her cümlenin duygusunu etiketle.\n"
+                "Etiketler: mutluluk, hüzün, öfke, korku, şaşkınlık, nötr"
+            ),
+            item_format='{"id":0,"label":"nötr"}',
+            validate=validate,
+            batch_size=batch_size,
+        )
+        for i, label in zip(miss, predicted):
+            if label is None:
+                # Tekli analyze ile aynı: parse edilemeyen cevap → nötr (cache'lenmez)
+                labels[i] = "nötr"
+            else:
+                labels[i] = label
+                self._cache_set("gemini_emotion", keys[i], label)
+        return labels
+
     # ================= FUSION =================
-    def _fusion(self, rule_label: str, ml_label: str, llm_label: str) -> str:
+    def _fusion(
+        self,
+        rule_label: str,
+        ml_label: str,
+        llm_label: str,
+        debug: List[str]
+    ) -> str:
         if rule_label != "nötr":
-            self.debug.append("Fusion: Rule-based öncelik")
+            debug.append("Fusion: Rule-based öncelik")
             return rule_label
 
         if llm_label != "nötr" and llm_label != ml_label:
-            self.debug.append("Fusion: ML–LLM çelişkisi → LLM")
+            debug.append("Fusion: ML–LLM çelişkisi → LLM")
             return llm_label
 
         if rule_label == "nötr" and llm_label == "nötr":
-            self.debug.append("Fusion: Düşük sinyal → nötr")
+            debug.append("Fusion: Düşük sinyal → nötr")
             return "nötr"
 
-        self.debug.append("Fusion: ML destekleyici kabul edildi")
+        debug.append("Fusion: ML destekleyici kabul edildi")
         return ml_label
 
     # ================= UTILS =================
     def _normalize(self, text: str) -> str:
         return re.sub(r"\s+", " ", text.lower().strip())
 
-    def _contains_any(self, text: str, words: List[str]) -> bool:
-        return any(
-            re.search(rf"\b{re.escape(w)}\b", text)
-            for w in words
-        )
+    def _cache_key(self, namespace: str, model: str, version: str, text: str) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(namespace, model, version, text)
+
+    def _cache_get(self, namespace: str, key: str | None):
+        if key is None:
+            return None
+        return self.cache.get(namespace, key)
+
+    def _cache_set(self, namespace: str, key: str | None, value) -> None:
+        if key is not None:
+            self.cache.set(namespace, key, value)
+
+    def _build_matcher(self) -> PhraseMatcher:
+        groups = {
+            "neutral": (self.neutral_phrases, SUBSTRING),
+            "irony": (self.irony_phrases, SUBSTRING),
+            "negation": (self.negations, TOKEN),
+        }
+        for emo, words in self.emotion_lexicon.items():
+            groups[f"emo:{emo}"] = (words, WORD)
+        return PhraseMatcher(groups)
 
-    def _all_lexicon_words(self) -> List[str]:
-        return sum(self.emotion_lexicon.values(), [])
+    def _has_lexicon_hit(self, hits: Dict[str, List[str]]) -> bool:
+        return any(hits[f"emo:{emo}"] for emo in self.emotion_lexicon)
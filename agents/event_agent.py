@@ -1,12 +1,15 @@
 from dataclasses import dataclass
-from typing import List, Optional
-import os
+from typing import Dict, List, Optional, Tuple
 import json
 
-try:
-    import google.generativeai as genai
-except Exception:
-    genai = None
+from agents import telemetry
+from agents.bootstrap import gemini_model, load_env
+from agents.llm_batch import classify_in_batches
+from agents.phrase_matcher import PhraseMatcher, SUBSTRING
+from agents.resilience import (
+    DeadlineExceeded, CircuitOpenError, call_with_timeout, get_breaker, timeout_for
+)
+from agents.result_cache import ResultCache, get_default_cache
 
 
 @dataclass
@@ -17,16 +20,30 @@ class EventOutput:
 
 
 class EventAgent:
-    def __init__(self):
+    LLM_MODEL = "models/gemini-flash-latest"
+    LLM_PROMPT_VERSION = "v1"    # prompt değişirse artır → eski cache geçersiz
+    LLM_BATCH_SIZE = 20
+    EVENT_TYPES = ("energy_up", "pressure", "energy_down", "neutral")
+    LLM_TIMEOUT = 6.0            # sn; generate_content'in kendi timeout'u yok
+
+    def __init__(self, cache: Optional[ResultCache] = None, llm=None):
+        load_env()
         self.debug: List[str] = []
 
+        # ---------- RESULT CACHE ----------
+        self.cache = cache if cache is not None else get_default_cache()
+
         # ---------- LLM ----------
-        self.enabled = bool(os.getenv("GOOGLE_API_KEY")) and genai is not None
-        if self.enabled:
-            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-            self.model = genai.GenerativeModel("models/gemini-flash-latest")
-        else:
-            self.model = None
+        # llm verilirse (örn. llm_batch.LocalStubModel) Gemini yerine kullanılır
+        # Anahtar yoksa google.generativeai hiç import edilmez
+        self.model = llm if llm is not None else gemini_model(self.LLM_MODEL)
+        self.enabled = self.model is not None
+        # Cache anahtarı gerçek modelin kimliğiyle: sahte modelin sonuçları
+        # Gemini sonucu olarak okunmasın
+        self.llm_model_name = (
+            getattr(llm, "model_name", type(llm).__name__) if llm is not None else self.LLM_MODEL
+        )
+        self.llm_breaker = get_breaker("gemini")
 
         # ---------- RULE: ENERJİ YÜKSELTEN ----------
         self.energy_up_phrases = [
@@ -47,27 +64,72 @@ class EventAgent:
             "deadline", "son tarih", "acil", "hemen"
         ]
 
+        # Her iki sözlük tek seferde derlenir → metin üzerinde tek geçiş
+        self.matcher = PhraseMatcher({
+            "energy_up": (self.energy_up_phrases, SUBSTRING),
+            "pressure": (self.pressure_phrases, SUBSTRING),
+        })
+
     def analyze(self, text: Optional[str]) -> EventOutput:
-        self.debug = []
+        return self._analyze(text)
+
+    def analyze_rules(self, text: Optional[str]) -> EventOutput:
+        """Süre bütçesi dolduğunda: LLM'e gidilmeden yalnızca kural sonucu."""
+        return self._analyze(text, llm_result=(None, "LLM atlandı (süre bütçesi)"))
+
+    def analyze_batch(
+        self,
+        texts: List[Optional[str]],
+        batch_size: int | None = None
+    ) -> List[EventOutput]:
+        """
+        analyze() ile aynı kararları verir; LLM gereken mesajlar tek tek
+        değil, tek prompt'ta toplu sınıflandırılır.
+        """
+        need = [
+            i for i, t in enumerate(texts)
+            if t and t.strip() and self._should_call_llm(t.lower(), self.matcher.match(t.lower()))
+        ]
+
+        llm_pre: Dict[int, Tuple[Optional[Dict], str]] = {}
+        if need:
+            results = self._llm_classify_batch(
+                [texts[i] for i in need], batch_size or self.LLM_BATCH_SIZE
+            )
+            llm_pre = dict(zip(need, results))
+
+        return [
+            self._analyze(t, llm_result=llm_pre.get(i))
+            for i, t in enumerate(texts)
+        ]
+
+    # ================= PIPELINE =================
+    def _analyze(
+        self,
+        text: Optional[str],
+        llm_result: Tuple[Optional[Dict], str] | None = None
+    ) -> EventOutput:
+        # Yerel liste: süre aşımında terk edilen çağrı, aynı agent'ta
+        # çalışan kural fallback'inin debug'ına yazmasın
+        debug: List[str] = []
+        self.debug = debug
 
         if not text or not text.strip():
-            self.debug.append("EventAgent: içerik yok")
-            return EventOutput("neutral", 0.0, self.debug)
+            debug.append("EventAgent: içerik yok")
+            return EventOutput("neutral", 0.0, debug)
 
         t = text.lower()
+        hits = self.matcher.match(t)
 
         # ---------- 1) ENERGY UP ----------
-        for p in self.energy_up_phrases:
-            if p in t:
-                self.debug.append(f"Rule: energy_up → {p}")
-                return EventOutput("energy_up", 0.6, self.debug)
+        if hits["energy_up"]:
+            debug.append(f"Rule: energy_up → {hits['energy_up'][0]}")
+            return EventOutput("energy_up", 0.6, debug)
 
         # ---------- 2) PRESSURE ----------
-        pressure_hits = 0
-        for p in self.pressure_phrases:
-            if p in t:
-                pressure_hits += 1
-                self.debug.append(f"Rule: pressure → {p}")
+        pressure_hits = len(hits["pressure"])
+        for p in hits["pressure"]:
+            debug.append(f"Rule: pressure → {p}")
 
         rule_pressure = min(0.3 + pressure_hits * 0.1, 0.9)
 
@@ -75,15 +137,41 @@ class EventAgent:
         llm_type = None
         llm_intensity = 0.0
 
-        should_call_llm = (
-            self.enabled and (
-                pressure_hits <= 1 or
-                len(t.split()) > 25
-            )
+        if self._should_call_llm(t, hits):
+            with telemetry.span("event.llm") as sp:
+                data, msg = llm_result if llm_result is not None else self._llm_classify(text)
+                if data is None and sp.outcome == telemetry.OK:
+                    sp.outcome = telemetry.FALLBACK
+            debug.append(msg)
+            if data is not None:
+                llm_type = data.get("event_type")
+                llm_intensity = float(data.get("intensity", 0.5))
+
+        # ---------- 4) FUSION ----------
+        if pressure_hits >= 2:
+            debug.append("Fusion: Rule pressure baskın")
+            return EventOutput("pressure", rule_pressure, debug)
+
+        if llm_type in ("energy_up", "pressure", "energy_down"):
+            debug.append("Fusion: LLM kararı")
+            return EventOutput(llm_type, max(llm_intensity, 0.4), debug)
+
+        if pressure_hits == 1:
+            return EventOutput("pressure", 0.45, debug)
+
+        return EventOutput("neutral", 0.0, debug)
+
+    def _should_call_llm(self, t: str, hits: Dict[str, List[str]]) -> bool:
+        if hits["energy_up"]:
+            return False
+        return self.enabled and (
+            len(hits["pressure"]) <= 1 or
+            len(t.split()) > 25
         )
 
-        if should_call_llm:
-            prompt = f"""
+    # ================= LLM =================
+    def _llm_classify(self, text: str) -> Tuple[Optional[Dict], str]:
+        prompt = f"""
 Sadece JSON döndür.
 
 Görev:
@@ -101,31 +189,96 @@ JSON format:
 Mesaj:
 {text}
 """
-            try:
-                resp = self.model.generate_content(prompt)
-                raw = (resp.text or "").strip()
-                start, end = raw.find("{"), raw.rfind("}")
-                if start != -1 and end != -1:
-                    raw = raw[start:end + 1]
+        key = self._cache_key(text)
+        cached = self.cache.get("gemini_event", key) if key else None
+        if cached is not None:
+            return cached, (
+                f"LLM (cache): {cached.get('event_type')}, "
+                f"intensity={float(cached.get('intensity', 0.5))}"
+            )
 
-                data = json.loads(raw)
-                llm_type = data.get("event_type")
-                llm_intensity = float(data.get("intensity", 0.5))
-                self.debug.append(f"LLM: {llm_type}, intensity={llm_intensity}")
+        try:
+            timeout = timeout_for(self.LLM_TIMEOUT)
+            resp = self.llm_breaker.call(
+                lambda: call_with_timeout(self.model.generate_content, timeout, prompt)
+            )
+            raw = (resp.text or "").strip()
+            start, end = raw.find("{"), raw.rfind("}")
+            if start != -1 and end != -1:
+                raw = raw[start:end + 1]
 
-            except Exception as e:
-                self.debug.append(f"LLM hata → {e}")
+            data = json.loads(raw)
+            result = {
+                "event_type": data.get("event_type"),
+                "intensity": float(data.get("intensity", 0.5)),
+            }
+        except CircuitOpenError as e:
+            return None, f"LLM atlandı → {e}"
+        except DeadlineExceeded as e:
+            telemetry.set_outcome(telemetry.TIMEOUT, str(e))
+            return None, f"LLM atlandı → {e}"
+        except Exception as e:
+            return None, f"LLM hata → {e}"
 
-        # ---------- 4) FUSION ----------
-        if pressure_hits >= 2:
-            self.debug.append("Fusion: Rule pressure baskın")
-            return EventOutput("pressure", rule_pressure, self.debug)
+        if key:
+            self.cache.set("gemini_event", key, result)
+        return result, f"LLM: {result['event_type']}, intensity={result['intensity']}"
 
-        if llm_type in ("energy_up", "pressure", "energy_down"):
-            self.debug.append("Fusion: LLM kararı")
-            return EventOutput(llm_type, max(llm_intensity, 0.4), self.debug)
+    def _llm_classify_batch(
+        self,
+        texts: List[str],
+        batch_size: int
+    ) -> List[Tuple[Optional[Dict], str]]:
+        keys = [self._cache_key(t) for t in texts]
+        out: List[Tuple[Optional[Dict], str] | None] = [None] * len(texts)
+        miss: List[int] = []
 
-        if pressure_hits == 1:
-            return EventOutput("pressure", 0.45, self.debug)
+        for i, key in enumerate(keys):
+            cached = self.cache.get("gemini_event", key) if key else None
+            if cached is None:
+                miss.append(i)
+            else:
+                out[i] = (cached, (
+                    f"LLM (cache): {cached.get('event_type')}, "
+                    f"intensity={float(cached.get('intensity', 0.5))}"
+                ))
 
-        return EventOutput("neutral", 0.0, self.debug)
+        def validate(obj: Dict) -> Dict | None:
+            if obj.get("event_type") not in self.EVENT_TYPES:
+                return None
+            try:
+                return {
+                    "event_type": obj["event_type"],
+                    "intensity": float(obj.get("intensity", 0.5)),
+                }
+            except (TypeError, ValueError):
+                return None
+
+        predicted = classify_in_batches(
+            self.model,
+            [texts[i] for i in miss],
+            instructions=(
+                "Her mesajın okuyan kişiye etkisini sınıflandır.\n"
+                "Etiketler: energy_up (moral/enerji yükseltir), "
+                "pressure (eleştiri, revizyon, iş yükü), "
+                "energy_down (olumsuz haber), neutral (bilgilendirici)"
+            ),
+            item_format='{"id":0,"event_type":"neutral","intensity":0.0}',
+            validate=validate,
+            batch_size=batch_size,
+        )
+        for i, result in zip(miss, predicted):
+            if result is None:
+                out[i] = (None, "LLM hata → batch cevabı doğrulanamadı")
+                continue
+            if keys[i]:
+                self.cache.set("gemini_event", keys[i], result)
+            out[i] = (result, f"LLM(batch): {result['event_type']}, intensity={result['intensity']}")
+        return out
+
+    def _cache_key(self, text: str) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.make_key(
+            "gemini_event", self.llm_model_name, self.LLM_PROMPT_VERSION, text
+        )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import re
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from agents.resilience import call_with_timeout, get_breaker, timeout_for
+
+
+BATCH_TIMEOUT = 30.0   # sn; tek batch isteği için üst sınır (istek bütçesiyle kırpılır)
+
+
+# ================= BATCH CLASSIFY =================
+def build_batch_prompt(instructions: str, item_format: str, texts: List[str]) -> str:
+    """
+    Birden çok metni tek bir prompt'a paketler. Model, her öğe için
+    "id" alanı taşıyan bir JSON dizisi döndürmelidir.
+    """
+    items = json.dumps(
+        [{"id": i, "text": t} for i, t in enumerate(texts)],
+        ensure_ascii=False
+    )
+    return f"""
+Sadece JSON dizisi döndür.
+
+{instructions}
+
+Her öğe için bir nesne döndür, "id" alanını aynen koru:
+[{item_format}, ...]
+
+Öğeler:
+{items}
+"""
+
+
+def parse_batch_response(raw: str) -> Dict[int, Dict]:
+    raw = (raw or "").strip()
+    start, end = raw.find("["), raw.rfind("]")
+    if start == -1 or end == -1:
+        return {}
+
+    try:
+        data = json.loads(raw[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+
+    out: Dict[int, Dict] = {}
+    for obj in data if isinstance(data, list) else []:
+        if isinstance(obj, dict):
+            try:
+                out[int(obj.get("id"))] = obj
+            except (TypeError, ValueError):
+                continue
+    return out
+
+
+def classify_in_batches(
+    model,
+    texts: List[str],
+    instructions: str,
+    item_format: str,
+    validate: Callable[[Dict], Optional[Any]],
+    batch_size: int = 20
+) -> List[Optional[Any]]:
+    """
+    texts'i batch_size'lık gruplar halinde tek istekte sınıflandırır.
+    validate(obj) geçersiz öğe için None döner. Cevap geldi ama öğeler eksik /
+    geçersizse bunlar ikiye bölünerek yeniden sorulur; tek öğe de başarısızsa
+    None kalır. İstek hiç başarısızsa (ağ, kota, zaman aşımı, devre açık)
+    grup bölünmez: tümü None kalır ve çağıran kurallara düşer.
+    """
+    results: List[Optional[Any]] = [None] * len(texts)
+    breaker = get_breaker("gemini")
+
+    def run(indices: List[int]) -> None:
+        if not indices:
+            return
+
+        prompt = build_batch_prompt(
+            instructions, item_format, [texts[i] for i in indices]
+        )
+        try:
+            timeout = timeout_for(BATCH_TIMEOUT)
+            resp = breaker.call(lambda: call_with_timeout(model.generate_content, timeout, prompt))
+            raw = resp.text
+        except Exception:
+            return   # servis sorunu: bölüp tekrar sormak yükü artırır
+        parsed = parse_batch_response(raw)
+
+        failed: List[int] = []
+        for local_id, i in enumerate(indices):
+            value = validate(parsed[local_id]) if local_id in parsed else None
+            if value is None:
+                failed.append(i)
+            else:
+                results[i] = value
+
+        if failed and len(indices) > 1:
+            # Kısmi hata → başarısızları ikiye bölüp tekrar dene
+            mid = (len(failed) + 1) // 2
+            run(failed[:mid])
+            run(failed[mid:])
+
+    step = max(1, batch_size)
+    for start in range(0, len(texts), step):
+        run(list(range(start, min(start + step, len(texts)))))
+
+    return results
+
+
+# ================= LOCAL STAND-IN =================
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LocalStubModel:
+    """
+    Ağ gerektirmeyen Gemini yerine geçen model. generate_content() hem tekli
+    prompt'lara ({"label": ...} / {"event_type": ...}) hem de batch
+    prompt'lara (JSON dizisi) deterministik cevap verir.
+
+    classify(text) → {"label": ..} veya {"event_type": .., "intensity": ..}
+    """
+
+    def __init__(
+        self,
+        classify: Callable[[str], Dict] | None = None,
+        drop_every: int = 0
+    ):
+        self.classify = classify or (lambda text: {"label": "nötr"})
+        self.drop_every = drop_every   # >0 ise her n. öğe cevapta yer almaz
+        self.calls = 0
+
+    def generate_content(self, prompt: str) -> _StubResponse:
+        self.calls += 1
+
+        items = self._batch_items(prompt)
+        if items is None:
+            m = re.search(r"(?:Cümle|Mesaj):\n(.*?)(?:\n\n|\s*\Z)", prompt, re.S)
+            text = m.group(1).strip() if m else prompt
+            return _StubResponse(json.dumps(self.classify(text), ensure_ascii=False))
+
+        out = []
+        for n, item in enumerate(items):
+            if self.drop_every and (n + 1) % self.drop_every == 0:
+                continue
+            out.append({"id": item["id"], **self.classify(item["text"])})
+        return _StubResponse(json.dumps(out, ensure_ascii=False))
+
+    def _batch_items(self, prompt: str) -> List[Dict] | None:
+        m = re.search(r"Öğeler:\s*(\[.*\])\s*$", prompt, re.S)
+        if not m:
+            return None
+        try:
+            return json.loads(m.group(1))
+        except json.JSONDecodeError:
+            return None
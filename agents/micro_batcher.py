@@ -0,0 +1,157 @@
+from __future__ import annotations
+import time
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, Generic, List, TypeVar
+
+from agents import telemetry
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Request(Generic[T, R]):
+    __slots__ = ("item", "enqueued_at", "done", "result", "error")
+
+    def __init__(self, item: T):
+        self.item = item
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result: R | None = None
+        self.error: BaseException | None = None
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Eşzamanlı tekil istekleri tek batch çağrısında toplar.
+    Batch max_batch_size'a ulaşınca ya da ilk isteğin bekleme süresi
+    (max_wait_ms) dolunca gönderilir; her çağıran kendi sonucunu alır.
+    Tek istek varken ek gecikme en fazla max_wait_ms'dir.
+    """
+
+    FILL_BUCKETS = (0.125, 0.25, 0.5, 0.75, 1.0)
+
+    def __init__(
+        self,
+        infer_batch: Callable[[List[T]], List[R]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 2.0,
+        name: str = "batch"
+    ):
+        self.infer_batch = infer_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue: Deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+
+        # ---------- METRICS ----------
+        self.batches = 0
+        self.items = 0
+        self._fill_counts = [0] * len(self.FILL_BUCKETS)
+
+    # ================= PUBLIC =================
+    def submit(self, item: T) -> R:
+        req = _Request(item)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError(f"{self.name}: batcher durduruldu")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name=f"{self.name}-batcher", daemon=True
+                )
+                self._thread.start()
+            self._queue.append(req)
+            self._cond.notify()
+
+        req.done.wait()
+        if req.error is not None:
+            raise req.error
+        return req.result
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+                "mean_fill": (
+                    self.items / (self.batches * self.max_batch_size) if self.batches else 0.0
+                ),
+                "queue_depth": len(self._queue),
+            }
+
+    def to_prometheus(self) -> str:
+        name = "mood2music_batch_fill_ratio"
+        labels = f'batcher="{self.name}"'
+        lines = [
+            f"# HELP {name} Micro-batch size divided by max_batch_size.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._cond:
+            cumulative = 0
+            for le, n in zip(self.FILL_BUCKETS, self._fill_counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {self.items / self.max_batch_size:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {self.batches}")
+        return "\n".join(lines) + "\n"
+
+    # ================= DISPATCH =================
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped and not self._queue:
+                    return
+
+                # İlk isteğin bekleme penceresi dolana ya da batch dolana kadar topla
+                deadline = self._queue[0].enqueued_at + self.max_wait
+                while len(self._queue) < self.max_batch_size and not self._stopped:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                n = min(len(self._queue), self.max_batch_size)
+                batch = [self._queue.popleft() for _ in range(n)]
+
+            self._run(batch)
+
+    def _run(self, batch: List[_Request]) -> None:
+        started = time.perf_counter()
+        for req in batch:
+            telemetry.METRICS.observe(
+                f"{self.name}.queue_wait", telemetry.OK, (started - req.enqueued_at) * 1000.0
+            )
+
+        try:
+            results = self.infer_batch([req.item for req in batch])
+            for req, result in zip(batch, results):
+                req.result = result
+        except BaseException as e:
+            for req in batch:
+                req.error = e
+
+        fill = len(batch) / self.max_batch_size
+        with self._cond:
+            self.batches += 1
+            self.items += len(batch)
+            for i, le in enumerate(self.FILL_BUCKETS):
+                if fill <= le:
+                    self._fill_counts[i] += 1
+                    break
+
+        for req in batch:
+            req.done.set()
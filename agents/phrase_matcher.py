@@ -0,0 +1,103 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Tuple
+
+
+# Eşleşme modları
+SUBSTRING = "substring"   # p in text
+WORD = "word"             # re.search(rf"\b{p}\b", text)
+TOKEN = "token"           # p in text.split()
+
+
+class PhraseMatcher:
+    """
+    Birden çok kategorideki ifadeleri tek seferde derlenen bir trie-regex
+    ile tek geçişte bulur. Çakışan ifadeler (örn. "eh" / "eh işte")
+    kaçırılmaz; her kategori kendi eşleşme modunu korur.
+    """
+
+    def __init__(self, groups: Dict[str, Tuple[List[str], str]]):
+        # phrase → [(kategori, mod)]
+        self._owners: Dict[str, List[Tuple[str, str]]] = {}
+        # kategori → {phrase: tanım sırası}
+        self._order: Dict[str, Dict[str, int]] = {}
+
+        for category, (phrases, mode) in groups.items():
+            order = self._order.setdefault(category, {})
+            for p in phrases:
+                if not p or p in order:
+                    continue
+                order[p] = len(order)
+                self._owners.setdefault(p, []).append((category, mode))
+
+        trie: Dict = {}
+        for p in self._owners:
+            node = trie
+            for ch in p:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        # Aynı konumda başlayan kısa ifadeler, en uzun eşleşmenin önekidir
+        self._prefixes: Dict[str, List[str]] = {}
+        for p in self._owners:
+            node, prefixes = trie, []
+            for i, ch in enumerate(p):
+                node = node[ch]
+                if "" in node:
+                    prefixes.append(p[:i + 1])
+            self._prefixes[p] = prefixes
+
+        body = self._trie_pattern(trie) or r"(?!x)x"
+        self._regex = re.compile(f"(?=({body}))")
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Kategori → bulunan ifadeler (tanım sırasıyla)."""
+        found: Dict[str, set] = {c: set() for c in self._order}
+
+        for m in self._regex.finditer(text):
+            start = m.start()
+            for q in self._prefixes[m.group(1)]:
+                end = start + len(q)
+                for category, mode in self._owners[q]:
+                    if self._accepts(text, start, end, mode):
+                        found[category].add(q)
+
+        return {
+            c: sorted(hits, key=self._order[c].__getitem__)
+            for c, hits in found.items()
+        }
+
+    # ================= UTILS =================
+    def _accepts(self, text: str, start: int, end: int, mode: str) -> bool:
+        if mode == WORD:
+            return self._is_boundary(text, start) and self._is_boundary(text, end)
+        if mode == TOKEN:
+            return (
+                (start == 0 or text[start - 1].isspace())
+                and (end == len(text) or text[end].isspace())
+            )
+        return True
+
+    def _is_boundary(self, text: str, i: int) -> bool:
+        # re'deki \b ile aynı: bir yanı kelime karakteri, diğeri değil
+        before = i > 0 and self._is_word(text[i - 1])
+        after = i < len(text) and self._is_word(text[i])
+        return before != after
+
+    def _is_word(self, ch: str) -> bool:
+        return ch.isalnum() or ch == "_"
+
+    def _trie_pattern(self, node: Dict) -> str:
+        alts = [
+            re.escape(ch) + self._trie_pattern(child)
+            for ch, child in sorted(node.items(), key=lambda x: x[0])
+            if ch != ""
+        ]
+        if not alts:
+            return ""
+
+        inner = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if "" in node:
+            # greedy → önce uzun ifade denenir, olmazsa bu düğümde biter
+            return f"(?:{inner})?"
+        return inner
@@ -22,8 +22,23 @@ class RegulationPlan:
 
 
 class RegulationAgent:
-    def __init__(self):
+    # (koşul anahtarı, direktif) — sıra önemli, çıktı bu sırayla üretilir
+    GUIDANCE = {
+        "valence_up": "Valence yükselt: daha pozitif/umutlu tonlar.",
+        "valence_down": "Valence düşür: daha melankolik tonlar (çok ağır değil).",
+        "arousal_up": "Arousal artır: tempo biraz yüksek, ritmik.",
+        "arousal_down": "Arousal azalt: düşük tempo, yumuşak geçişler, sakin.",
+        "comfort_up": "Physical comfort artır: sıcak/rahatlatıcı tınılar (akustik/lofi/piyano).",
+        "calm_up": "Environmental calm artır: ambient/lofi, minimal, güvenli his.",
+        "intensity_down": "Emotional intensity azalt: dramatik olmayan, düşük yoğunluk.",
+        "intensity_up": "Emotional intensity artır: duygulu ama kontrol edilebilir.",
+        "balanced": "Genel denge: orta tempo, sakin-pozitif, rahatsız etmeyen seçim.",
+    }
+
+    def __init__(self, use_table: bool = True):
         self.debug: List[str] = []
+        self.use_table = use_table
+        self._table = None
         self.default_target = RegulationTarget(
             valence=55,
             arousal=50,
@@ -36,6 +51,15 @@ class RegulationAgent:
         self.debug = []
 
         t = self.default_target
+        cached = self._table_plan(current, t)
+        if cached is not None:
+            # Tablodaki nesneler paylaşılır → plana kopyaları konur
+            delta, guidance, debug = cached
+            self.debug.extend(debug)
+            return RegulationPlan(
+                target=t, delta=dict(delta), guidance=list(guidance), debug=self.debug
+            )
+
         delta = {
             "valence": t.valence - current.valence,
             "arousal": t.arousal - current.arousal,
@@ -51,31 +75,43 @@ class RegulationAgent:
 
         return RegulationPlan(target=t, delta=delta, guidance=guidance, debug=self.debug)
 
+    def _table_plan(self, current: AffectState, t: RegulationTarget):
+        if not self.use_table:
+            return None
+        if self._table is None:
+            from agents.affect_table import warm_default_table
+            self._table = warm_default_table()
+            if self._table is None:
+                return None   # tablo arka planda kuruluyor
+        if t != self._table.target:
+            return None
+        return self._table.plan_for(current)
+
     def _guidance_from_delta(self, d: Dict[str, int]) -> List[str]:
+        G = self.GUIDANCE
         g: List[str] = []
 
         if d["valence"] >= 10:
-            g.append("Valence yükselt: daha pozitif/umutlu tonlar.")
+            g.append(G["valence_up"])
         elif d["valence"] <= -10:
-            g.append("Valence düşür: daha melankolik tonlar (çok ağır değil).")
+            g.append(G["valence_down"])
 
         if d["arousal"] >= 10:
-            g.append("Arousal artır: tempo biraz yüksek, ritmik.")
+            g.append(G["arousal_up"])
         elif d["arousal"] <= -10:
-            g.append("Arousal azalt: düşük tempo, yumuşak geçişler, sakin.")
+            g.append(G["arousal_down"])
 
         if d["physical_comfort"] >= 10:
-            g.append("Physical comfort artır: sıcak/rahatlatıcı tınılar (akustik/lofi/piyano).")
+            g.append(G["comfort_up"])
 
         if d["environmental_calm"] >= 10:
-            g.append("Environmental calm artır: ambient/lofi, minimal, güvenli his.")
+            g.append(G["calm_up"])
 
         if d["emotional_intensity"] <= -10:
-            g.append("Emotional intensity azalt: dramatik olmayan, düşük yoğunluk.")
+            g.append(G["intensity_down"])
         elif d["emotional_intensity"] >= 10:
-            g.append("Emotional intensity artır: duygulu ama kontrol edilebilir.")
+            g.append(G["intensity_up"])
 
         if not g:
-            g.append("Genel denge: orta tempo, sakin-pozitif, rahatsız etmeyen seçim.")
+            g.append(G["balanced"])
         return g
-
@@ -0,0 +1,229 @@
+from __future__ import annotations
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from agents import telemetry
+
+
+class DeadlineExceeded(TimeoutError):
+    """İstek bütçesi ya da bağımlılık zaman aşımı doldu."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Devre açık: bağımlılık soğuma süresince çağrılmaz."""
+
+
+# ================= DEADLINE =================
+_active_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "mood2music_deadline", default=None
+)
+
+
+class Deadline:
+    """
+    Tek bir isteğin uçtan uca süre bütçesi (monotonic saat).
+    Aktif deadline contextvar ile taşınır; coordinator'ın worker thread'lerine
+    telemetry trace'i gibi copy_context() ile geçer.
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def sub(self, fraction: float) -> "Deadline":
+        """Kalan sürenin bir payı (örn. paralel aşamalar için)."""
+        return Deadline(self.remaining() * fraction)
+
+    @contextmanager
+    def activate(self) -> Iterator["Deadline"]:
+        # İç içe deadline dıştakini aşamaz
+        outer: Optional[Deadline] = _active_deadline.get()
+        if outer is not None and outer.expires_at < self.expires_at:
+            self.expires_at = outer.expires_at
+        token = _active_deadline.set(self)
+        try:
+            yield self
+        finally:
+            _active_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _active_deadline.get()
+
+
+def timeout_for(cap: float) -> float:
+    """
+    Bağımlılık çağrısı için zaman aşımı: kendi üst sınırı ile kalan
+    bütçeden küçüğü. Bütçe bittiyse DeadlineExceeded.
+    """
+    deadline = _active_deadline.get()
+    if deadline is None:
+        return cap
+    remaining = deadline.remaining()
+    if remaining <= 0.0:
+        raise DeadlineExceeded("istek bütçesi doldu")
+    return min(cap, remaining)
+
+
+# ---------- TIMEOUT'SUZ ÇAĞRILAR ----------
+# Kendi timeout parametresi olmayan çağrılar (örn. genai generate_content)
+# paylaşılan havuzda çalıştırılıp sınırlı süre beklenir. Süre dolunca çağıran
+# hemen döner; arkadaki çağrı tamamlanınca sonucu atılır.
+_call_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bounded-call")
+
+
+def call_with_timeout(fn: Callable[..., Any], timeout: float, *args, **kwargs) -> Any:
+    future = _call_pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise DeadlineExceeded(f"{timeout:.1f} sn içinde yanıt yok")
+
+
+# ================= CIRCUIT BREAKER =================
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Art arda failure_threshold hata → devre açılır ve cooldown süresince
+    çağrı yapılmaz (anında CircuitOpenError). Süre dolunca tek bir deneme
+    çağrısına izin verilir (half-open): başarılıysa kapanır, değilse yeniden açılır.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # ---------- METRICS ----------
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def _release_probe(self) -> None:
+        # Servis sorunu olmayan hata (örn. 401, bütçe bitişi) devre hakkında
+        # bilgi vermez: durum ve hata sayısı aynı kalır, deneme hakkı geri verilir
+        with self._lock:
+            self._probe_in_flight = False
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        is_failure: Callable[[BaseException], bool] = lambda e: True
+    ) -> Any:
+        """
+        Devre açıksa CircuitOpenError (span outcome=circuit_open).
+        is_failure: hangi istisnaların devreyi besleyeceği (örn. 401 sayılmaz).
+        """
+        if not self.allow():
+            telemetry.set_outcome(telemetry.CIRCUIT_OPEN, self.name)
+            raise CircuitOpenError(f"{self.name}: devre açık")
+        try:
+            result = fn()
+        except BaseException as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self._release_probe()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self._failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str, failure_threshold: int = 3, cooldown: float = 30.0) -> CircuitBreaker:
+    """
+    Süreç içinde bağımlılık başına tek breaker (aynı servisi kullanan
+    tüm agent kopyaları devre durumunu paylaşır).
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, failure_threshold, cooldown)
+        return breaker
+
+
+def breakers_to_prometheus() -> str:
+    with _breakers_lock:
+        breakers: List[CircuitBreaker] = list(_breakers.values())
+    lines = [
+        "# HELP mood2music_circuit_open Whether the dependency circuit is open (1) or not (0).",
+        "# TYPE mood2music_circuit_open gauge",
+    ]
+    rejected = [
+        "# HELP mood2music_circuit_rejected_total Calls skipped because the circuit was open.",
+        "# TYPE mood2music_circuit_rejected_total counter",
+    ]
+    for b in breakers:
+        s = b.stats()
+        lines.append(f'mood2music_circuit_open{{dependency="{b.name}"}} {int(s["state"] == OPEN)}')
+        rejected.append(f'mood2music_circuit_rejected_total{{dependency="{b.name}"}} {s["rejected"]}')
+    return "\n".join(lines + rejected) + "\n"
@@ -0,0 +1,184 @@
+from __future__ import annotations
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+from agents import telemetry
+
+
+def default_cache_path() -> str:
+    return os.getenv(
+        "MOOD2MUSIC_CACHE_DB",
+        os.path.join(os.path.expanduser("~"), ".cache", "mood2music", "results.sqlite3")
+    )
+
+
+class ResultCache:
+    """
+    Sınıflandırıcı sonuçları için disk tabanlı (SQLite), içerik adresli cache.
+    Anahtar: normalize metin + model adı + prompt versiyonu hash'i.
+    WAL modu sayesinde birden çok süreç aynı dosyayı paylaşabilir.
+    """
+
+    EVICT_EVERY = 256   # bu kadar yazmada bir boyut kontrolü
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_entries: int = 50_000,
+        ttl: float | None = 30 * 24 * 3600.0
+    ):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.stats_by_ns: Dict[str, Dict[str, int]] = {}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " namespace TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn().execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_accessed ON results(accessed_at)"
+        )
+
+    # ================= PUBLIC =================
+    def make_key(self, namespace: str, model: str, version: str, text: str) -> str:
+        norm = re.sub(r"\s+", " ", text.lower().strip())
+        raw = "\x1f".join([namespace, model, version, norm])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            row = self._conn().execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+            self._delete(key)
+            row = None
+
+        if row is None:
+            self._count(namespace, "misses")
+            return None
+
+        self._count(namespace, "hits")
+        telemetry.set_outcome(telemetry.CACHE_HIT)
+        try:
+            self._conn().execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        except sqlite3.Error:
+            pass
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        now = time.time()
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO results"
+                " (key, namespace, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, namespace, json.dumps(value, ensure_ascii=False), now, now)
+            )
+        except sqlite3.Error:
+            # Cache yazılamıyorsa analiz yine de devam etmeli
+            return
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """TTL'i geçenleri ve max_entries üstündeki en eski erişilenleri siler."""
+        removed = 0
+        try:
+            conn = self._conn()
+            if self.ttl is not None:
+                removed += conn.execute(
+                    "DELETE FROM results WHERE created_at < ?",
+                    (time.time() - self.ttl,)
+                ).rowcount
+            count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                removed += conn.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    " SELECT key FROM results ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+        except sqlite3.Error:
+            pass
+        return removed
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for ns, c in self.stats_by_ns.items():
+                total = c["hits"] + c["misses"]
+                out[ns] = {
+                    "hits": c["hits"],
+                    "misses": c["misses"],
+                    "hit_rate": c["hits"] / total if total else 0.0,
+                }
+        return out
+
+    # ================= UTILS =================
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _delete(self, key: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM results WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def _count(self, namespace: str, field: str) -> None:
+        with self._lock:
+            c = self.stats_by_ns.setdefault(namespace, {"hits": 0, "misses": 0})
+            c[field] += 1
+
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[ResultCache]:
+    """
+    Süreç içinde paylaşılan varsayılan cache.
+    MOOD2MUSIC_CACHE_DISABLED=1 ise None döner.
+    """
+    global _default_cache
+    if os.getenv("MOOD2MUSIC_CACHE_DISABLED") == "1":
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = ResultCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _default_cache
@@ -0,0 +1,317 @@
+from __future__ import annotations
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import torch
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# CPU çıkarım arka uçları: eager | torchscript | onnx | int8
+BACKENDS = ("eager", "torchscript", "onnx", "int8")
+
+# Parity kontrolü için sabit referans cümleler
+REFERENCE_TEXTS = [
+    "bugün kendimi çok mutlu hissediyorum",
+    "hiçbir şey yolunda gitmiyor, çok üzgünüm",
+    "toplantı saat üçte başlayacak",
+    "bu kadar güzel bir haber beklemiyordum",
+    "yine mi aynı hata, bıktım artık",
+    "yarın sınav var ve çok endişeliyim",
+    "eh işte, idare eder",
+    "harika bir gün geçirdik, teşekkürler",
+    "kimse beni anlamıyor",
+    "kahve içip biraz yürüyüş yaptım",
+]
+
+
+def default_cache_dir() -> str:
+    return os.getenv(
+        "EMOTION_BACKEND_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "mood2music")
+    )
+
+
+def _runtime_tag() -> str:
+    # TorchScript / ONNX çıktısı sürüme bağlı: yükseltmeden sonra eski artefakt kullanılmaz
+    try:
+        import transformers
+        tf_version = transformers.__version__
+    except ImportError:
+        tf_version = "none"
+    return f"torch{torch.__version__}-tf{tf_version}".replace("/", "_").replace("+", "_")
+
+
+def _artifact_path(cache_dir: str, model_name: str, suffix: str) -> str:
+    safe = model_name.replace("/", "__")
+    return os.path.join(cache_dir, f"{safe}.{_runtime_tag()}.{suffix}")
+
+
+def _tmp_path(path: str) -> str:
+    # Aynı artefaktı kuran süreçler birbirinin yarım dosyasına yazmasın
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def _input_names(inputs: Dict[str, torch.Tensor]) -> List[str]:
+    return [k for k in ("input_ids", "attention_mask", "token_type_ids") if k in inputs]
+
+
+class _LogitsOnly(torch.nn.Module):
+    # HF çıktısı (ModelOutput) trace/export edilemez → sadece logits döner
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids=None):
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids,
+        ).logits
+
+
+# ================= BACKENDS =================
+class EagerBackend:
+    name = "eager"
+
+    def __init__(self, model):
+        self.model = model
+
+    def logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(**inputs).logits
+
+
+class TorchScriptBackend:
+    name = "torchscript"
+
+    def __init__(self, module):
+        self.module = module
+
+    @classmethod
+    def build(cls, model, tokenizer, path: str, quantize: bool = False):
+        if os.path.exists(path):
+            try:
+                return cls(torch.jit.load(path, map_location="cpu"))
+            except (RuntimeError, ValueError, OSError):
+                os.remove(path)   # bozuk artefakt → yeniden üret
+
+        model = model.to("cpu").eval()
+        if quantize:
+            # Linear katmanlar int8 dinamik quantization
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        sample = tokenizer(REFERENCE_TEXTS[0], return_tensors="pt")
+        names = _input_names(sample)
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                _LogitsOnly(model), tuple(sample[k] for k in names), strict=False
+            )
+        traced = torch.jit.freeze(traced.eval())
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = _tmp_path(path)
+        try:
+            torch.jit.save(traced, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return cls(traced)
+
+    def logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        names = _input_names(inputs)
+        with torch.no_grad():
+            return self.module(*(inputs[k].to("cpu") for k in names))
+
+
+class Int8Backend(TorchScriptBackend):
+    name = "int8"
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, session):
+        self.session = session
+        self.input_names = {i.name for i in session.get_inputs()}
+
+    @classmethod
+    def build(cls, model, tokenizer, path: str):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("onnx backend için 'onnxruntime' kurulu olmalı") from e
+
+        if not os.path.exists(path):
+            model = model.to("cpu").eval()
+            sample = tokenizer(REFERENCE_TEXTS[0], return_tensors="pt")
+            names = _input_names(sample)
+            dynamic = {k: {0: "batch", 1: "seq"} for k in names}
+            dynamic["logits"] = {0: "batch"}
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = _tmp_path(path)
+            with torch.no_grad():
+                torch.onnx.export(
+                    _LogitsOnly(model),
+                    tuple(sample[k] for k in names),
+                    tmp,
+                    input_names=names,
+                    output_names=["logits"],
+                    dynamic_axes=dynamic,
+                    opset_version=14,
+                )
+            os.replace(tmp, path)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        return cls(session)
+
+    def logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        feed = {
+            k: v.to("cpu").numpy()
+            for k, v in inputs.items() if k in self.input_names
+        }
+        return torch.from_numpy(self.session.run(["logits"], feed)[0])
+
+
+def create_backend(
+    name: str,
+    model,
+    tokenizer,
+    model_name: str,
+    cache_dir: str | None = None
+):
+    """
+    İstenen arka ucu kurar. Export / quantize edilmiş artefaktlar
+    cache_dir altında saklanır ve sonraki açılışlarda yeniden kullanılır.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Bilinmeyen backend: {name} (seçenekler: {BACKENDS})")
+
+    cache_dir = cache_dir or default_cache_dir()
+
+    if name == "eager":
+        return EagerBackend(model)
+    if name == "torchscript":
+        return TorchScriptBackend.build(
+            model, tokenizer, _artifact_path(cache_dir, model_name, "ts.pt")
+        )
+    if name == "int8":
+        return Int8Backend.build(
+            model, tokenizer, _artifact_path(cache_dir, model_name, "int8.ts.pt"),
+            quantize=True
+        )
+    return OnnxBackend.build(
+        model, tokenizer, _artifact_path(cache_dir, model_name, "onnx")
+    )
+
+
+# ================= PARITY & REPORT =================
+@dataclass
+class BackendReport:
+    backend: str
+    parity: float            # eager ile etiket uyumu (0–1)
+    mismatches: List[str]
+    latency_ms_p50: float
+    latency_ms_p95: float
+    load_rss_mb: float       # backend kurulurken RSS artışı (MB), ölçülemezse 0
+    infer_rss_mb: float      # backend çıkarımı sırasında RSS artışı (MB)
+
+
+def _predict_ids(backend, tokenizer, texts: List[str]) -> List[int]:
+    ids = []
+    for t in texts:
+        inputs = tokenizer(t, return_tensors="pt", truncation=True, padding=True)
+        ids.append(int(torch.argmax(backend.logits(dict(inputs)), dim=1).item()))
+    return ids
+
+
+def _rss_mb() -> float:
+    """
+    Sürecin o anki RSS'i (MB). Tepe değer (ru_maxrss) süreç boyunca yalnızca
+    artar ve backend'ler arası karşılaştırılamaz; bu yüzden anlık değer
+    alınıp her backend için önce/sonra farkı raporlanır.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024.0 * 1024.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+    return 0.0
+
+
+def evaluate_backend(
+    backend,
+    reference,
+    tokenizer,
+    texts: List[str] | None = None,
+    repeats: int = 5,
+    load_rss_mb: float = 0.0
+) -> BackendReport:
+    """
+    backend'i eager referansa karşı etiket uyumu, gecikme ve bellek
+    açısından ölçer. load_rss_mb: backend kurulumunda ölçülen RSS artışı.
+    """
+    texts = texts or REFERENCE_TEXTS
+
+    expected = _predict_ids(reference, tokenizer, texts)
+    rss_before = _rss_mb()
+    got = _predict_ids(backend, tokenizer, texts)
+    mismatches = [t for t, a, b in zip(texts, expected, got) if a != b]
+
+    timings: List[float] = []
+    for _ in range(repeats):
+        for t in texts:
+            inputs = dict(tokenizer(t, return_tensors="pt", truncation=True, padding=True))
+            start = time.perf_counter()
+            backend.logits(inputs)
+            timings.append((time.perf_counter() - start) * 1000.0)
+    infer_rss_mb = max(0.0, _rss_mb() - rss_before)
+    timings.sort()
+
+    return BackendReport(
+        backend=backend.name,
+        parity=1.0 - len(mismatches) / len(texts),
+        mismatches=mismatches,
+        latency_ms_p50=timings[len(timings) // 2],
+        latency_ms_p95=timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        load_rss_mb=load_rss_mb,
+        infer_rss_mb=infer_rss_mb,
+    )
+
+
+def compare_backends(
+    model,
+    tokenizer,
+    model_name: str,
+    names: tuple = BACKENDS,
+    cache_dir: str | None = None,
+    texts: List[str] | None = None
+) -> List[BackendReport]:
+    reference = EagerBackend(model)
+    reports: List[BackendReport] = []
+    for name in names:
+        rss_before = _rss_mb()
+        try:
+            backend = create_backend(name, model, tokenizer, model_name, cache_dir)
+        except ImportError:
+            continue
+        load_rss_mb = max(0.0, _rss_mb() - rss_before)
+        reports.append(evaluate_backend(
+            backend, reference, tokenizer, texts, load_rss_mb=load_rss_mb
+        ))
+    return reports
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from agents import telemetry
+from agents.resilience import DeadlineExceeded, current_deadline
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı çağrıları tek upstream çağrısında birleştirir.
+    İlk gelen (lider) fn'i çalıştırır; diğerleri bekler ve aynı sonucu /
+    hatayı paylaşır. Sonuç saklanmaz — cache değil, yalnızca uçuştaki tekilleştirme.
+    Bekleyenler liderin değil kendi isteklerinin deadline'ına uyar: süre
+    dolunca DeadlineExceeded alırlar (lider çalışmaya devam eder).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.calls = 0        # upstream'e giden çağrı
+        self.coalesced = 0    # başka bir çağrıya eklenen (upstream'e gitmeyen)
+
+    # ================= THREADS =================
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            telemetry.set_outcome(telemetry.COALESCED)
+            deadline = current_deadline()
+            if not call.done.wait(deadline.remaining() if deadline is not None else None):
+                telemetry.set_outcome(telemetry.TIMEOUT, f"{self.name}: ortak çağrı beklenirken")
+                raise DeadlineExceeded(f"{self.name}: ortak çağrı süre bütçesinde bitmedi")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    # ================= ASYNCIO =================
+    async def do_async(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        fn coroutine fonksiyonuysa aynı event loop'taki çağrılar birleşir;
+        senkron fn thread yolundan geçer (thread'lerle de birleşir).
+        """
+        if not asyncio.iscoroutinefunction(fn):
+            return await asyncio.to_thread(self.do, key, fn)
+
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            fut = self._async_calls.get(loop_key)
+            if fut is None:
+                fut = self._async_calls[loop_key] = loop.create_future()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            telemetry.set_outcome(telemetry.COALESCED)
+            # shield: bir bekleyenin iptali / zaman aşımı ortak sonucu iptal etmesin
+            deadline = current_deadline()
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(fut), deadline.remaining() if deadline is not None else None
+                )
+            except asyncio.TimeoutError:
+                telemetry.set_outcome(telemetry.TIMEOUT, f"{self.name}: ortak çağrı beklenirken")
+                raise DeadlineExceeded(f"{self.name}: ortak çağrı süre bütçesinde bitmedi")
+
+        try:
+            result = await fn()
+            fut.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            # Bekleyen yoksa "exception never retrieved" uyarısı çıkmasın
+            fut.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_calls.pop(loop_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.calls + self.coalesced
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "coalesce_rate": self.coalesced / total if total else 0.0,
+            }
@@ -1,9 +1,19 @@
 import os
+import json
+import time
 import random
 import base64
+import threading
 import requests
-from typing import Dict
-
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Tuple
+
+from agents import telemetry
+from agents.bootstrap import load_env
+from agents.resilience import DeadlineExceeded, CircuitOpenError, get_breaker, timeout_for
+from agents.single_flight import SingleFlight
+from agents.track_catalog import TrackCatalog
 from agents.affect_vector_agent import AffectState
 from agents.regulation_agent import RegulationPlan
 
@@ -11,36 +21,148 @@ from agents.regulation_agent import RegulationPlan
 class SpotifyAgent:
     TOKEN_URL = "https://accounts.spotify.com/api/token"
     SEARCH_URL = "https://api.spotify.com/v1/search"
+    MARKET = "TR"
+    TOKEN_REFRESH_MARGIN = 60.0   # sn; süre dolmadan bu kadar önce yenile
+    CATALOG_K = 10                # en yakın k parça arasından seçilir
+    CATALOG_BLEND = 0.5           # 0: mevcut state, 1: hedef (iso prensibi: yarı yoldan başla)
+    TIMEOUT = 5.0                 # sn; HTTP çağrısı başına üst sınır (istek bütçesiyle kırpılır)
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_ttl: float = 3600.0,
+        cache_size: int = 64,
+        token_cache_path: str | None = None,
+        catalog: TrackCatalog | None = None,
+        use_catalog: bool = True
+    ):
+        load_env()
         self.client_id = os.getenv("SPOTIFY_CLIENT_ID")
         self.client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
 
         if not self.client_id or not self.client_secret:
             raise ValueError("SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET eksik")
 
+        # ---------- HTTP ----------
+        # Keep-alive + connection pool; her istek yeni bağlantı açmaz
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+
+        # ---------- AUTH (lazy) ----------
+        # Token ilk istekte alınır; constructor ağa çıkmaz
         self.token: str | None = None
-        self._refresh_token()
+        self._token_expires_at = 0.0          # epoch sn
+        self._token_lock = threading.Lock()
+        self.token_cache_path = token_cache_path or os.getenv("SPOTIFY_TOKEN_CACHE")
+        self._token_cache_loaded = False
+
+        # ---------- SEARCH CACHE ----------
+        # (query, market) → TR/yabancı ayrılmış aday havuzu; TTL + LRU
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._pool_cache: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[List[Dict], List[Dict]]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Aynı sorgu aynı anda gelirse tek arama isteği atılır
+        self._flight = SingleFlight("spotify_search")
+        # Spotify art arda zaman aşımı / 5xx verirse bir süre çağrılmaz
+        self._breaker = get_breaker("spotify")
+
+        # ---------- LOCAL CATALOG ----------
+        # Varsa birincil kaynak (ağsız); yoksa / boşsa canlı aramaya düşülür
+        self.catalog = catalog
+        if self.catalog is None and use_catalog:
+            self.catalog = TrackCatalog.load()
 
     # ================= AUTH =================
+    def _token_valid(self) -> bool:
+        return (
+            self.token is not None
+            and time.time() < self._token_expires_at - self.TOKEN_REFRESH_MARGIN
+        )
+
+    def _ensure_token(self) -> str:
+        if self._token_valid():
+            return self.token
+
+        # Aynı anda gelen çağrılar tek bir yenilemeyi paylaşır
+        with self._token_lock:
+            if self._token_valid():
+                return self.token
+
+            if not self._token_cache_loaded:
+                self._token_cache_loaded = True
+                self._load_token_cache()
+                if self._token_valid():
+                    return self.token
+
+            self._refresh_token()
+            return self.token
+
+    def _invalidate_token(self, stale: str | None) -> None:
+        # Sadece 401 alınan token hâlâ güncelse sıfırla;
+        # başka bir thread yenilediyse onu kullan
+        with self._token_lock:
+            if self.token == stale:
+                self.token = None
+                self._token_expires_at = 0.0
+
     def _refresh_token(self):
         auth = f"{self.client_id}:{self.client_secret}"
         b64 = base64.b64encode(auth.encode()).decode()
 
-        r = requests.post(
+        r = self.session.post(
             self.TOKEN_URL,
             headers={
                 "Authorization": f"Basic {b64}",
                 "Content-Type": "application/x-www-form-urlencoded",
             },
             data={"grant_type": "client_credentials"},
-            timeout=15,
+            timeout=timeout_for(self.TIMEOUT),
         )
         r.raise_for_status()
-        self.token = r.json()["access_token"]
+        data = r.json()
+        self.token = data["access_token"]
+        self._token_expires_at = time.time() + float(data.get("expires_in", 3600))
+        self._save_token_cache()
+
+    def _load_token_cache(self) -> None:
+        if not self.token_cache_path:
+            return
+        try:
+            with open(self.token_cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("client_id") != self.client_id:
+                return
+            self.token = data["access_token"]
+            self._token_expires_at = float(data["expires_at"])
+        except Exception:
+            # Bozuk / eksik cache → normal auth akışı
+            return
+
+    def _save_token_cache(self) -> None:
+        if not self.token_cache_path:
+            return
+        tmp = f"{self.token_cache_path}.tmp"
+        try:
+            # Token yalnızca sahibince okunabilsin (umask'tan bağımsız 0600);
+            # önceki çalışmadan kalan .tmp varsa eski izinleri taşımasın
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "client_id": self.client_id,
+                    "access_token": self.token,
+                    "expires_at": self._token_expires_at,
+                }, f)
+            os.replace(tmp, self.token_cache_path)
+        except OSError:
+            pass
 
     def _headers(self):
-        return {"Authorization": f"Bearer {self.token}"}
+        return {"Authorization": f"Bearer {self._ensure_token()}"}
 
     # ================= LANGUAGE =================
     def _is_turkish(self, text: str) -> bool:
@@ -58,7 +180,8 @@ class SpotifyAgent:
             return self._recommend_internal(emotion, state, plan)
         except requests.exceptions.HTTPError as e:
             if e.response is not None and e.response.status_code == 401:
-                self._refresh_token()
+                sent = e.request.headers.get("Authorization", "") if e.request else ""
+                self._invalidate_token(sent.removeprefix("Bearer ") or self.token)
                 return self._recommend_internal(emotion, state, plan)
             raise
 
@@ -70,6 +193,11 @@ class SpotifyAgent:
         plan: RegulationPlan
     ) -> Dict:
 
+        if self.catalog is not None:
+            rec = self._recommend_from_catalog(state, plan)
+            if rec is not None:
+                return rec
+
         queries: list[str] = []
 
         # 1️⃣ EMOTION → zayıf ipucu
@@ -116,41 +244,152 @@ class SpotifyAgent:
 
         query = random.choice(queries)
 
-        # 3️⃣ Spotify Search
+        # 3️⃣ Spotify Search (cache'li, TR/yabancı olarak ayrılmış havuz)
+        try:
+            tr, foreign = self._search_pool(query, self.MARKET)
+        except (DeadlineExceeded, CircuitOpenError, requests.RequestException) as e:
+            if isinstance(e, requests.HTTPError) and not self._is_outage(e):
+                raise   # 401 → recommend() token'ı yenileyip tekrar dener
+            return self._degraded(query, e)
+
+        if not tr and not foreign:
+            telemetry.set_outcome(telemetry.FALLBACK)
+            return self._fallback(query)
+        return self._pick(query, tr, foreign)
+
+    def _pick(self, query: str, tr: List[Dict], foreign: List[Dict]) -> Dict:
+        pool = tr if tr and random.random() < 0.5 else (foreign or tr)
+        track = random.choice(pool)
+
+        return {
+            "query": query,
+            "track": track["name"],
+            "artist": track["artists"][0]["name"],
+            "spotify_url": track["external_urls"]["spotify"],
+            "language": "TR" if track in tr else "Foreign",
+        }
+
+    # ================= CATALOG =================
+    def _recommend_from_catalog(self, state: AffectState, plan: RegulationPlan) -> Dict | None:
+        d = plan.delta
+        point = [
+            getattr(state, dim) + self.CATALOG_BLEND * d[dim]
+            for dim in TrackCatalog.DIMS
+        ]
+        nearest = self.catalog.nearest(point, self.CATALOG_K)
+        if not nearest:
+            return None
+
+        distance, track = random.choice(nearest)
+        telemetry.set_outcome(telemetry.OK, "catalog")
+        return {
+            "query": "katalog",
+            "track": track["name"],
+            "artist": track.get("artist") or "-",
+            "spotify_url": track.get("spotify_url"),
+            "language": "TR" if self._is_turkish(track.get("artist", "")) else "Foreign",
+            "distance": round(distance, 2),
+        }
+
+    # ================= SEARCH CACHE =================
+    def _search_pool(self, query: str, market: str) -> Tuple[List[Dict], List[Dict]]:
+        key = (query, market)
+        now = time.monotonic()
+
+        with self._cache_lock:
+            entry = self._pool_cache.get(key)
+            if entry is not None and now - entry[0] < self.cache_ttl:
+                self._pool_cache.move_to_end(key)
+                self.cache_hits += 1
+                telemetry.set_outcome(telemetry.CACHE_HIT)
+                return entry[1]
+            self.cache_misses += 1
+
+        return self._flight.do(
+            key,
+            lambda: self._breaker.call(
+                lambda: self._fetch_pool(query, market), is_failure=self._is_outage
+            )
+        )
+
+    def _fetch_pool(self, query: str, market: str) -> Tuple[List[Dict], List[Dict]]:
+        key = (query, market)
+        now = time.monotonic()
         params = {
             "q": query,
             "type": "track",
             "limit": 30,
-            "market": "TR"
+            "market": market
         }
 
-        r = requests.get(
+        r = self.session.get(
             self.SEARCH_URL,
             headers=self._headers(),
             params=params,
-            timeout=15,
+            timeout=timeout_for(self.TIMEOUT),
         )
         r.raise_for_status()
 
         items = r.json().get("tracks", {}).get("items", [])
-        if not items:
-            return self._fallback(query)
 
         tr, foreign = [], []
         for t in items:
             artist = t["artists"][0]["name"]
             (tr if self._is_turkish(artist) else foreign).append(t)
 
-        pool = tr if tr and random.random() < 0.5 else (foreign or tr)
-        track = random.choice(pool)
-
-        return {
-            "query": query,
-            "track": track["name"],
-            "artist": track["artists"][0]["name"],
-            "spotify_url": track["external_urls"]["spotify"],
-            "language": "TR" if track in tr else "Foreign",
-        }
+        if items:
+            with self._cache_lock:
+                self._pool_cache[key] = (now, (tr, foreign))
+                self._pool_cache.move_to_end(key)
+                while len(self._pool_cache) > self.cache_size:
+                    self._pool_cache.popitem(last=False)
+        return tr, foreign
+
+    def cache_stats(self) -> Dict:
+        with self._cache_lock:
+            total = self.cache_hits + self.cache_misses
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._pool_cache),
+                "hit_rate": self.cache_hits / total if total else 0.0,
+                "coalesced": self._flight.coalesced,
+            }
+
+    # ================= DEGRADED =================
+    def _is_outage(self, e: BaseException) -> bool:
+        # Yalnızca servis tarafı sorunlar devreyi besler (401 / 4xx / bütçe bitişi değil)
+        if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+            return True
+        if isinstance(e, requests.HTTPError) and e.response is not None:
+            return e.response.status_code >= 500 or e.response.status_code == 429
+        return False
+
+    def _degraded(self, query: str, error: BaseException) -> Dict:
+        """
+        Spotify zamanında yanıt vermedi / devre açık: süresi geçmiş olsa da
+        cache'teki havuzdan (önce aynı sorgu, sonra en son kullanılan) seç,
+        hiç yoksa sabit fallback.
+        """
+        if isinstance(error, (DeadlineExceeded, requests.Timeout)):
+            telemetry.set_outcome(telemetry.TIMEOUT, str(error))
+        elif not isinstance(error, CircuitOpenError):
+            telemetry.set_outcome(telemetry.FALLBACK, str(error))
+
+        with self._cache_lock:
+            entry = self._pool_cache.get((query, self.MARKET))
+            if entry is None and self._pool_cache:
+                key = next(reversed(self._pool_cache))
+                query, entry = key[0], self._pool_cache[key]
+        if entry is not None:
+            tr, foreign = entry[1]
+            if tr or foreign:
+                return self._pick(query, tr, foreign)
+        return self._fallback(query)
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._pool_cache.clear()
 
     def _fallback(self, query: str) -> Dict:
         return {
@@ -0,0 +1,214 @@
+from __future__ import annotations
+import os
+import json
+import time
+import threading
+import contextvars
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Iterator, List, Optional
+
+
+# Span sonuçları
+OK = "ok"
+CACHE_HIT = "cache_hit"
+STALE = "stale"
+FALLBACK = "fallback"
+ERROR = "error"
+SKIPPED = "skipped"
+COALESCED = "coalesced"   # uçuştaki aynı çağrının sonucunu paylaştı
+TIMEOUT = "timeout"       # bağımlılık / istek bütçesi doldu → fallback
+CIRCUIT_OPEN = "circuit_open"   # devre açık, bağımlılık çağrılmadı
+
+
+@dataclass
+class Span:
+    stage: str
+    duration_ms: float
+    outcome: str = OK
+    detail: str = ""
+
+
+class _SpanHandle:
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.outcome = OK
+        self.detail = ""
+
+
+_active_trace: contextvars.ContextVar = contextvars.ContextVar("mood2music_trace", default=None)
+_active_span: contextvars.ContextVar = contextvars.ContextVar("mood2music_span", default=None)
+
+
+class Trace:
+    """
+    Tek bir CoordinatorAgent.process çağrısının span'leri.
+    Aktif trace contextvar ile taşınır; agent'lar span() ile kayıt düşer.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["Trace"]:
+        token = _active_trace.set(self)
+        try:
+            yield self
+        finally:
+            _active_trace.reset(token)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def extend(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {"ts": time.time(), "spans": [asdict(s) for s in self.spans]}
+
+
+def current_trace() -> Optional[Trace]:
+    return _active_trace.get()
+
+
+@contextmanager
+def span(stage: str) -> Iterator[_SpanHandle]:
+    """
+    Aktif trace varsa süreyi ve sonucu kaydeder; yoksa sadece no-op'tur.
+    İstisna fırlarsa outcome=error olarak kaydedilip yeniden fırlatılır.
+    """
+    handle = _SpanHandle(stage)
+    trace: Optional[Trace] = _active_trace.get()
+    token = _active_span.set(handle)
+    start = time.perf_counter()
+    try:
+        yield handle
+    except Exception:
+        handle.outcome = ERROR
+        raise
+    finally:
+        _active_span.reset(token)
+        if trace is not None:
+            trace.add(Span(
+                stage=stage,
+                duration_ms=(time.perf_counter() - start) * 1000.0,
+                outcome=handle.outcome,
+                detail=handle.detail,
+            ))
+
+
+def set_outcome(outcome: str, detail: str = "") -> None:
+    """En içteki açık span'in sonucunu işaretler (cache hit, fallback...)."""
+    handle: Optional[_SpanHandle] = _active_span.get()
+    if handle is not None:
+        handle.outcome = outcome
+        if detail:
+            handle.detail = detail
+
+
+# ================= METRICS =================
+class StageMetrics:
+    """
+    Stage bazında histogramlar (Prometheus text formatı) ve
+    p50/p95/p99 için sınırlı örnek havuzu.
+    """
+
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    RESERVOIR = 2048
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = {}
+        self._counts: Dict[tuple, int] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, stage: str, outcome: str, duration_ms: float) -> None:
+        key = (stage, outcome)
+        with self._lock:
+            buckets = self._buckets.setdefault(key, [0] * (len(self.BUCKETS_MS) + 1))
+            buckets[bisect_left(self.BUCKETS_MS, duration_ms)] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + duration_ms
+            self._counts[key] = self._counts.get(key, 0) + 1
+            self._samples.setdefault(stage, deque(maxlen=self.RESERVOIR)).append(duration_ms)
+
+    def observe_trace(self, trace: Trace) -> None:
+        for s in list(trace.spans):
+            self.observe(s.stage, s.outcome, s.duration_ms)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for stage, samples in self._samples.items():
+                ordered = sorted(samples)
+                out[stage] = {
+                    "count": len(ordered),
+                    "p50": _percentile(ordered, 0.50),
+                    "p95": _percentile(ordered, 0.95),
+                    "p99": _percentile(ordered, 0.99),
+                }
+        return out
+
+    def to_prometheus(self) -> str:
+        name = "mood2music_stage_duration_ms"
+        lines = [
+            f"# HELP {name} CoordinatorAgent stage wall time in milliseconds.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for (stage, outcome), buckets in sorted(self._buckets.items()):
+                labels = f'stage="{stage}",outcome="{outcome}"'
+                cumulative = 0
+                for le, n in zip(self.BUCKETS_MS, buckets):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                cumulative += buckets[-1]
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {self._sums[(stage, outcome)]:.3f}")
+                lines.append(f"{name}_count{{{labels}}} {self._counts[(stage, outcome)]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._sums.clear()
+            self._counts.clear()
+            self._samples.clear()
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class JsonlTraceWriter:
+    """Her trace'i bir satır JSON olarak dosyaya ekler."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_dict(), ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
+
+
+# Süreç genelinde paylaşılan metrikler
+METRICS = StageMetrics()
+
+
+def default_trace_writer() -> Optional[JsonlTraceWriter]:
+    path = os.getenv("MOOD2MUSIC_TRACE_FILE")
+    return JsonlTraceWriter(path) if path else None
@@ -0,0 +1,226 @@
+"""
+Yerel parça kataloğu + 5 boyutlu affect uzayında en yakın komşu indeksi.
+
+Katalog çevrimdışı üretilir (ses özelliklerinden affect koordinatı):
+
+    python -m agents.track_catalog build features.csv catalog.jsonl
+
+CSV kolonları (bulunanlar kullanılır): name/track_name, artist/artists,
+spotify_url/track_id/id, valence, energy, tempo, acousticness,
+instrumentalness, loudness. Çıktı satırı:
+{"name": ..., "artist": ..., "spotify_url": ..., "coords": [5 sayı, 0–100]}
+"""
+from __future__ import annotations
+import os
+import sys
+import csv
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.affect_vector_agent import AffectVectorAgent
+
+
+DIMS = AffectVectorAgent.DIMS
+
+
+def default_catalog_path() -> str:
+    return os.getenv(
+        "MOOD2MUSIC_TRACK_CATALOG",
+        os.path.join(os.path.expanduser("~"), ".cache", "mood2music", "catalog.jsonl")
+    )
+
+
+# ================= FEATURES → AFFECT =================
+def _feature(row: Dict[str, str], name: str, default: float = 0.5) -> float:
+    try:
+        return float(row[name])
+    except (KeyError, TypeError, ValueError):
+        return default
+
+
+def features_to_affect(row: Dict[str, str]) -> List[float]:
+    """
+    Spotify ses özelliklerini (0–1) affect boyutlarına (0–100) eşler.
+    Kaba ama monoton bir eşleme: enerji/tempo → arousal, akustiklik → konfor,
+    enstrümantallik → sakinlik, enerji/ses yüksekliği → yoğunluk.
+    """
+    valence = _feature(row, "valence")
+    energy = _feature(row, "energy")
+    tempo = min(max((_feature(row, "tempo", 110.0) - 60.0) / 120.0, 0.0), 1.0)
+    acoustic = _feature(row, "acousticness")
+    instrumental = _feature(row, "instrumentalness")
+    loudness = min(max((_feature(row, "loudness", -12.0) + 60.0) / 60.0, 0.0), 1.0)
+
+    coords = (
+        valence,
+        0.7 * energy + 0.3 * tempo,
+        0.6 * acoustic + 0.4 * (1.0 - energy),
+        0.5 * instrumental + 0.5 * (1.0 - energy),
+        0.5 * energy + 0.5 * loudness,
+    )
+    return [round(100.0 * c, 2) for c in coords]
+
+
+def _first_artist(raw: str) -> str:
+    # "A;B" ya da "['A', 'B']" biçimleri
+    raw = raw.strip().strip("[]")
+    first = raw.split(";")[0].split("', '")[0]
+    return first.strip().strip("'\"")
+
+
+def build_catalog(csv_path: str, out_path: str) -> int:
+    n = 0
+    with open(csv_path, "r", encoding="utf-8", newline="") as src, \
+            open(out_path, "w", encoding="utf-8") as out:
+        for row in csv.DictReader(src):
+            name = row.get("name") or row.get("track_name")
+            artist = row.get("artist") or row.get("artists") or ""
+            if not name:
+                continue
+            url = row.get("spotify_url")
+            track_id = row.get("track_id") or row.get("id")
+            if not url and track_id:
+                url = f"https://open.spotify.com/track/{track_id}"
+            out.write(json.dumps({
+                "name": name,
+                "artist": _first_artist(artist),
+                "spotify_url": url,
+                "coords": features_to_affect(row),
+            }, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+# ================= KD-TREE =================
+class KDTree:
+    """
+    Küçük, bağımlılıksız KD-tree. Ağaç yalnızca uzayı yapraklara bölmek için
+    kurulur; sorguda yaprak kutularına alt sınır mesafeleri tek numpy işlemiyle
+    hesaplanır, yapraklar yakından uzağa parça parça taranır ve kutu mesafesi
+    mevcut k'ıncı en iyiyi geçince durulur.
+    """
+
+    LEAF_SIZE = 64
+    CHUNK = 16     # bir adımda taranan yaprak sayısı
+
+    def __init__(self, points: np.ndarray):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, len(DIMS))
+        n = self.points.shape[0]
+        self._index = np.arange(n)
+        self._leaves: List[Tuple[int, int]] = []
+        if n:
+            self._split(0, n)
+
+        # Yapraklar sabit boyutlu bloklara (inf dolgulu) → tek fancy-index ile toplanır
+        n_leaves = len(self._leaves)
+        self.leaf_points = np.full((n_leaves, self.LEAF_SIZE, self.points.shape[1]), np.inf)
+        self.leaf_index = np.full((n_leaves, self.LEAF_SIZE), -1, dtype=np.int64)
+        self.lo = np.empty((n_leaves, self.points.shape[1]))
+        self.hi = np.empty((n_leaves, self.points.shape[1]))
+        for i, (s, e) in enumerate(self._leaves):
+            idx = self._index[s:e]
+            pts = self.points[idx]
+            self.leaf_points[i, :e - s] = pts
+            self.leaf_index[i, :e - s] = idx
+            self.lo[i] = pts.min(axis=0)
+            self.hi[i] = pts.max(axis=0)
+
+    def __len__(self) -> int:
+        return self.points.shape[0]
+
+    def _split(self, start: int, end: int) -> None:
+        # En geniş boyuttan medyanla böl; LEAF_SIZE altı yaprak olur
+        if end - start <= self.LEAF_SIZE:
+            self._leaves.append((start, end))
+            return
+        idx = self._index[start:end]
+        pts = self.points[idx]
+        d = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        mid = (end - start) // 2
+        self._index[start:end] = idx[np.argpartition(pts[:, d], mid)]
+        self._split(start, start + mid)
+        self._split(start + mid, end)
+
+    def query(self, point: Sequence[float], k: int = 1) -> List[Tuple[float, int]]:
+        """En yakın k nokta: (öklid mesafesi, orijinal indeks), yakından uzağa."""
+        if not self._leaves or k <= 0:
+            return []
+        q = np.asarray(point, dtype=np.float64)
+
+        # Her yaprak kutusuna en küçük mesafe²
+        gap = np.maximum(np.maximum(self.lo - q, q - self.hi), 0.0)
+        box = np.einsum("ij,ij->i", gap, gap)
+        order = np.argsort(box)
+
+        best_d = np.empty(0)
+        best_i = np.empty(0, dtype=np.int64)
+        worst = np.inf
+        for c in range(0, len(order), self.CHUNK):
+            ids = order[c:c + self.CHUNK]
+            if box[ids[0]] >= worst:
+                break
+            diff = self.leaf_points[ids] - q
+            dist = np.einsum("ijk,ijk->ij", diff, diff).ravel()
+            cand_d = np.concatenate((best_d, dist))
+            cand_i = np.concatenate((best_i, self.leaf_index[ids].ravel()))
+            if len(cand_d) > k:
+                keep = np.argpartition(cand_d, k - 1)[:k]
+                cand_d, cand_i = cand_d[keep], cand_i[keep]
+            best_d, best_i = cand_d, cand_i
+            if len(best_d) == k:
+                worst = best_d.max()
+
+        ok = np.isfinite(best_d)
+        best_d, best_i = best_d[ok], best_i[ok]
+        order = np.argsort(best_d)
+        return [(float(np.sqrt(best_d[j])), int(best_i[j])) for j in order]
+
+
+# ================= CATALOG =================
+class TrackCatalog:
+    DIMS = DIMS
+
+    def __init__(self, tracks: List[Dict]):
+        self.tracks = tracks
+        coords = np.array([t["coords"] for t in tracks], dtype=np.float64).reshape(-1, len(DIMS))
+        self.tree = KDTree(coords)
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+    @classmethod
+    def load(cls, path: str | None = None) -> Optional["TrackCatalog"]:
+        """Dosya yoksa / bozuksa None (çağıran canlı aramaya düşer)."""
+        path = path or default_catalog_path()
+        tracks: List[Dict] = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    t = json.loads(line)
+                    if len(t.get("coords", ())) == len(DIMS) and t.get("name"):
+                        tracks.append(t)
+        except (OSError, ValueError):
+            return None
+        return cls(tracks) if tracks else None
+
+    def nearest(self, point: Sequence[float], k: int = 10) -> List[Tuple[float, Dict]]:
+        return [(dist, self.tracks[i]) for dist, i in self.tree.query(point, k)]
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = argv if argv is not None else sys.argv[1:]
+    if len(args) != 3 or args[0] != "build":
+        print("kullanım: python -m agents.track_catalog build features.csv catalog.jsonl",
+              file=sys.stderr)
+        return 2
+    n = build_catalog(args[1], args[2])
+    print(f"{n} parça yazıldı → {args[2]}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,42 +1,196 @@
 import os
+import threading
+import time
 import requests
-from dotenv import load_dotenv
+from typing import Dict, Iterable, Optional, Tuple
 
-load_dotenv()
+from agents import telemetry
+from agents.bootstrap import load_env
+from agents.resilience import DeadlineExceeded, get_breaker, timeout_for
+from agents.single_flight import SingleFlight
 
 
 class WeatherAgent:
     BASE_URL = "https://api.weatherapi.com/v1/current.json"
+    FALLBACK = {"weather": "unknown", "temperature": 10.0, "is_dark": False}
+    TIMEOUT = 3.0   # sn; istek bütçesi daha azsa o kullanılır
 
-    def __init__(self):
+    def __init__(self, cache_ttl: float = 600.0, stale_ttl: float = 3600.0):
+        load_env()
         self.api_key = os.getenv("WEATHER_API_KEY")
         self.enabled = bool(self.api_key)
 
+        # ---------- CACHE ----------
+        # cache_ttl: taze kabul süresi
+        # stale_ttl: bu süreye kadar eski veri döner, arkada yenilenir
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = max(stale_ttl, cache_ttl)
+        self._cache: Dict[str, Tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+        self._revalidating: set = set()
+        # Aynı şehir için eşzamanlı istekler tek HTTP çağrısını paylaşır
+        self._flight = SingleFlight("weather")
+        # Servis art arda hata verirse bir süre hiç çağrılmaz → anında fallback
+        self._breaker = get_breaker("weather")
+
+        # ---------- BACKGROUND REFRESH ----------
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+
     def get_weather(self, city: str) -> dict:
+        with telemetry.span("weather") as sp:
+            return self._get_weather(city, sp)
+
+    def _get_weather(self, city: str, sp) -> dict:
         # API KEY yoksa veya bossa fallback don
         if not self.enabled:
-            return {"weather": "unknown", "temperature": 10.0, "is_dark": False}
+            sp.outcome = telemetry.SKIPPED
+            return dict(self.FALLBACK)
 
-        params = {"key": self.api_key, "q": city, "lang": "tr"}
+        key = self._key(city)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._cache.get(key)
+
+        if entry is not None:
+            age = now - entry[0]
+            if age < self.cache_ttl:
+                sp.outcome = telemetry.CACHE_HIT
+                return dict(entry[1])
+            if age < self.stale_ttl:
+                # stale-while-revalidate: eskiyi hemen dön, arkada yenile
+                sp.outcome = telemetry.STALE
+                self._revalidate_async(city)
+                return dict(entry[1])
 
         try:
-            r = requests.get(self.BASE_URL, params=params, timeout=10)
-            r.raise_for_status()
-            data = r.json()
+            data = self._fetch_and_store(city)
+        except DeadlineExceeded:
+            data = None   # ortak çağrıyı beklerken bütçe bitti (outcome işaretli)
+        if data is not None:
+            return dict(data)
+
+        # API patlarsa GUI cokmesin (timeout / devre açık ise o sonuç kalır)
+        if sp.outcome not in (telemetry.TIMEOUT, telemetry.CIRCUIT_OPEN):
+            sp.outcome = telemetry.FALLBACK
+        return dict(self.FALLBACK)
+
+    # ================= BACKGROUND REFRESH =================
+    def start_background_refresh(
+        self,
+        cities: Iterable[str],
+        interval: float | None = None
+    ) -> None:
+        """
+        Verilen şehirlerin cache'ini periyodik olarak sıcak tutar.
+        interval verilmezse cache_ttl kullanılır.
+        """
+        if not self.enabled or self._refresh_thread is not None:
+            return
+
+        city_list = list(cities)
+        period = interval if interval is not None else self.cache_ttl
+        self._refresh_stop.clear()
+
+        def loop():
+            while not self._refresh_stop.is_set():
+                for city in city_list:
+                    if self._refresh_stop.is_set():
+                        return
+                    if not self._is_fresh(city):
+                        self._fetch_and_store(city)
+                self._refresh_stop.wait(period)
+
+        self._refresh_thread = threading.Thread(
+            target=loop, name="weather-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._refresh_stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=1.0)
+        self._refresh_thread = None
+
+    # ================= CACHE =================
+    def _key(self, city: str) -> str:
+        return city.strip().lower()
 
-            condition = data["current"]["condition"]["text"].lower()
-            temp = float(data["current"]["temp_c"])
-            is_day = data["current"]["is_day"] == 1
+    def _is_fresh(self, city: str) -> bool:
+        with self._lock:
+            entry = self._cache.get(self._key(city))
+        return entry is not None and time.monotonic() - entry[0] < self.cache_ttl
 
-            return {
-                "weather": self._map_weather(condition),
-                "temperature": temp,
-                "is_dark": not is_day,
-            }
+    def _revalidate_async(self, city: str) -> None:
+        key = self._key(city)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
 
+        def run():
+            try:
+                self._fetch_and_store(city)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=run, name="weather-revalidate", daemon=True).start()
+
+    def _fetch_and_store(self, city: str) -> Optional[dict]:
+        key = self._key(city)
+        return self._flight.do(key, lambda: self._store(key, self._fetch(city)))
+
+    def _store(self, key: str, data: Optional[dict]) -> Optional[dict]:
+        if data is not None:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), data)
+        return data
+
+    def flight_stats(self) -> dict:
+        return self._flight.stats()
+
+    # ================= HTTP =================
+    def _fetch(self, city: str) -> Optional[dict]:
+        try:
+            # Bütçe çağrıdan önce bittiyse servis suçlu değil → devreye sayılmaz
+            timeout = timeout_for(self.TIMEOUT)
+            return self._breaker.call(
+                lambda: self._request(city, timeout), is_failure=self._is_outage
+            )
+        except (DeadlineExceeded, requests.Timeout) as e:
+            telemetry.set_outcome(telemetry.TIMEOUT, str(e))
         except Exception:
-            # API patlarsa GUI cokmesin
-            return {"weather": "unknown", "temperature": 10.0, "is_dark": False}
+            # Devre açık (outcome zaten işaretli) / HTTP / parse hatası
+            pass
+        return None
+
+    def _is_outage(self, e: BaseException) -> bool:
+        # Yalnızca servis tarafı sorunlar devreyi besler; bilinmeyen şehir (4xx)
+        # ya da beklenmeyen cevap (parse hatası) istemciye özgüdür
+        if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+            return True
+        if isinstance(e, requests.HTTPError) and e.response is not None:
+            return e.response.status_code >= 500 or e.response.status_code == 429
+        return False
+
+    def _request(self, city: str, timeout: float) -> dict:
+        params = {"key": self.api_key, "q": city, "lang": "tr"}
+
+        r = requests.get(self.BASE_URL, params=params, timeout=timeout)
+        r.raise_for_status()
+        data = r.json()
+
+        condition = data["current"]["condition"]["text"].lower()
+        temp = float(data["current"]["temp_c"])
+        is_day = data["current"]["is_day"] == 1
+
+        return {
+            "weather": self._map_weather(condition),
+            "temperature": temp,
+            "is_dark": not is_day,
+        }
 
     def _map_weather(self, condition: str) -> str:
         if "yağmur" in condition or "rain" in condition:
@@ -0,0 +1,260 @@
+"""
+Arayüzsüz toplu işleme: JSONL günlük kayıtlarını pipeline'dan geçirir.
+
+    python batch.py entries.jsonl results.jsonl --workers 8
+    python batch.py entries.jsonl results.jsonl --resume
+
+Girdi satırı: {"text": ..., "city": ..., "event": ..., "meal": -1|0|1}
+Çıktı satırı (girdi sırasıyla): {"line": n, "id": ..., "result": {...}} ya da
+{"line": n, "id": ..., "error": "..."}. Süre bütçesi / açık devre yüzünden
+yedeğe düşen aşamalar "degraded" alanında listelenir.
+
+Her worker süreci kendi CoordinatorAgent'ını tutar. Girdi akış halinde okunur;
+bellekte en fazla --window kadar iş bekler. Checkpoint dosyası
+(<çıktı>.ckpt) sayesinde yarıda kalan iş --resume ile devam eder. Sonuçlar
+tekrarlanabilir olsun diye varsayılan olarak süre bütçesi yoktur
+(--deadline ile verilebilir).
+Toplu işlenen kayıtlar duygu geçmişine (affect history) yazılmaz.
+"""
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterator, List, Optional, Tuple
+
+
+DEFAULT_CITY = "Bursa"
+
+# Worker sürecine özel coordinator (initializer kurar)
+_coordinator = None
+
+
+# ================= WORKER =================
+def _init_worker(torch_threads: int, deadline: float = 0.0) -> None:
+    global _coordinator
+    # N süreç × tüm çekirdekler → aşırı abonelik; süreç başına iş parçacığı sınırla
+    try:
+        import torch
+        torch.set_num_threads(max(1, torch_threads))
+    except ImportError:
+        pass
+
+    # Geriye dönük kayıtlar kişisel geçmişe "bugün" olarak eklenmesin
+    # (geçmiş append-only ve zaman sıralı; eski tarihli kayıt eklenemez)
+    os.environ["MOOD2MUSIC_HISTORY_DISABLED"] = "1"
+
+    from agents.coordinator_agent import CoordinatorAgent
+    _coordinator = CoordinatorAgent(
+        background_model_load=False, wait_for_model=True, deadline=deadline
+    )
+
+
+def _process_entry(entry: dict) -> dict:
+    meal = entry.get("meal", 0)
+    res = _coordinator.process(
+        user_text=entry.get("text") or "",
+        city=entry.get("city") or DEFAULT_CITY,
+        event_text=entry.get("event"),
+        micro_input=int(meal) if meal is not None else 0,
+    )
+    return res.to_dict()
+
+
+def _degraded_stages(result: dict) -> List[str]:
+    from agents import telemetry
+
+    return [
+        s["stage"] for s in result.get("spans", [])
+        if s["outcome"] in (telemetry.TIMEOUT, telemetry.CIRCUIT_OPEN)
+    ]
+
+
+def _process_chunk(chunk: List[Tuple[int, Optional[dict], str]]) -> List[str]:
+    """(satır no, kayıt, parse hatası) listesi → JSONL satırları (aynı sırada)."""
+    out = []
+    for line_no, entry, parse_error in chunk:
+        record = {"line": line_no, "id": entry.get("id") if entry else None}
+        if parse_error:
+            record["error"] = parse_error
+        else:
+            try:
+                record["result"] = _process_entry(entry)
+                degraded = _degraded_stages(record["result"])
+                if degraded:
+                    record["degraded"] = degraded
+            except Exception as e:
+                # Tek kayıt patlarsa toplu iş durmasın
+                record["error"] = f"{type(e).__name__}: {e}"
+        out.append(json.dumps(record, ensure_ascii=False))
+    return out
+
+
+# ================= INPUT =================
+def _read_entries(path: str, skip: int) -> Iterator[Tuple[int, Optional[dict], str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if line_no <= skip or not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if not isinstance(entry, dict):
+                    raise ValueError("kayıt JSON nesnesi olmalı")
+                yield line_no, entry, ""
+            except ValueError as e:
+                yield line_no, None, f"geçersiz JSON: {e}"
+
+
+def _chunks(entries: Iterator, size: int) -> Iterator[list]:
+    chunk = []
+    for item in entries:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ================= CHECKPOINT =================
+def _ckpt_path(output: str) -> str:
+    return output + ".ckpt"
+
+
+def _load_checkpoint(output: str, input_path: str) -> Tuple[int, int]:
+    """(işlenmiş son satır no, çıktı dosyasının geçerli bayt uzunluğu)"""
+    try:
+        with open(_ckpt_path(output), "r", encoding="utf-8") as f:
+            ckpt = json.load(f)
+    except (OSError, ValueError):
+        return 0, 0
+    if ckpt.get("input") != os.path.abspath(input_path):
+        return 0, 0
+    return int(ckpt.get("line", 0)), int(ckpt.get("out_bytes", 0))
+
+
+def _save_checkpoint(output: str, input_path: str, line: int, out) -> None:
+    out.flush()
+    os.fsync(out.fileno())
+    tmp = _ckpt_path(output) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({
+            "input": os.path.abspath(input_path),
+            "line": line,
+            "out_bytes": out.tell(),
+            "updated_at": time.time(),
+        }, f)
+    os.replace(tmp, _ckpt_path(output))
+
+
+# ================= RUN =================
+def run(
+    input_path: str,
+    output_path: str,
+    workers: int | None = None,
+    chunk_size: int = 4,
+    window: int | None = None,
+    resume: bool = False,
+    checkpoint_every: int = 100,
+    deadline: float = 0.0
+) -> int:
+    """
+    Dönen değer: bu çalıştırmada yazılan kayıt sayısı.
+    deadline: kayıt başına süre bütçesi (sn); 0 → sınırsız.
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    window = window or max(2, workers * 2)
+
+    skip, out_bytes = _load_checkpoint(output_path, input_path) if resume else (0, 0)
+    try:
+        out_size = os.path.getsize(output_path) if resume else 0
+    except OSError:
+        out_size = -1
+    if out_size < out_bytes:
+        # Çıktı silinmiş / kısalmış: checkpoint'e güvenilmez, baştan başlanır
+        skip, out_bytes = 0, 0
+    out = open(output_path, "r+b" if resume and out_size >= 0 else "wb")
+    # Checkpoint sonrası yazılmış yarım kayıtlar atılır
+    out.truncate(out_bytes)
+    out.seek(out_bytes)
+
+    written = 0
+    last_line = skip
+    since_ckpt = 0
+
+    def write(lines: List[str], chunk_last_line: int) -> None:
+        nonlocal written, last_line, since_ckpt
+        for line in lines:
+            out.write(line.encode("utf-8") + b"\n")
+        written += len(lines)
+        since_ckpt += len(lines)
+        last_line = chunk_last_line
+        if since_ckpt >= checkpoint_every:
+            _save_checkpoint(output_path, input_path, last_line, out)
+            since_ckpt = 0
+
+    chunks = _chunks(_read_entries(input_path, skip), chunk_size)
+    try:
+        if workers <= 0:
+            # Süreç havuzu olmadan (hata ayıklama)
+            _init_worker(os.cpu_count() or 1, deadline)
+            for chunk in chunks:
+                write(_process_chunk(chunk), chunk[-1][0])
+        else:
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(threads, deadline)
+            ) as pool:
+                # Sıralı pencere: en eski iş bitince yazılır, yerine yenisi girer
+                pending: Deque[Tuple[Future, int]] = deque()
+                for chunk in chunks:
+                    pending.append((pool.submit(_process_chunk, chunk), chunk[-1][0]))
+                    if len(pending) >= window:
+                        fut, chunk_last = pending.popleft()
+                        write(fut.result(), chunk_last)
+                while pending:
+                    fut, chunk_last = pending.popleft()
+                    write(fut.result(), chunk_last)
+    finally:
+        _save_checkpoint(output_path, input_path, last_line, out)
+        out.close()
+    return written
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="mood2music arayüzsüz toplu işleme")
+    parser.add_argument("input", help="girdi JSONL (text, city, event, meal)")
+    parser.add_argument("output", help="çıktı JSONL")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="süreç sayısı (varsayılan: çekirdek sayısı, 0: havuzsuz)")
+    parser.add_argument("--chunk-size", type=int, default=4, help="görev başına kayıt")
+    parser.add_argument("--window", type=int, default=None,
+                        help="aynı anda bekleyen en fazla görev (bellek sınırı)")
+    parser.add_argument("--resume", action="store_true", help="checkpoint'ten devam et")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="kaç kayıtta bir checkpoint yazılsın")
+    parser.add_argument("--deadline", type=float, default=0.0,
+                        help="kayıt başına süre bütçesi (sn, 0: sınırsız)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    n = run(
+        args.input, args.output,
+        workers=args.workers,
+        chunk_size=max(1, args.chunk_size),
+        window=args.window,
+        resume=args.resume,
+        checkpoint_every=max(1, args.checkpoint_every),
+        deadline=max(0.0, args.deadline),
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{n} kayıt işlendi, {elapsed:.1f} sn ({n / elapsed if elapsed else 0:.1f} kayıt/sn)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Benchmark'lar için ağ / API anahtarı gerektirmeyen deterministik sahteler:
+- Spotify + WeatherAPI'yi taklit eden yerel HTTP sunucusu
+- Gemini yerine LocalStubModel
+- BERT yerine sabit kurallı ML (istenirse küçük bir yerel HF modeli)
+"""
+from __future__ import annotations
+import os
+import json
+import random
+import time
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Agent'lar import edilmeden önce: gerçek anahtar / cache kullanılmasın
+os.environ["SPOTIFY_CLIENT_ID"] = "bench"
+os.environ["SPOTIFY_CLIENT_SECRET"] = "bench"
+os.environ["WEATHER_API_KEY"] = "bench"
+os.environ["MOOD2MUSIC_CACHE_DISABLED"] = "1"
+os.environ["MOOD2MUSIC_HISTORY_DISABLED"] = "1"
+os.environ.pop("SPOTIFY_TOKEN_CACHE", None)
+os.environ.pop("MOOD2MUSIC_TRACE_FILE", None)
+
+from agents.emotion_agent import EmotionAgent
+from agents.event_agent import EventAgent
+from agents.weather_agent import WeatherAgent
+from agents.context_agent import ContextAgent
+from agents.spotify_agent import SpotifyAgent
+from agents.coordinator_agent import CoordinatorAgent
+from agents.llm_batch import LocalStubModel
+from agents.track_catalog import TrackCatalog
+from agents.affect_history import AffectHistory, RECORD_DTYPE, DAY
+
+
+# ================= STUB HTTP SERVER =================
+ARTISTS = ["Sezen Aksu", "Barış Manço", "Nils Frahm", "Tarkan", "Ólafur Arnalds", "Bonobo"]
+
+
+def _tracks(query: str):
+    return [
+        {
+            "name": f"{query} #{i}",
+            "artists": [{"name": ARTISTS[i % len(ARTISTS)]}],
+            "external_urls": {"spotify": f"https://open.spotify.com/track/bench{i}"},
+        }
+        for i in range(30)
+    ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _send(self, payload: dict, status: int = 200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, path: str):
+        with self.server.hits_lock:
+            self.server.hits[path] += 1
+
+    def do_POST(self):
+        self._count(urlparse(self.path).path)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.startswith("/api/token"):
+            return self._send({"access_token": "bench-token", "expires_in": 3600})
+        self._send({}, 404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        q = parse_qs(url.query)
+        self._count(url.path)
+        if url.path == "/v1/search":
+            return self._send({"tracks": {"items": _tracks(q.get("q", [""])[0])}})
+        if url.path == "/v1/current.json":
+            if q.get("q", [""])[0].lower().startswith("bilinmeyen"):
+                # WeatherAPI: eşleşen konum yok → 400
+                return self._send({"error": {"code": 1006, "message": "No matching location found."}}, 400)
+            return self._send({"current": {
+                "condition": {"text": "Parçalı bulutlu"},
+                "temp_c": 12.5,
+                "is_day": 1,
+            }})
+        self._send({}, 404)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        # Yol başına upstream istek sayısı (örn. "/v1/current.json")
+        self.httpd.hits = Counter()
+        self.httpd.hits_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        # Sahte veri dosyaları (örn. make_history) sunucuyla birlikte silinir
+        self.tmpdir = tempfile.TemporaryDirectory(
+            prefix="mood2music-bench-", ignore_cleanup_errors=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hits(self) -> Counter:
+        with self.httpd.hits_lock:
+            return Counter(self.httpd.hits)
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.tmpdir.cleanup()
+
+
+def make_catalog(n: int = 20_000, seed: int = 0) -> TrackCatalog:
+    """Rastgele affect koordinatlı sentetik katalog."""
+    rng = random.Random(seed)
+    return TrackCatalog([
+        {
+            "name": f"catalog #{i}",
+            "artist": ARTISTS[i % len(ARTISTS)],
+            "spotify_url": f"https://open.spotify.com/track/cat{i}",
+            "coords": [rng.uniform(0, 100) for _ in range(5)],
+        }
+        for i in range(n)
+    ])
+
+
+def make_history(
+    path: str,
+    n: int = 1_000_000,
+    days: int = 400,
+    seed: int = 0
+) -> AffectHistory:
+    """
+    path altında, son `days` güne yayılmış n kayıtlık sentetik geçmiş.
+    Dizini çağıran sahiplenir ve siler (örn. StubServer.tmpdir).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    recs = np.zeros(n, dtype=RECORD_DTYPE)
+    recs["ts"] = np.sort(rng.uniform(-days * DAY, 0.0, n)) + time.time()
+    recs["emotion"] = rng.integers(0, 4, n)
+    recs["state"] = rng.integers(0, 101, (n, 5))
+    path = os.path.join(path, "history")
+    os.makedirs(path, exist_ok=True)
+    recs.tofile(os.path.join(path, "records.bin"))
+    return AffectHistory(path)
+
+
+# ================= STUB LLM =================
+def stub_classify(text: str) -> dict:
+    t = text.lower()
+    if "revize" in t or "acil" in t or "deadline" in t:
+        return {"label": "korku", "event_type": "pressure", "intensity": 0.7}
+    if "mutlu" in t or "güzel" in t:
+        return {"label": "mutluluk", "event_type": "energy_up", "intensity": 0.5}
+    return {"label": "nötr", "event_type": "neutral", "intensity": 0.0}
+
+
+# ================= OFFLINE ML =================
+class OfflineEmotionAgent(EmotionAgent):
+    """BERT yerine deterministik etiket; model indirmez."""
+
+    def _load_model(self, raise_errors: bool = False) -> None:
+        self._model_ready.set()
+
+    def _ml_infer(self, text: str) -> str:
+        return "mutluluk" if len(text) % 2 else "hüzün"
+
+    def _ml_infer_batch(self, texts, batch_size):
+        return [self._ml_infer(t) for t in texts]
+
+
+def make_emotion_agent(hf_model: str | None = None, micro_batch: bool | None = None) -> EmotionAgent:
+    llm = LocalStubModel(stub_classify)
+    if hf_model:
+        # Küçük yerel / önbellekteki bir HF modeli ile gerçek çıkarım
+        cls = type("LocalModelEmotionAgent", (EmotionAgent,), {"HF_MODEL": hf_model})
+        return cls(llm=llm, micro_batch=micro_batch)
+    return OfflineEmotionAgent(llm=llm, micro_batch=micro_batch)
+
+
+def make_event_agent() -> EventAgent:
+    return EventAgent(llm=LocalStubModel(stub_classify))
+
+
+def make_weather_agent(server: StubServer, cache_ttl: float = 600.0) -> WeatherAgent:
+    agent = WeatherAgent(cache_ttl=cache_ttl, stale_ttl=cache_ttl)
+    agent.BASE_URL = f"{server.base_url}/v1/current.json"
+    return agent
+
+
+def make_spotify_agent(server: StubServer, catalog: TrackCatalog | None = None) -> SpotifyAgent:
+    # Diskteki varsayılan katalog ölçümü etkilemesin; yalnızca verilirse kullanılır
+    agent = SpotifyAgent(catalog=catalog, use_catalog=catalog is not None)
+    agent.TOKEN_URL = f"{server.base_url}/api/token"
+    agent.SEARCH_URL = f"{server.base_url}/v1/search"
+    return agent
+
+
+def make_server_factory(server: StubServer, hf_model: str | None = None):
+    """server.main ile aynı paylaşım düzeni (tek BERT + micro-batching), sahte bağımlılıklarla."""
+    from server import shared_coordinator_factory
+
+    return shared_coordinator_factory(
+        emotion_agent=make_emotion_agent(hf_model, micro_batch=True),
+        context_agent=ContextAgent(make_weather_agent(server)),
+        spotify_agent=make_spotify_agent(server),
+        event_agent_factory=make_event_agent,
+    )
+
+
+def make_coordinator(server: StubServer, hf_model: str | None = None) -> CoordinatorAgent:
+    return CoordinatorAgent(
+        emotion_agent=make_emotion_agent(hf_model),
+        event_agent=make_event_agent(),
+        context_agent=ContextAgent(make_weather_agent(server)),
+        spotify_agent=make_spotify_agent(server),
+    )
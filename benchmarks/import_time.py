@@ -0,0 +1,103 @@
+"""
+Soğuk başlangıç import süresi raporu ve bütçe kontrolü.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module agents.coordinator_agent --top 15
+    python -m benchmarks.import_time --budget-ms 600    # aşılırsa çıkış kodu 1
+
+Her ölçüm yeni bir yorumlayıcıda `python -X importtime` ile yapılır (cache'li
+.pyc, ısınmamış modül tablosu); gürültüyü azaltmak için --repeat ölçümün en
+küçüğü alınır. Ağır bağımlılıklar (torch, transformers, google.generativeai,
+matplotlib, dotenv) ilk kullanıma ertelendiği için modül import'unda
+yüklenmemeli; yüklenirse kontrol başarısız olur.
+"""
+from __future__ import annotations
+import os
+import sys
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+
+DEFAULT_MODULE = "agents.coordinator_agent"
+DEFAULT_BUDGET_MS = 800.0
+FORBIDDEN = ("torch", "transformers", "google.generativeai", "matplotlib", "dotenv")
+
+
+def _importtime(code: str) -> List[Tuple[str, float, float, bool]]:
+    """[(modül, self ms, kümülatif ms, doğrudan mı)] — tek soğuk süreç."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=root, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else code)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        # Girintisiz satırlar en dıştaki import'lar (kümülatif süre bunlarda toplanır)
+        rows.append((
+            name.strip(), int(self_us) / 1000.0, int(cum_us) / 1000.0, not name.startswith("  ")
+        ))
+    return rows
+
+
+def measure(module: str) -> Tuple[float, Dict[str, Tuple[float, float]]]:
+    """
+    (toplam ms, modül → (self ms, kümülatif ms)). Yorumlayıcının kendi
+    açılışında yüklenenler (site, encodings...) toplama katılmaz.
+    """
+    startup = {name for name, *_ in _importtime("pass")}
+    total = 0.0
+    modules: Dict[str, Tuple[float, float]] = {}
+    for name, self_ms, cum_ms, top in _importtime(f"import {module}"):
+        if name in startup:
+            continue
+        modules[name] = (self_ms, cum_ms)
+        if top:
+            total += cum_ms
+    return total, modules
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="mood2music soğuk import süresi")
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--repeat", type=int, default=3, help="ölçüm sayısı (en küçüğü)")
+    parser.add_argument("--top", type=int, default=10, help="en yavaş kaç modül listelensin")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="toplam import süresi üst sınırı (0 → kontrol yok)")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(1, args.repeat))]
+    total, modules = min(runs, key=lambda r: r[0])
+
+    print(f"{args.module}: {total:.1f} ms (en iyi {len(runs)} ölçüm)")
+    print(f"\n{'modül':44} {'self ms':>9} {'kümülatif':>10}")
+    for name, (self_ms, cum_ms) in sorted(modules.items(), key=lambda kv: -kv[1][1])[:args.top]:
+        print(f"{name:44} {self_ms:9.1f} {cum_ms:10.1f}")
+    own = sorted(
+        ((n, v) for n, v in modules.items() if n.startswith("agents")),
+        key=lambda kv: -kv[1][0]
+    )
+    print(f"\n{'proje modülü':44} {'self ms':>9} {'kümülatif':>10}")
+    for name, (self_ms, cum_ms) in own[:args.top]:
+        print(f"{name:44} {self_ms:9.1f} {cum_ms:10.1f}")
+
+    failed = False
+    loaded = [m for m in FORBIDDEN if m in modules]
+    if loaded:
+        print(f"\nHATA: ertelenmesi gereken modüller import anında yüklendi: {', '.join(loaded)}")
+        failed = True
+    if args.budget_ms > 0 and total > args.budget_ms:
+        print(f"\nHATA: import süresi bütçeyi aştı: {total:.1f} ms > {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
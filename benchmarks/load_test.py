@@ -0,0 +1,109 @@
+"""
+HTTP API için yerel yük testi (ağsız sahtelerle).
+
+    python -m benchmarks.load_test --clients 16 --requests 2000 --workers 4 --queue 32
+
+Eşzamanlı istemciler /process'e istek atar; gecikme yüzdelikleri, verim ve
+429/503 sayıları raporlanır. --url verilirse çalışan bir sunucu ölçülür.
+"""
+from __future__ import annotations
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from benchmarks import fakes
+from benchmarks.run import EVENTS, TEXTS, _pct
+from server import ApiServer
+
+
+def _client(host: str, port: int, ids: range, latencies: List[float], statuses: Dict[int, int], lock):
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    for i in ids:
+        body = json.dumps({
+            "text": TEXTS[i % len(TEXTS)],
+            "city": "Bursa",
+            "event": EVENTS[i % len(EVENTS)],
+            "meal": (i % 3) - 1,
+        })
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/process", body, {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            status = 0
+        elapsed = (time.perf_counter() - start) * 1000.0
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+    conn.close()
+
+
+def run_load(host: str, port: int, clients: int, requests: int) -> None:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    per_client = max(1, requests // clients)
+
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(host, port, range(c * per_client, (c + 1) * per_client), latencies, statuses, lock),
+        )
+        for c in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    ok = statuses.get(200, 0)
+    print(f"istek={sum(statuses.values())} süre={total:.2f}s verim={ok / total:.1f} req/s")
+    print(f"p50={_pct(latencies, 0.50):.1f}ms p95={_pct(latencies, 0.95):.1f}ms "
+          f"p99={_pct(latencies, 0.99):.1f}ms")
+    print("durumlar:", dict(sorted(statuses.items())))
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="mood2music HTTP API yük testi")
+    parser.add_argument("--url", help="çalışan sunucu (verilmezse sahtelerle yerel sunucu)")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    if args.url:
+        u = urlparse(args.url)
+        run_load(u.hostname, u.port or 80, args.clients, args.requests)
+        return 0
+
+    with fakes.StubServer() as stub:
+        api = ApiServer(
+            fakes.make_server_factory(stub),
+            port=0,
+            workers=args.workers,
+            queue_size=args.queue,
+        ).start()
+        try:
+            host, port = api.address
+            run_load(host, port, args.clients, args.requests)
+        finally:
+            api.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Ağsız mikro-benchmark paketi.
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --compare bench.json
+    python -m benchmarks.run --only emotion --hf-model ./tiny-bert
+
+Her benchmark ops/sn, gecikme yüzdelikleri (p50/p95/p99) ve işlem başına
+bellek tahsisi (tracemalloc) raporlar.
+"""
+from __future__ import annotations
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List
+
+from benchmarks import fakes
+from agents.affect_vector_agent import AffectVectorAgent, AffectState
+from agents.regulation_agent import RegulationAgent
+from agents.affect_batch import score_batch
+from agents.affect_history import DAY
+
+
+TEXTS = [
+    "bugün kendimi çok mutlu hissediyorum",
+    "hiçbir şey yolunda gitmiyor",
+    "eh işte, idare eder",
+    "yarın sunum var ve çok endişeliyim",
+    "sinirden ne yapacağımı bilmiyorum",
+    "vay be, buna inanmıyorum",
+    "güzel bir kahve içtim",
+    "yalnız hissediyorum",
+]
+EVENTS = [
+    "Hocam proje fazla basit kalmış, revize edip tekrar iletebilir misiniz?",
+    "Tebrikler, sunum harikaydı!",
+    "Toplantı yarın saat 10'da.",
+    None,
+    "Deadline yarın, acil dönüş bekliyoruz.",
+]
+CONTEXT = {"temperature": 8.0, "is_dark": True, "day_type": "weekday"}
+
+
+@dataclass
+class BenchResult:
+    name: str
+    ops: int
+    ops_per_sec: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    alloc_kb_per_op: float   # işlem başına ortalama tepe tahsis
+    peak_kb: float           # en yüksek işlem başına tahsis
+
+
+def _pct(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def bench(name: str, fn: Callable[[int], object], iterations: int, warmup: int = 10) -> BenchResult:
+    for i in range(warmup):
+        fn(i)
+
+    timings: List[float] = []
+    start_all = time.perf_counter()
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    total = time.perf_counter() - start_all
+
+    # Bellek ölçümü ayrı geçişte: tracemalloc süreleri bozmasın.
+    # İşlem başına tepe tahsis = reset_peak sonrası tepe - başlangıç
+    alloc_runs = max(1, min(iterations, 50))
+    tracemalloc.start()
+    per_op: List[int] = []
+    for i in range(alloc_runs):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(i)
+        _, peak = tracemalloc.get_traced_memory()
+        per_op.append(max(0, peak - current))
+    tracemalloc.stop()
+
+    timings.sort()
+    return BenchResult(
+        name=name,
+        ops=iterations,
+        ops_per_sec=iterations / total if total else 0.0,
+        p50_ms=_pct(timings, 0.50),
+        p95_ms=_pct(timings, 0.95),
+        p99_ms=_pct(timings, 0.99),
+        alloc_kb_per_op=sum(per_op) / len(per_op) / 1024.0,
+        peak_kb=max(per_op) / 1024.0,
+    )
+
+
+# ================= SUITE =================
+def build_suite(server: fakes.StubServer, hf_model: str | None) -> Dict[str, tuple]:
+    emotion = fakes.make_emotion_agent(hf_model)
+    event = fakes.make_event_agent()
+    affect = AffectVectorAgent()
+    regulation = RegulationAgent()
+    spotify = fakes.make_spotify_agent(server)
+    catalog = fakes.make_catalog()
+    spotify_catalog = fakes.make_spotify_agent(server, catalog)
+    weather_warm = fakes.make_weather_agent(server)
+    weather_cold = fakes.make_weather_agent(server, cache_ttl=0.0)
+    coordinator = fakes.make_coordinator(server, hf_model)
+    history = fakes.make_history(server.tmpdir.name)
+
+    state = AffectState(38, 62, 41, 35, 70)
+    plan = regulation.plan(state)
+
+    n = 10_000
+    batch_args = (
+        [("öfke", "hüzün", "mutluluk", "nötr")[k % 4] for k in range(n)],
+        [("pressure", "energy_up", None)[k % 3] for k in range(n)],
+        [(k % 10) / 10 for k in range(n)],
+        [(k % 3) - 1 for k in range(n)],
+        [k % 2 == 0 for k in range(n)],
+        [float(k % 20) for k in range(n)],
+        [k % 7 < 5 for k in range(n)],
+    )
+
+    def spotify_cold(i):
+        spotify.clear_cache()
+        spotify.recommend("hüzün", state, plan)
+
+    return {
+        "emotion.analyze": (lambda i: emotion.analyze(TEXTS[i % len(TEXTS)]), 500),
+        "emotion.analyze_batch[32]": (
+            lambda i: emotion.analyze_batch([TEXTS[(i + k) % len(TEXTS)] for k in range(32)]), 50
+        ),
+        "event.analyze": (lambda i: event.analyze(EVENTS[i % len(EVENTS)]), 500),
+        "event.analyze_batch[32]": (
+            lambda i: event.analyze_batch([EVENTS[(i + k) % len(EVENTS)] for k in range(32)]), 50
+        ),
+        "affect.calculate": (
+            lambda i: affect.calculate("öfke", "pressure", 0.7, (i % 3) - 1, CONTEXT), 5000
+        ),
+        "regulation.plan": (lambda i: regulation.plan(state), 5000),
+        "affect.score_batch[10k]": (lambda i: score_batch(*batch_args), 50),
+        "spotify.recommend[cold]": (spotify_cold, 200),
+        "spotify.recommend[warm]": (lambda i: spotify.recommend("hüzün", state, plan), 2000),
+        "spotify.recommend[catalog]": (
+            lambda i: spotify_catalog.recommend("hüzün", state, plan), 2000
+        ),
+        "catalog.nearest[20k]": (
+            lambda i: catalog.nearest([(i * 7) % 100, 50, 60, (i * 3) % 100, 40], 10), 2000
+        ),
+        "history.weekly_means[1M]": (lambda i: history.weekly_means(52, dims=["valence"]), 50),
+        "history.between[day]": (
+            lambda i: history.between(time.time() - (i % 300 + 1) * DAY, time.time() - (i % 300) * DAY),
+            2000
+        ),
+        "weather.get_weather[cold]": (lambda i: weather_cold.get_weather("Bursa"), 200),
+        "weather.get_weather[warm]": (lambda i: weather_warm.get_weather("Bursa"), 5000),
+        "coordinator.process": (
+            lambda i: coordinator.process(
+                TEXTS[i % len(TEXTS)], "Bursa", EVENTS[i % len(EVENTS)], (i % 3) - 1
+            ), 200
+        ),
+    }
+
+
+def compare(current: List[BenchResult], baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+
+    print(f"\n{'benchmark':34} {'ops/s Δ':>10} {'p50 Δ':>10} {'p95 Δ':>10}")
+    for r in current:
+        b = baseline.get(r.name)
+        if not b:
+            continue
+        def delta(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{r.name:34} {delta(r.ops_per_sec, b['ops_per_sec']):>10} "
+              f"{delta(r.p50_ms, b['p50_ms']):>10} {delta(r.p95_ms, b['p95_ms']):>10}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="mood2music ağsız benchmark paketi")
+    parser.add_argument("--out", help="sonuçları JSON olarak yaz")
+    parser.add_argument("--compare", help="önceki JSON sonucu ile karşılaştır")
+    parser.add_argument("--only", help="adı bu önekle başlayan benchmark'lar")
+    parser.add_argument("--hf-model", help="BERT yerine küçük yerel HF modeli (opsiyonel)")
+    parser.add_argument("--scale", type=float, default=1.0, help="iterasyon çarpanı")
+    args = parser.parse_args(argv)
+
+    results: List[BenchResult] = []
+    with fakes.StubServer() as server:
+        for name, (fn, iterations) in build_suite(server, args.hf_model).items():
+            if args.only and not name.startswith(args.only):
+                continue
+            r = bench(name, fn, max(1, int(iterations * args.scale)))
+            results.append(r)
+            print(f"{r.name:34} {r.ops_per_sec:12.1f} ops/s  "
+                  f"p50={r.p50_ms:8.3f}ms p95={r.p95_ms:8.3f}ms p99={r.p99_ms:8.3f}ms  "
+                  f"alloc={r.alloc_kb_per_op:8.1f}KB/op")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "created_at": time.time(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "results": [asdict(r) for r in results],
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
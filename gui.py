@@ -1,8 +1,15 @@
-import customtkinter as ctk
+from agents.bootstrap import StartupTimer
+
+# Başlangıç aşamaları (MOOD2MUSIC_STARTUP_REPORT=1 → stderr)
+STARTUP = StartupTimer()
+
+with STARTUP.phase("import.ui"):
+    import customtkinter as ctk
+import os
 import webbrowser
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import random
+import queue
+import threading
 
 # ================= GLOBAL UI REFERENCES =================
 lbl_track = None
@@ -14,6 +21,7 @@ debug_box = None
 
 input_event = None
 input_mood = None
+lbl_preview = None
 meal_var = None
 city_var = None
 
@@ -30,14 +38,29 @@ TR_CITIES = [
 ]
 
 # ================= AGENT IMPORT =================
-try:
-    from agents.coordinator_agent import CoordinatorAgent
-    coordinator = CoordinatorAgent()
-    COORDINATOR_AVAILABLE = True
-except Exception as e:
-    print("Agent import hatası:", e)
-    COORDINATOR_AVAILABLE = False
-    coordinator = None
+# Agent'lar pencere açıldıktan sonra arka planda kurulur; o sırada gelen
+# analiz isteği kuyrukta bekler.
+coordinator = None
+COORDINATOR_AVAILABLE = True
+_coordinator_ready = threading.Event()
+
+
+def _init_coordinator():
+    global coordinator, COORDINATOR_AVAILABLE
+    try:
+        with STARTUP.phase("agents"):
+            from agents.coordinator_agent import CoordinatorAgent
+            coordinator = CoordinatorAgent()
+        # İsteğe bağlı: 81 şehrin hava durumunu arka planda sıcak tut
+        # (her periyotta WeatherAPI kotasından şehir sayısı kadar istek harcar)
+        if os.getenv("MOOD2MUSIC_WEATHER_PREFETCH") == "1":
+            coordinator.context_agent.weather_agent.start_background_refresh(TR_CITIES)
+    except Exception as e:
+        print("Agent import hatası:", e)
+        COORDINATOR_AVAILABLE = False
+        coordinator = None
+    finally:
+        _coordinator_ready.set()
 
 # ================= THEME SETTINGS =================
 ctk.set_appearance_mode("dark")
@@ -57,30 +80,115 @@ COLORS = {
 }
 
 # ================= GRAPH FUNCTION =================
-def update_chart(values):
-    ax.clear()
-    categories = ["Valence\n(Mutluluk)", "Arousal\n(Enerji)", "Comfort\n(Rahatlık)", "Calm\n(Sakinlik)", "Intensity\n(Yoğunluk)"]
+# Eksen / çizgi / dolgu bir kez oluşturulur; güncellemede yalnızca değişen
+# artist'ler blit edilir ve değerler kısa bir animasyonla hedefe kayar.
+CHART_CATEGORIES = ["Valence\n(Mutluluk)", "Arousal\n(Enerji)", "Comfort\n(Rahatlık)", "Calm\n(Sakinlik)", "Intensity\n(Yoğunluk)"]
+CHART_ANIM_MS = 300
+CHART_FRAME_MS = 16
+
+fig = ax = canvas = None
+chart_line = None
+chart_fill = None
+chart_background = None
+chart_values = [0.0] * 5
+chart_anim = None
+
+
+def build_chart():
+    # matplotlib ilk çizimden sonra yüklenir → pencere beklemeden açılır
+    global fig, ax, canvas
 
-    ax.plot(categories, values, color=COLORS["chart_line"], marker="o", linewidth=2, markersize=6)
-    ax.fill_between(categories, values, color=COLORS["chart_line"], alpha=0.15)
+    with STARTUP.phase("chart"):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+        fig, ax = plt.subplots(figsize=(6, 3), dpi=100)
+        canvas = FigureCanvasTkAgg(fig, master=summary_card)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        init_chart()
+
+
+def init_chart():
+    global chart_line, chart_fill
+
+    x = list(range(len(CHART_CATEGORIES)))
+
+    fig.patch.set_facecolor(COLORS["card_bg"])
+    ax.set_facecolor(COLORS["card_bg"])
+
+    ax.set_xlim(-0.3, len(x) - 0.7)
     ax.set_ylim(-1.1, 1.1)
+    ax.set_xticks(x)
+    ax.set_xticklabels(CHART_CATEGORIES)
     ax.axhline(0, color=COLORS["text_sub"], linestyle="--", linewidth=0.8)
     ax.set_ylabel("Denge Sapması (Merkez=0)", color=COLORS["text_sub"], fontsize=8)
 
-    fig.patch.set_facecolor(COLORS["card_bg"])
-    ax.set_facecolor(COLORS["card_bg"])
-    
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
     ax.spines["bottom"].set_color(COLORS["text_sub"])
     ax.spines["left"].set_color(COLORS["text_sub"])
-    
+
     ax.tick_params(axis="x", colors=COLORS["text_sub"], labelsize=8)
     ax.tick_params(axis="y", colors=COLORS["text_sub"], labelsize=8)
 
+    (chart_fill,) = ax.fill(*zip(*_fill_vertices(chart_values)), color=COLORS["chart_line"], alpha=0.15, animated=True)
+    (chart_line,) = ax.plot(x, chart_values, color=COLORS["chart_line"], marker="o", linewidth=2, markersize=6, animated=True)
+
+    canvas.mpl_connect("draw_event", _on_chart_draw)
     canvas.draw()
 
+
+def _fill_vertices(values):
+    x = list(range(len(values)))
+    return [(x[0], 0.0)] + list(zip(x, values)) + [(x[-1], 0.0)]
+
+
+def _on_chart_draw(event):
+    # Tam çizimden (ilk açılış / yeniden boyutlandırma) sonra statik arka planı sakla
+    global chart_background
+    chart_background = canvas.copy_from_bbox(ax.bbox)
+    _blit_chart()
+
+
+def _blit_chart():
+    if chart_background is None:
+        return
+    canvas.restore_region(chart_background)
+    ax.draw_artist(chart_fill)
+    ax.draw_artist(chart_line)
+    canvas.blit(ax.bbox)
+
+
+def _set_chart_values(values):
+    global chart_values
+    chart_values = list(values)
+    if chart_line is None:
+        return  # grafik henüz kurulmadı; build_chart son değerlerle çizer
+    chart_line.set_ydata(chart_values)
+    chart_fill.set_xy(_fill_vertices(chart_values))
+    _blit_chart()
+
+
+def update_chart(values):
+    global chart_anim
+
+    if chart_anim is not None:
+        app.after_cancel(chart_anim)
+        chart_anim = None
+
+    start = list(chart_values)
+    target = list(values)
+    steps = max(1, CHART_ANIM_MS // CHART_FRAME_MS)
+
+    def frame(i):
+        global chart_anim
+        t = i / steps
+        ease = 1 - (1 - t) ** 3  # ease-out
+        _set_chart_values([a + (b - a) * ease for a, b in zip(start, target)])
+        chart_anim = app.after(CHART_FRAME_MS, frame, i + 1) if i < steps else None
+
+    frame(1)
+
 # ================= HELPERS =================
 def translate_weather(w_eng):
     mapping = {
@@ -128,9 +236,76 @@ def format_score_calc(param_name, breakdown_dict, current_val):
 
 
 # ================= PIPELINE =================
+# Analiz Tk ana thread'inde değil, arka plandaki tek bir worker'da çalışır.
+# Sonuçlar thread-safe kuyruktan after() ile okunur; yeni istek eskisini geçersiz kılar.
+_job_queue = queue.Queue()
+_result_queue = queue.Queue()
+_job_inputs = {}
+_latest_job_id = 0
+_worker_thread = None
+RESULT_POLL_MS = 16
+
+
+def _pipeline_worker():
+    _coordinator_ready.wait()
+    while True:
+        job_id, kwargs = _job_queue.get()
+        if job_id != _latest_job_id:
+            continue  # bu arada daha yeni bir istek geldi → atla
+        if coordinator is None:
+            _result_queue.put((job_id, None, None))   # agent kurulamadı → demo
+            continue
+        try:
+            res = coordinator.process(**kwargs)
+            _result_queue.put((job_id, res, None))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            _result_queue.put((job_id, None, e))
+
+
+def _ensure_worker():
+    global _worker_thread
+    if _worker_thread is None:
+        _worker_thread = threading.Thread(target=_pipeline_worker, name="pipeline", daemon=True)
+        _worker_thread.start()
+
+
+def set_busy(busy):
+    if busy:
+        btn_analyze.configure(text="⏳ Analiz ediliyor...")
+        lbl_emotion.configure(text="ANALİZ EDİLİYOR...")
+    else:
+        btn_analyze.configure(text=ANALYZE_TEXT)
+
+
+def poll_results():
+    try:
+        while True:
+            job_id, res, err = _result_queue.get_nowait()
+            if job_id != _latest_job_id:
+                continue  # eski isteğin sonucu → gösterme
+            set_busy(False)
+            if err is not None:
+                render_error(err)
+                continue
+            if res is None:
+                begin_report()
+                render_mock()
+                continue
+            try:
+                render_result(res, *_job_inputs[job_id])
+            except Exception as e:
+                render_error(e)
+    except queue.Empty:
+        pass
+    poll_preview()
+    app.after(RESULT_POLL_MS, poll_results)
+
+
 def run_pipeline():
-    global lbl_track, lbl_artist, btn_spotify, txt_activity, lbl_emotion, debug_box
-    
+    global _latest_job_id
+
     user_text = input_mood.get("1.0", "end").strip()
     event_text = input_event.get("1.0", "end").strip()
     city = city_var.get() or "Bursa"
@@ -139,6 +314,110 @@ def run_pipeline():
     if not user_text:
         return 
 
+    if not COORDINATOR_AVAILABLE:
+        begin_report()
+        render_mock()
+        return
+
+    # Kuyrukta bekleyen eski işleri at; yalnızca en son istek çalışsın
+    try:
+        while True:
+            _job_queue.get_nowait()
+    except queue.Empty:
+        pass
+
+    _latest_job_id += 1
+    _job_inputs.clear()
+    _job_inputs[_latest_job_id] = (event_text, micro_input)
+
+    set_busy(True)
+    _ensure_worker()
+    _job_queue.put((_latest_job_id, dict(
+        user_text=user_text,
+        city=city,
+        event_text=event_text if event_text else None,
+        micro_input=micro_input,
+    )))
+
+
+# ================= LIVE PREVIEW =================
+# Yazarken: rule yolu her düzenlemede (Tk thread'inde, µs), BERT yalnızca
+# yazma duraklayınca tam metin üzerinde arka planda çalışır. BERT sonucu
+# agent'ın memo'suna düşer → "Analiz Et" tekrar hesaplamaz.
+PREVIEW_ML_DELAY_MS = 500
+_preview_queue = queue.Queue()
+_preview_results = queue.Queue()
+_preview_thread = None
+_preview_after = None
+_preview_text = None
+
+
+def _preview_worker():
+    while True:
+        text = _preview_queue.get()
+        # Birikenlerden yalnızca en sonuncusu
+        try:
+            while True:
+                text = _preview_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            _preview_results.put(coordinator.emotion_agent.preview(text, with_ml=True))
+        except Exception:
+            pass
+
+
+def _request_ml_preview(text):
+    global _preview_thread, _preview_after
+    _preview_after = None
+    if _preview_thread is None:
+        _preview_thread = threading.Thread(target=_preview_worker, name="preview", daemon=True)
+        _preview_thread.start()
+    _preview_queue.put(text)
+
+
+def on_mood_edit(event=None):
+    global _preview_after, _preview_text
+
+    if coordinator is None:
+        return  # agent'lar henüz yükleniyor / yüklenemedi
+
+    raw = input_mood.get("1.0", "end-1c")
+    p = coordinator.emotion_agent.preview(raw)
+    if p.text == _preview_text:
+        return  # yalnızca boşluk / büyük-küçük harf değişti
+    _preview_text = p.text
+    render_preview(p)
+
+    if _preview_after is not None:
+        app.after_cancel(_preview_after)
+        _preview_after = None
+    if not p.text:
+        return
+
+    _preview_after = app.after(PREVIEW_ML_DELAY_MS, _request_ml_preview, raw)
+
+
+def render_preview(p):
+    if not p.text:
+        lbl_preview.configure(text="")
+        return
+    ml = p.ml_label.upper() if p.ml_label else "…"
+    lbl_preview.configure(text=f"Ön izleme → Kural: {p.rule_label.upper()} · BERT: {ml}")
+
+
+def poll_preview():
+    try:
+        while True:
+            p = _preview_results.get_nowait()
+            # Sonuç gelene kadar metin değiştiyse eskisi gösterilmez
+            if p.text == _preview_text:
+                render_preview(p)
+    except queue.Empty:
+        pass
+
+
+def begin_report():
     debug_box.configure(state="normal")
     debug_box.delete("1.0", "end")
 
@@ -149,119 +428,120 @@ def run_pipeline():
     )
     debug_box.insert("end", disclaimer_text, "warning")
 
-    if COORDINATOR_AVAILABLE:
-        try:
-            res = coordinator.process(
-                user_text=user_text,
-                city=city,
-                event_text=event_text if event_text else None,
-                micro_input=micro_input,
-            )
-
-            lbl_emotion.configure(text=res.final_emotion.upper())
-
-            s = res.affect_state
-            chart_values = [
-                (s.valence - 50) / 50,
-                (s.arousal - 50) / 50,
-                (s.physical_comfort - 50) / 50,
-                (s.environmental_calm - 50) / 50,
-                (s.emotional_intensity - 50) / 50,
-            ]
-            update_chart(chart_values)
-
-            # --- DEBUG RAPORU ---
-            
-            # 1. GİRDİLER
-            debug_box.insert("end", "📌 ADIM 1: GİRDİ ANALİZİ\n", "header")
-            debug_box.insert("end", f"• Duygu Tespiti: {res.final_emotion.upper()}\n")
-            
-            if res.context:
-                w_str = translate_weather(res.context.get('weather'))
-                temp = res.context.get('temperature')
-                time_d = "Gece" if res.context.get('is_dark') else "Gündüz"
-                debug_box.insert("end", f"• Ortam: {res.context.get('city')}, {w_str}, {temp}°C, {time_d}\n")
-            
-            meal_status = "Nötr"
-            if micro_input == 1: meal_status = "İyi/Tok (+)"
-            elif micro_input == -1: meal_status = "Kötü/Aç (-)"
-            debug_box.insert("end", f"• Fizyolojik Durum: {meal_status}\n")
-
-            if event_text:
-                evt_breakdown = res.affect_breakdown.get("event", {})
-                impact_label = interpret_event_impact(evt_breakdown)
-                short_text = (event_text[:30] + '..') if len(event_text) > 30 else event_text
-                debug_box.insert("end", f"• Olay Girdisi: '{short_text}'\n")
-                debug_box.insert("end", f"• Olay Etkisi: {impact_label}\n")
-            else:
-                debug_box.insert("end", "• Olay Girdisi: Yok (Nötr)\n")
-
-
-            # 2. HESAPLAMA
-            debug_box.insert("end", "\n🧮 ADIM 2: 5 BOYUTLU HESAPLAMA\n", "header")
-            debug_box.insert("end", "Her boyut 50 puan ile başlar. Faktörler toplanır.\n", "info")
-            
-            bd = res.affect_breakdown
-            debug_box.insert("end", format_score_calc("valence", bd, s.valence) + "\n")
-            debug_box.insert("end", format_score_calc("arousal", bd, s.arousal) + "\n")
-            debug_box.insert("end", format_score_calc("physical_comfort", bd, s.physical_comfort) + "\n")
-            debug_box.insert("end", format_score_calc("environmental_calm", bd, s.environmental_calm) + "\n")
-            debug_box.insert("end", format_score_calc("emotional_intensity", bd, s.emotional_intensity) + "\n")
-
-            # 3. REGÜLASYON
-            debug_box.insert("end", "\n🎯 ADIM 3: REGÜLASYON STRATEJİSİ\n", "header")
-            
-            guidance_list = res.regulation.guidance
-            if not guidance_list:
-                debug_box.insert("end", "• Durum dengeli, radikal bir değişim gerekmiyor.\n")
-            else:
-                for guide in guidance_list:
-                    debug_box.insert("end", f"• Karar: {guide}\n")
-            
-            delta = res.regulation.delta
-            max_delta_key = max(delta, key=lambda k: abs(delta[k]))
-            max_val = delta[max_delta_key]
-            
-            if abs(max_val) > 5:
-                action = "artırmaya" if max_val > 0 else "azaltmaya"
-                focus = f"Sistem '{max_delta_key}' seviyesini {action} odaklandı."
-                debug_box.insert("end", f"👉 Strateji: {focus}\n", "info")
-
-            # Müzik & Aktivite
-            music = res.music or {}
-            lbl_track.configure(text=music.get("track", "Öneri Yok"))
-            lbl_artist.configure(text=music.get("artist", "-"))
-            
-            spotify_link = music.get("spotify_url")
-            if spotify_link:
-                btn_spotify.configure(state="normal", command=lambda: webbrowser.open(spotify_link))
-            else:
-                btn_spotify.configure(state="disabled")
-
-            txt_activity.configure(state="normal")
-            txt_activity.delete("1.0", "end")
-            txt_activity.insert("end", res.micro_activity)
-            txt_activity.configure(state="disabled")
 
-        except Exception as e:
-            debug_box.insert("end", f"\n❌ HATA: {e}\n", "header")
-            print(e)
-            import traceback
-            traceback.print_exc()
+def render_result(res, event_text, micro_input):
+    begin_report()
+
+    lbl_emotion.configure(text=res.final_emotion.upper())
+
+    s = res.affect_state
+    chart_values = [
+        (s.valence - 50) / 50,
+        (s.arousal - 50) / 50,
+        (s.physical_comfort - 50) / 50,
+        (s.environmental_calm - 50) / 50,
+        (s.emotional_intensity - 50) / 50,
+    ]
+    update_chart(chart_values)
+
+    # --- DEBUG RAPORU ---
+
+    # 1. GİRDİLER
+    debug_box.insert("end", "📌 ADIM 1: GİRDİ ANALİZİ\n", "header")
+    debug_box.insert("end", f"• Duygu Tespiti: {res.final_emotion.upper()}\n")
+
+    if res.context:
+        w_str = translate_weather(res.context.get('weather'))
+        temp = res.context.get('temperature')
+        time_d = "Gece" if res.context.get('is_dark') else "Gündüz"
+        debug_box.insert("end", f"• Ortam: {res.context.get('city')}, {w_str}, {temp}°C, {time_d}\n")
+
+    meal_status = "Nötr"
+    if micro_input == 1: meal_status = "İyi/Tok (+)"
+    elif micro_input == -1: meal_status = "Kötü/Aç (-)"
+    debug_box.insert("end", f"• Fizyolojik Durum: {meal_status}\n")
+
+    if event_text:
+        evt_breakdown = res.affect_breakdown.get("event", {})
+        impact_label = interpret_event_impact(evt_breakdown)
+        short_text = (event_text[:30] + '..') if len(event_text) > 30 else event_text
+        debug_box.insert("end", f"• Olay Girdisi: '{short_text}'\n")
+        debug_box.insert("end", f"• Olay Etkisi: {impact_label}\n")
     else:
-        # Mock Data
-        lbl_emotion.configure(text="TEST: MUTLU")
-        update_chart([random.uniform(-0.8, 0.8) for _ in range(5)])
-        
-        lbl_track.configure(text="Test Şarkısı")
-        lbl_artist.configure(text="Test Sanatçısı")
-        
-        txt_activity.configure(state="normal")
-        txt_activity.delete("1.0", "end")
-        txt_activity.insert("end", "Agent bağlı değil. Demo çıktısıdır.")
-        txt_activity.configure(state="disabled")
-        
-        debug_box.insert("end", "⚠️ Agent bulunamadı, mock veriler.", "header")
+        debug_box.insert("end", "• Olay Girdisi: Yok (Nötr)\n")
+
+
+    # 2. HESAPLAMA
+    debug_box.insert("end", "\n🧮 ADIM 2: 5 BOYUTLU HESAPLAMA\n", "header")
+    debug_box.insert("end", "Her boyut 50 puan ile başlar. Faktörler toplanır.\n", "info")
+
+    bd = res.affect_breakdown
+    debug_box.insert("end", format_score_calc("valence", bd, s.valence) + "\n")
+    debug_box.insert("end", format_score_calc("arousal", bd, s.arousal) + "\n")
+    debug_box.insert("end", format_score_calc("physical_comfort", bd, s.physical_comfort) + "\n")
+    debug_box.insert("end", format_score_calc("environmental_calm", bd, s.environmental_calm) + "\n")
+    debug_box.insert("end", format_score_calc("emotional_intensity", bd, s.emotional_intensity) + "\n")
+
+    # 3. REGÜLASYON
+    debug_box.insert("end", "\n🎯 ADIM 3: REGÜLASYON STRATEJİSİ\n", "header")
+
+    guidance_list = res.regulation.guidance
+    if not guidance_list:
+        debug_box.insert("end", "• Durum dengeli, radikal bir değişim gerekmiyor.\n")
+    else:
+        for guide in guidance_list:
+            debug_box.insert("end", f"• Karar: {guide}\n")
+
+    delta = res.regulation.delta
+    max_delta_key = max(delta, key=lambda k: abs(delta[k]))
+    max_val = delta[max_delta_key]
+
+    if abs(max_val) > 5:
+        action = "artırmaya" if max_val > 0 else "azaltmaya"
+        focus = f"Sistem '{max_delta_key}' seviyesini {action} odaklandı."
+        debug_box.insert("end", f"👉 Strateji: {focus}\n", "info")
+
+    # Müzik & Aktivite
+    music = res.music or {}
+    lbl_track.configure(text=music.get("track", "Öneri Yok"))
+    lbl_artist.configure(text=music.get("artist", "-"))
+
+    spotify_link = music.get("spotify_url")
+    if spotify_link:
+        btn_spotify.configure(state="normal", command=lambda: webbrowser.open(spotify_link))
+    else:
+        btn_spotify.configure(state="disabled")
+
+    txt_activity.configure(state="normal")
+    txt_activity.delete("1.0", "end")
+    txt_activity.insert("end", res.micro_activity)
+    txt_activity.configure(state="disabled")
+
+    debug_box.configure(state="disabled")
+
+
+def render_error(e):
+    begin_report()
+    lbl_emotion.configure(text="HATA")
+    debug_box.insert("end", f"\n❌ HATA: {e}\n", "header")
+    print(e)
+    debug_box.configure(state="disabled")
+
+
+def render_mock():
+    # Mock Data
+    lbl_emotion.configure(text="TEST: MUTLU")
+    update_chart([random.uniform(-0.8, 0.8) for _ in range(5)])
+
+    lbl_track.configure(text="Test Şarkısı")
+    lbl_artist.configure(text="Test Sanatçısı")
+
+    txt_activity.configure(state="normal")
+    txt_activity.delete("1.0", "end")
+    txt_activity.insert("end", "Agent bağlı değil. Demo çıktısıdır.")
+    txt_activity.configure(state="disabled")
+
+    debug_box.insert("end", "⚠️ Agent bulunamadı, mock veriler.", "header")
 
     debug_box.configure(state="disabled")
 
@@ -302,7 +582,10 @@ city_var = ctk.StringVar(value="Bursa")
 ctk.CTkOptionMenu(c1_header, variable=city_var, values=TR_CITIES, width=130, fg_color=COLORS["accent"], button_color=COLORS["accent"]).pack(side="right")
 
 input_mood = ctk.CTkTextbox(card1, height=100, fg_color=COLORS["bg"], text_color="white", border_width=0)
-input_mood.pack(fill="x", padx=15, pady=(0, 15))
+input_mood.pack(fill="x", padx=15, pady=(0, 5))
+input_mood.bind("<KeyRelease>", on_mood_edit)
+lbl_preview = ctk.CTkLabel(card1, text="", font=("Roboto", 11), text_color=COLORS["text_sub"])
+lbl_preview.pack(anchor="w", padx=15, pady=(0, 10))
 
 # Olay & Yemek
 card2 = create_card(left_panel)
@@ -324,7 +607,9 @@ ctk.CTkRadioButton(meal_frame, text="Açım/Kötü", variable=meal_var, value=-1
 ctk.CTkRadioButton(meal_frame, text="Tokum/İyi", variable=meal_var, value=1, font=("Roboto", 11)).pack(anchor="w")
 
 # Buton
-ctk.CTkButton(left_panel, text="✨ Analiz Et ve Regüle Et", height=50, font=("Roboto", 16, "bold"), fg_color=COLORS["accent"], hover_color="#2563eb", corner_radius=12, command=run_pipeline).pack(fill="x", pady=10)
+ANALYZE_TEXT = "✨ Analiz Et ve Regüle Et"
+btn_analyze = ctk.CTkButton(left_panel, text=ANALYZE_TEXT, height=50, font=("Roboto", 16, "bold"), fg_color=COLORS["accent"], hover_color="#2563eb", corner_radius=12, command=run_pipeline)
+btn_analyze.pack(fill="x", pady=10)
 
 # Müzik & Aktivite Grid
 output_grid = ctk.CTkFrame(left_panel, fg_color="transparent")
@@ -362,10 +647,6 @@ summary_card.pack(fill="x", pady=(0, 10))
 lbl_emotion = ctk.CTkLabel(summary_card, text="ANALİZ BEKLENİYOR", font=("Roboto", 24, "bold"), text_color=COLORS["accent"])
 lbl_emotion.pack(pady=(15, 5))
 
-fig, ax = plt.subplots(figsize=(6, 3), dpi=100)
-canvas = FigureCanvasTkAgg(fig, master=summary_card)
-canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
-update_chart([0, 0, 0, 0, 0])
 
 debug_frame = ctk.CTkFrame(right_panel, fg_color="#020617", corner_radius=12)
 debug_frame.pack(fill="both", expand=True)
@@ -382,5 +663,17 @@ debug_box._textbox.tag_config("warning", foreground="#f59e0b", font=("Consolas",
 debug_box.insert("end", "Sistem hazır. Veri girişi bekleniyor...\n")
 debug_box.configure(state="disabled")
 
+STARTUP.mark("ui")
+app.after(RESULT_POLL_MS, poll_results)
+
+
+def _after_first_paint():
+    STARTUP.mark("first_paint")
+    build_chart()
+
+
+threading.Thread(target=_init_coordinator, name="agent-init", daemon=True).start()
+app.after_idle(_after_first_paint)
+
 if __name__ == "__main__":
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,352 @@
+"""
+CoordinatorAgent etrafında yerel HTTP API (yalnızca standart kütüphane).
+
+    python server.py --port 8080 --workers 2 --queue 32
+
+POST /process        {"text": ..., "city": ..., "event": ..., "meal": -1|0|1}
+POST /process_batch  {"entries": [{...}, ...]}
+GET  /healthz        süreç ayakta mı (liveness)
+GET  /readyz         BERT yüklendi mi (readiness; değilse 503)
+GET  /metrics        Prometheus metin formatı
+
+Her worker thread kendi CoordinatorAgent'ını kullanır (agent'lar thread-safe
+değil); BERT'li EmotionAgent ise tek kopya olarak paylaşılır ve eşzamanlı
+istekler micro-batching ile tek forward pass'te birleşir. Önbellek ve
+single-flight tutan Weather / Spotify agent'ları da paylaşılır: aynı şehir /
+sorgu için worker'lar arası tek upstream çağrısı yapılır. Kuyruk doluysa 429,
+iş süresinde bitmezse / sunucu kapanıyorsa 503 döner; ikisinde de
+Retry-After başlığı vardır.
+"""
+from __future__ import annotations
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CITY = "Bursa"
+MAX_BODY_BYTES = 1 << 20
+MAX_BATCH = 64
+
+
+@dataclass
+class _Job:
+    entry: dict
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[dict] = None
+    error: str = ""
+    cancelled: bool = False
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _entry_args(entry: Any) -> Tuple[str, str, Optional[str], int]:
+    if not isinstance(entry, dict):
+        raise BadRequest("kayıt JSON nesnesi olmalı")
+    text = entry.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise BadRequest("'text' zorunlu")
+    city = entry.get("city")
+    if city is not None and not isinstance(city, str):
+        raise BadRequest("'city' metin olmalı")
+    event = entry.get("event")
+    if event is not None and not isinstance(event, str):
+        raise BadRequest("'event' metin olmalı")
+    meal = entry.get("meal")
+    try:
+        meal = int(meal or 0) if not isinstance(meal, bool) else None
+    except (TypeError, ValueError):
+        meal = None
+    if meal not in (-1, 0, 1):
+        raise BadRequest("'meal' -1, 0 ya da 1 olmalı")
+    return text, city or DEFAULT_CITY, event, meal
+
+
+class ApiServer:
+    """
+    Sınırlı kuyruk + sabit sayıda worker.
+    coordinator_factory: her worker için bir CoordinatorAgent üretir.
+    """
+
+    def __init__(
+        self,
+        coordinator_factory: Callable[[], Any],
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 2,
+        queue_size: int = 32,
+        request_timeout: float = 30.0
+    ):
+        self.request_timeout = request_timeout
+        self._queue: "queue.Queue[_Job]" = queue.Queue(maxsize=queue_size)
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self.counters = {"accepted": 0, "rejected_429": 0, "rejected_503": 0, "errors": 0}
+
+        self.coordinators = [coordinator_factory() for _ in range(max(1, workers))]
+        self._threads = [
+            threading.Thread(target=self._worker, args=(c,), name=f"api-worker-{i}", daemon=True)
+            for i, c in enumerate(self.coordinators)
+        ]
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    # ================= LIFECYCLE =================
+    def start(self) -> "ApiServer":
+        for t in self._threads:
+            t.start()
+        threading.Thread(target=self.httpd.serve_forever, name="api-http", daemon=True).start()
+        return self
+
+    def serve_forever(self) -> None:
+        for t in self._threads:
+            t.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # ================= STATUS =================
+    def ready(self) -> Dict[str, Any]:
+        agents = [c.emotion_agent for c in self.coordinators]
+        errors = [str(a.model_error) for a in agents if a.model_error is not None]
+        return {
+            "ready": all(a.is_ready() for a in agents) and not self._stopping.is_set(),
+            "workers": len(agents),
+            "model_ready": sum(1 for a in agents if a.is_ready()),
+            "model_errors": errors,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+        }
+
+    def metrics_text(self) -> str:
+        from agents import telemetry
+        from agents.resilience import breakers_to_prometheus
+
+        lines = [
+            "# HELP mood2music_api_queue_depth Requests waiting for a worker.",
+            "# TYPE mood2music_api_queue_depth gauge",
+            f"mood2music_api_queue_depth {self._queue.qsize()}",
+            "# HELP mood2music_api_requests_total API requests by result.",
+            "# TYPE mood2music_api_requests_total counter",
+        ]
+        with self._lock:
+            for k, v in self.counters.items():
+                lines.append(f'mood2music_api_requests_total{{result="{k}"}} {v}')
+        text = "\n".join(lines) + "\n" + telemetry.METRICS.to_prometheus()
+        text += breakers_to_prometheus()
+        batchers = {id(c.emotion_agent): c.emotion_agent.batcher for c in self.coordinators}
+        for b in batchers.values():
+            if b is not None:
+                text += b.to_prometheus()
+        return text
+
+    # ================= QUEUE =================
+    def submit(self, entries: List[dict]) -> Tuple[int, Any]:
+        """(HTTP durum kodu, gövde). Hepsi kuyruğa sığmazsa hiçbiri işlenmez."""
+        if self._stopping.is_set():
+            return self._reject(503, "sunucu kapanıyor")
+
+        for e in entries:
+            _entry_args(e)
+
+        jobs = [_Job(e) for e in entries]
+        queued: List[_Job] = []
+        for job in jobs:
+            try:
+                self._queue.put_nowait(job)
+                queued.append(job)
+            except queue.Full:
+                for j in queued:
+                    j.cancelled = True
+                return self._reject(429, "kuyruk dolu")
+
+        with self._lock:
+            self.counters["accepted"] += 1
+
+        deadline = time.monotonic() + self.request_timeout
+        for job in jobs:
+            if not job.done.wait(max(0.0, deadline - time.monotonic())):
+                for j in jobs:
+                    j.cancelled = True
+                return self._reject(503, "zaman aşımı")
+
+        return 200, [
+            {"result": j.result} if not j.error else {"error": j.error} for j in jobs
+        ]
+
+    def _reject(self, status: int, reason: str) -> Tuple[int, Any]:
+        with self._lock:
+            self.counters[f"rejected_{status}"] += 1
+        return status, {"error": reason}
+
+    def _worker(self, coordinator) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            # İstemci vazgeçtiyse (429 geri alma / zaman aşımı) boşuna çalışma
+            if not job.cancelled:
+                try:
+                    text, city, event, meal = _entry_args(job.entry)
+                    job.result = coordinator.process(text, city, event, meal).to_dict()
+                except Exception as e:
+                    job.error = f"{type(e).__name__}: {e}"
+                    with self._lock:
+                        self.counters["errors"] += 1
+            job.done.set()
+            self._queue.task_done()
+
+    # ================= HTTP =================
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, payload: Any, content_type: str = "application/json"):
+                if content_type == "application/json":
+                    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                else:
+                    body = payload.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if status in (429, 503):
+                    self.send_header("Retry-After", "1")
+                if 400 <= status < 500:
+                    # Gövde okunmamış olabilir: keep-alive bağlantıda kalan
+                    # baytlar sonraki istek gibi parse edilmesin
+                    self.close_connection = True
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> Any:
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    raise BadRequest("geçersiz Content-Length")
+                if length < 0:
+                    raise BadRequest("geçersiz Content-Length")
+                if length > MAX_BODY_BYTES:
+                    raise BadRequest("gövde çok büyük")
+                try:
+                    return json.loads(self.rfile.read(length) or b"null")
+                except ValueError:
+                    raise BadRequest("geçersiz JSON")
+
+            def do_GET(self):
+                if self.path == "/healthz":
+                    return self._send(200, {"status": "ok"})
+                if self.path == "/readyz":
+                    status = api.ready()
+                    return self._send(200 if status["ready"] else 503, status)
+                if self.path == "/metrics":
+                    return self._send(200, api.metrics_text(), "text/plain; version=0.0.4")
+                self._send(404, {"error": "bulunamadı"})
+
+            def do_POST(self):
+                try:
+                    payload = self._read_json()
+                    if self.path == "/process":
+                        status, body = api.submit([payload])
+                        if status == 200:
+                            body = body[0]
+                            status = 500 if "error" in body else 200
+                    elif self.path == "/process_batch":
+                        entries = payload.get("entries") if isinstance(payload, dict) else None
+                        if not isinstance(entries, list) or not entries:
+                            raise BadRequest("'entries' boş olmayan liste olmalı")
+                        if len(entries) > MAX_BATCH:
+                            raise BadRequest(f"en fazla {MAX_BATCH} kayıt")
+                        status, body = api.submit(entries)
+                        if status == 200:
+                            body = {"results": body}
+                    else:
+                        return self._send(404, {"error": "bulunamadı"})
+                except BadRequest as e:
+                    return self._send(400, {"error": str(e)})
+                self._send(status, body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def shared_coordinator_factory(
+    emotion_agent=None,
+    context_agent=None,
+    spotify_agent=None,
+    event_agent_factory: Callable[[], Any] | None = None
+) -> Callable[[], Any]:
+    """
+    Worker başına CoordinatorAgent üreten fabrika. Emotion, Context (→ Weather)
+    ve Spotify agent'ları tüm worker'larda tek kopyadır; verilmezse burada
+    bir kez oluşturulur. EventAgent ve hafif agent'lar worker'a özeldir
+    (event_agent_factory verilirse her worker için ondan üretilir).
+    """
+    from agents.coordinator_agent import CoordinatorAgent
+    from agents.context_agent import ContextAgent
+    from agents.emotion_agent import EmotionAgent
+    from agents.spotify_agent import SpotifyAgent
+
+    emotion = emotion_agent or EmotionAgent(background_load=True, micro_batch=True)
+    context = context_agent or ContextAgent()
+    spotify = spotify_agent or SpotifyAgent()
+    return lambda: CoordinatorAgent(
+        emotion_agent=emotion,
+        context_agent=context,
+        spotify_agent=spotify,
+        event_agent=event_agent_factory() if event_agent_factory else None,
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="mood2music yerel HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2,
+                        help="eşzamanlı işlem (BERT modeli paylaşılır)")
+    parser.add_argument("--queue", type=int, default=32, help="bekleyen en fazla kayıt")
+    parser.add_argument("--timeout", type=float, default=30.0, help="istek başına süre (sn)")
+    args = parser.parse_args(argv)
+
+    server = ApiServer(
+        shared_coordinator_factory(),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue,
+        request_timeout=args.timeout,
+    )
+    host, port = server.address
+    print(f"mood2music API: http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+import os
+import threading
+
+from agents.affect_history import AffectHistory, DAY
+from agents.affect_vector_agent import AffectState
+
+
+STATE = AffectState(40, 60, 50, 50, 50)
+
+
+def test_repair_cuts_only_torn_record(tmp_path):
+    history = AffectHistory(str(tmp_path))
+    for i in range(3):
+        history.append("hüzün", STATE, {}, ts=1e9 + i * DAY)
+    with open(history.data_path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+    assert len(AffectHistory(str(tmp_path))) == 3
+
+
+def test_concurrent_appends_keep_day_index(tmp_path):
+    history = AffectHistory(str(tmp_path))
+
+    def worker(offset):
+        for i in range(50):
+            history.append("mutluluk", STATE, {}, ts=1e9 + (offset * 50 + i) * DAY)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(history) == 200
+    assert sorted(os.listdir(tmp_path)) == ["days.npy", "records.bin"]
+    reopened = AffectHistory(str(tmp_path))
+    assert len(reopened.between(0, 2e9)) == 200
@@ -0,0 +1,82 @@
+import math
+from itertools import product
+
+import pytest
+
+from agents import affect_batch
+from agents.affect_table import get_default_table
+from agents.affect_vector_agent import AffectVectorAgent
+from agents.regulation_agent import RegulationAgent
+
+
+EMOTIONS = affect_batch.EMOTIONS + ("bilinmeyen",)
+MICRO_SCORES = (-1, 0, 1)
+TEMPERATURES = (4.999, 5.0, 9.999, 10.0)   # bant sınırlarının iki yanı
+DAY_TYPES = ("weekday", "weekend")
+
+
+def _intensities():
+    # Tablo kesme eşiklerinin kendisi ve iki yanı + aralık dışı değerler
+    points = {-0.5, 0.0, 0.1, 0.29, 0.3, 0.35, 0.39, 0.4, 0.5, 0.75, 0.99, 1.0, 1.5}
+    for breaks in get_default_table().breaks.values():
+        for b in breaks:
+            points.update((b, math.nextafter(b, 0.0), math.nextafter(b, 2.0)))
+    return sorted(points)
+
+
+@pytest.fixture(scope="module")
+def grid():
+    # Yoğunluk yalnızca olay grubu içinde önemli: her grubun bir türü tüm
+    # eşiklerle, diğerleri birkaç değerle taranır
+    events = [(t, x) for t in ("energy_up", "pressure") for x in _intensities()]
+    events += [(t, x) for t in (None, "neutral", "stress", "energy_down") for x in (0.0, 0.45, 1.0)]
+    return [
+        (e, t, x, m, dark, temp, day)
+        for e, (t, x), m, dark, temp, day in product(
+            EMOTIONS, events, MICRO_SCORES, (False, True), TEMPERATURES, DAY_TYPES
+        )
+    ]
+
+
+def _context(dark, temp, day_type):
+    return {"is_dark": dark, "temperature": temp, "day_type": day_type}
+
+
+def test_score_batch_matches_scalar(grid):
+    scalar = AffectVectorAgent(use_table=False)
+    regulation = RegulationAgent(use_table=False)
+    emo, ev, it, micro, dark, temp, day = zip(*grid)
+    batch = affect_batch.score_batch(
+        emo, ev, it, micro, dark, temp, [d == "weekday" for d in day]
+    )
+
+    for i, (e, t, x, m, dk, tc, d) in enumerate(grid):
+        out = scalar.calculate(e, t, x, m, _context(dk, tc, d))
+        plan = regulation.plan(out.state)
+        assert batch.affect_state(i) == out.state, grid[i]
+        assert batch.breakdown_dict(i) == out.breakdown, grid[i]
+        assert batch.delta_dict(i) == plan.delta, grid[i]
+        assert batch.guidance(i) == plan.guidance, grid[i]
+
+
+def test_table_matches_scalar(grid):
+    scalar, table = AffectVectorAgent(use_table=False), AffectVectorAgent(use_table=True)
+    scalar_plan, table_plan = RegulationAgent(use_table=False), RegulationAgent(use_table=True)
+
+    for e, t, x, m, dk, tc, d in grid:
+        ctx = _context(dk, tc, d)
+        expected, got = scalar.calculate(e, t, x, m, ctx), table.calculate(e, t, x, m, ctx)
+        assert (got.state, got.breakdown, got.debug) == (
+            expected.state, expected.breakdown, expected.debug
+        ), (e, t, x, m, dk, tc, d)
+
+        p_expected, p_got = scalar_plan.plan(expected.state), table_plan.plan(got.state)
+        assert (p_got.delta, p_got.guidance, p_got.debug) == (
+            p_expected.delta, p_expected.guidance, p_expected.debug
+        ), expected.state
+
+
+def test_table_covers_discrete_grid(grid):
+    table = get_default_table()
+    for e, t, x, m, dk, tc, d in grid:
+        assert table.lookup(e, t, x, m, _context(dk, tc, d)) is not None
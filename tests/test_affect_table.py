@@ -0,0 +1,42 @@
+import pytest
+
+from agents.affect_table import get_default_table
+from agents.affect_vector_agent import AffectVectorAgent
+from agents.regulation_agent import RegulationAgent
+
+
+CONTEXT = {"is_dark": False, "temperature": 12.0, "day_type": "weekday"}
+
+
+@pytest.fixture(autouse=True)
+def built_table():
+    # Tablo arka planda kurulur; testler tablo yolunu ölçsün
+    return get_default_table()
+
+
+def test_calculate_returns_independent_breakdown():
+    agent = AffectVectorAgent()
+    first = agent.calculate("öfke", "pressure", 0.7, 0, CONTEXT)
+    expected = {k: dict(v) for k, v in first.breakdown.items()}
+
+    first.breakdown["base"]["valence"] = 999
+    first.breakdown.clear()
+    first.state.valence = -50
+
+    second = agent.calculate("öfke", "pressure", 0.7, 0, CONTEXT)
+    assert second.breakdown == expected
+    assert second.state.valence != -50
+
+
+def test_plan_returns_independent_delta_and_guidance():
+    affect = AffectVectorAgent().calculate("hüzün", None, 0.0, -1, CONTEXT)
+    agent = RegulationAgent()
+    first = agent.plan(affect.state)
+    expected_delta, expected_guidance = dict(first.delta), list(first.guidance)
+
+    first.delta["valence"] = 999
+    first.guidance.append("X")
+
+    second = agent.plan(affect.state)
+    assert second.delta == expected_delta
+    assert second.guidance == expected_guidance
@@ -0,0 +1,52 @@
+import json
+import time
+
+import batch
+from benchmarks import fakes
+from agents.context_agent import ContextAgent
+from agents.coordinator_agent import CoordinatorAgent
+from agents.event_agent import EventAgent
+from agents.llm_batch import LocalStubModel
+
+
+class SlowEventAgent(EventAgent):
+    def __init__(self):
+        super().__init__(llm=LocalStubModel(fakes.stub_classify))
+
+    def _llm_classify(self, text):
+        time.sleep(0.3)
+        return {"event_type": "energy_down", "intensity": 0.8}, "LLM: geç cevap"
+
+
+def test_degraded_stages_are_recorded(monkeypatch):
+    with fakes.StubServer() as stub:
+        coordinator = CoordinatorAgent(
+            emotion_agent=fakes.make_emotion_agent(),
+            event_agent=SlowEventAgent(),
+            context_agent=ContextAgent(fakes.make_weather_agent(stub)),
+            spotify_agent=fakes.make_spotify_agent(stub),
+            deadline=0.1,
+        )
+        monkeypatch.setattr(batch, "_coordinator", coordinator)
+        entry = {"id": 1, "text": "bugün iyiyim", "event": "toplantı notları paylaşıldı"}
+        [line] = batch._process_chunk([(1, entry, "")])
+
+    record = json.loads(line)
+    assert "result" in record
+    assert record["degraded"] == ["event"]
+
+
+def test_resume_without_output_starts_over(tmp_path, monkeypatch):
+    src = tmp_path / "in.jsonl"
+    out = tmp_path / "out.jsonl"
+    src.write_text("\n".join(json.dumps({"text": f"kayıt {i}"}) for i in range(3)) + "\n")
+    (tmp_path / "out.jsonl.ckpt").write_text(json.dumps({
+        "input": str(src), "line": 2, "out_bytes": 500,
+    }))
+    monkeypatch.setattr(batch, "_init_worker", lambda *args: None)
+    monkeypatch.setattr(batch, "_process_entry", lambda entry: {"text": entry["text"]})
+
+    assert batch.run(str(src), str(out), workers=0, resume=True) == 3
+    data = out.read_bytes()
+    assert b"\x00" not in data
+    assert [json.loads(line)["line"] for line in data.splitlines()] == [1, 2, 3]
@@ -0,0 +1,49 @@
+import time
+
+from benchmarks import fakes
+from agents import telemetry
+from agents.context_agent import ContextAgent
+from agents.coordinator_agent import CoordinatorAgent
+from agents.event_agent import EventAgent
+from agents.llm_batch import LocalStubModel
+
+
+class SlowEventAgent(EventAgent):
+    """LLM cevabı isteğin süre bütçesinden geç gelir."""
+
+    def __init__(self, delay: float):
+        super().__init__(llm=LocalStubModel(fakes.stub_classify))
+        self.delay = delay
+
+    def _llm_classify(self, text):
+        time.sleep(self.delay)
+        return {"event_type": "energy_down", "intensity": 0.8}, "LLM: geç cevap"
+
+
+class KeepTrace:
+    def write(self, trace):
+        self.trace = trace
+
+
+def test_timed_out_stage_does_not_touch_trace_or_fallback():
+    with fakes.StubServer() as stub:
+        coordinator = CoordinatorAgent(
+            emotion_agent=fakes.make_emotion_agent(),
+            event_agent=SlowEventAgent(delay=0.4),
+            context_agent=ContextAgent(fakes.make_weather_agent(stub)),
+            spotify_agent=fakes.make_spotify_agent(stub),
+            deadline=0.3,
+        )
+        coordinator.trace_writer = writer = KeepTrace()
+        result = coordinator.process("bugün iyiyim", "Bursa", "toplantı notları paylaşıldı", 0)
+        debug = list(result.debug)
+
+        time.sleep(0.5)   # terk edilen worker bitsin
+
+    event_spans = [s for s in writer.trace.spans if s.stage.startswith("event")]
+    # Yalnızca kural fallback'inin span'leri; geç gelen worker kaydı yok
+    assert [(s.stage, s.outcome) for s in event_spans] == [
+        ("event.llm", telemetry.FALLBACK), ("event", telemetry.TIMEOUT)
+    ]
+    assert result.debug == debug
+    assert "LLM: geç cevap" not in debug
@@ -0,0 +1,31 @@
+from benchmarks import fakes
+from agents.llm_batch import LocalStubModel
+from agents.result_cache import ResultCache
+
+
+class BackendEmotionAgent(fakes.OfflineEmotionAgent):
+    """Etiketi backend'e göre değişen sahte ML (örn. int8 sapması)."""
+
+    def _ml_infer(self, text):
+        return "öfke" if self.backend_name == "int8" else "mutluluk"
+
+
+def test_bert_cache_is_keyed_by_backend():
+    cache = ResultCache(":memory:")
+    text = "bugün hava çok güzel ve içim kıpır kıpır"
+
+    int8 = BackendEmotionAgent(backend="int8", cache=cache, llm=LocalStubModel())
+    eager = BackendEmotionAgent(backend="eager", cache=cache, llm=LocalStubModel())
+
+    assert int8._ml_predict(int8._normalize(text)) == "öfke"
+    assert eager._ml_predict(eager._normalize(text)) == "mutluluk"
+
+
+def test_fallback_reports_llm_as_skipped():
+    agent = fakes.OfflineEmotionAgent(cache=ResultCache(":memory:"), llm=LocalStubModel())
+    assert agent.llm_enabled
+
+    out = agent.analyze_fallback("bugün çok mutluyum, her şey yolunda")
+
+    assert "LLM(Gemini) atlandı (süre bütçesi)" in out.debug
+    assert not any(line.startswith("LLM(Gemini) sonucu") for line in out.debug)
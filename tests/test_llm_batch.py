@@ -0,0 +1,49 @@
+import pytest
+
+from agents import resilience
+from agents.event_agent import EventAgent
+from agents.llm_batch import LocalStubModel, classify_in_batches
+from agents.result_cache import ResultCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+class FailingModel:
+    """Her istekte servis hatası (örn. 429) veren model."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        raise RuntimeError("429 quota exceeded")
+
+
+def test_transport_error_does_not_split_batch():
+    model = FailingModel()
+    texts = [f"metin {i}" for i in range(100)]
+    results = classify_in_batches(model, texts, "talimat", "{}", lambda obj: obj, batch_size=20)
+
+    assert results == [None] * 100
+    assert model.calls <= 5   # grup başına en fazla bir istek
+
+
+def test_missing_items_are_split_and_retried():
+    model = LocalStubModel(drop_every=4)
+    texts = [f"metin {i}" for i in range(20)]
+    results = classify_in_batches(
+        model, texts, "talimat", "{}", lambda obj: obj.get("label"), batch_size=20
+    )
+
+    assert results == ["nötr"] * 20
+    assert model.calls > 1
+
+
+def test_event_cache_key_uses_injected_model():
+    stub = EventAgent(cache=ResultCache(":memory:"), llm=LocalStubModel())
+    key = stub.cache.make_key("gemini_event", EventAgent.LLM_MODEL, EventAgent.LLM_PROMPT_VERSION, "x")
+
+    assert stub._cache_key("x") != key
@@ -0,0 +1,75 @@
+import random
+import re
+
+from benchmarks import fakes
+from agents.event_agent import EventAgent
+from agents.llm_batch import LocalStubModel
+from agents.phrase_matcher import SUBSTRING, TOKEN, WORD
+from agents.result_cache import ResultCache
+
+
+def _reference(groups, text):
+    """PhraseMatcher öncesi kural mantığı: ifade ifade tek tek arama."""
+    out = {}
+    for category, (phrases, mode) in groups.items():
+        hits = []
+        for p in dict.fromkeys(phrases):
+            if not p:
+                continue
+            if mode == SUBSTRING:
+                ok = p in text
+            elif mode == WORD:
+                ok = re.search(rf"\b{re.escape(p)}\b", text) is not None
+            else:
+                ok = p in text.split()
+            if ok:
+                hits.append(p)
+        out[category] = hits
+    return out
+
+
+def _emotion_groups():
+    agent = fakes.OfflineEmotionAgent(cache=ResultCache(":memory:"), llm=LocalStubModel())
+    groups = {
+        "neutral": (agent.neutral_phrases, SUBSTRING),
+        "irony": (agent.irony_phrases, SUBSTRING),
+        "negation": (agent.negations, TOKEN),
+    }
+    for emo, words in agent.emotion_lexicon.items():
+        groups[f"emo:{emo}"] = (words, WORD)
+    return agent.matcher, groups
+
+
+def _event_groups():
+    agent = EventAgent(cache=ResultCache(":memory:"), llm=LocalStubModel())
+    return agent.matcher, {
+        "energy_up": (agent.energy_up_phrases, SUBSTRING),
+        "pressure": (agent.pressure_phrases, SUBSTRING),
+    }
+
+
+def _corpus(groups, n=2000, seed=0):
+    rng = random.Random(seed)
+    phrases = [p for words, _ in groups.values() for p in words]
+    fillers = ["bugün", "ama", "çok", "ve", "biraz", "", "x", "ım", "lar", "de"]
+    seps = [" ", "", ",", ".", "!", "  ", "-", "'"]
+    texts = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            parts.append(rng.choice(phrases) if rng.random() < 0.6 else rng.choice(fillers))
+            parts.append(rng.choice(seps))
+        texts.append("".join(parts).strip())
+    return texts
+
+
+def test_emotion_matcher_matches_reference():
+    matcher, groups = _emotion_groups()
+    for text in _corpus(groups):
+        assert matcher.match(text) == _reference(groups, text), text
+
+
+def test_event_matcher_matches_reference():
+    matcher, groups = _event_groups()
+    for text in _corpus(groups, seed=1):
+        assert matcher.match(text) == _reference(groups, text), text
@@ -0,0 +1,40 @@
+import pytest
+
+from agents.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class Outage(Exception):
+    pass
+
+
+class ClientError(Exception):
+    pass
+
+
+def _call(breaker, error):
+    def fn():
+        raise error
+    with pytest.raises(type(error)):
+        breaker.call(fn, is_failure=lambda e: isinstance(e, Outage))
+
+
+def test_non_outage_error_does_not_reset_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    _call(breaker, Outage())
+    _call(breaker, Outage())
+    _call(breaker, ClientError())
+    _call(breaker, Outage())
+
+    assert breaker.state == OPEN
+
+
+def test_non_outage_error_keeps_half_open_circuit_open():
+    breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.0)
+    _call(breaker, Outage())
+    assert breaker.state == HALF_OPEN
+
+    _call(breaker, ClientError())
+    assert breaker.state == HALF_OPEN   # kapanmadı, yeni deneme hakkı var
+
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
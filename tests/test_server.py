@@ -0,0 +1,113 @@
+import socket
+import threading
+
+import pytest
+
+from benchmarks import fakes
+from agents.context_agent import ContextAgent
+from server import (
+    DEFAULT_CITY, MAX_BODY_BYTES, ApiServer, BadRequest, _entry_args, shared_coordinator_factory
+)
+
+
+def test_workers_share_weather_and_spotify_upstream(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "")   # EventAgent Gemini'ye çıkmasın
+
+    with fakes.StubServer() as stub:
+        spotify = fakes.make_spotify_agent(stub)
+        factory = shared_coordinator_factory(
+            emotion_agent=fakes.make_emotion_agent(),
+            context_agent=ContextAgent(fakes.make_weather_agent(stub)),
+            spotify_agent=spotify,
+        )
+        api = ApiServer(factory, port=0, workers=4, queue_size=64).start()
+        statuses = []
+
+        def client():
+            status, _ = api.submit([{"text": "bugün çok mutluyum", "city": "Bursa"}])
+            statuses.append(status)
+
+        try:
+            threads = [threading.Thread(target=client) for _ in range(16)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            api.stop()
+
+        hits = stub.hits
+
+    assert statuses == [200] * 16
+    assert hits["/v1/current.json"] == 1
+    assert hits["/api/token"] == 1
+    # Sorgu rastgele seçilir; her farklı sorgu için tek arama
+    assert hits["/v1/search"] == spotify.cache_stats()["size"]
+
+
+def test_factory_builds_event_agent_per_worker():
+    with fakes.StubServer() as stub:
+        factory = shared_coordinator_factory(
+            emotion_agent=fakes.make_emotion_agent(),
+            context_agent=ContextAgent(fakes.make_weather_agent(stub)),
+            spotify_agent=fakes.make_spotify_agent(stub),
+            event_agent_factory=fakes.make_event_agent,
+        )
+        first, second = factory(), factory()
+
+    assert first.emotion_agent is second.emotion_agent
+    assert first.spotify_agent is second.spotify_agent
+    assert first.event_agent is not second.event_agent
+
+
+def _raw_request(address, data: bytes) -> bytes:
+    with socket.create_connection(address, timeout=5) as s:
+        s.sendall(data)
+        chunks = []
+        while True:
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class _NoCoordinator:
+    emotion_agent = None
+
+
+def test_rejected_body_closes_keep_alive_connection():
+    api = ApiServer(_NoCoordinator, port=0, workers=1).start()
+    try:
+        too_big = MAX_BODY_BYTES + 1
+        # Reddedilen gövdenin ardından gelen baytlar ikinci istek sayılmamalı
+        smuggled = b"GET /healthz HTTP/1.1\r\nHost: x\r\n\r\n"
+        raw = _raw_request(api.address, (
+            f"POST /process HTTP/1.1\r\nHost: x\r\nContent-Length: {too_big}\r\n\r\n"
+        ).encode() + smuggled)
+        assert raw.startswith(b"HTTP/1.1 400")
+        assert raw.count(b"HTTP/1.1 ") == 1
+
+        raw = _raw_request(
+            api.address, b"POST /process HTTP/1.1\r\nHost: x\r\nContent-Length: -1\r\n\r\n"
+        )
+        assert raw.startswith(b"HTTP/1.1 400")
+    finally:
+        api.stop()
+
+
+def test_entry_args_rejects_invalid_event_and_meal():
+    for entry in (
+        {"text": "merhaba", "event": {"a": 1}},
+        {"text": "merhaba", "event": ["x"]},
+        {"text": "merhaba", "meal": 7},
+        {"text": "merhaba", "meal": "çok"},
+        {"text": "merhaba", "meal": True},
+        {"text": "merhaba", "city": 34},
+    ):
+        with pytest.raises(BadRequest):
+            _entry_args(entry)
+
+    assert _entry_args({"text": "merhaba", "event": None, "meal": "-1"}) == (
+        "merhaba", DEFAULT_CITY, None, -1
+    )
@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from agents.resilience import Deadline, DeadlineExceeded
+from agents.single_flight import SingleFlight
+
+
+def test_waiter_gives_up_at_its_own_deadline():
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        return "sonuç"
+
+    leader = threading.Thread(target=flight.do, args=("k", slow))
+    leader.start()
+    started.wait()
+
+    start = time.monotonic()
+    with Deadline(0.1).activate():
+        with pytest.raises(DeadlineExceeded):
+            flight.do("k", slow)
+    assert time.monotonic() - start < 0.3
+
+    leader.join()
+    assert flight.stats()["calls"] == 1
+
+
+def test_waiter_without_deadline_shares_result():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        time.sleep(0.1)
+        return "sonuç"
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+    leader.start()
+    started.wait()
+    results.append(flight.do("k", slow))
+    leader.join()
+
+    assert results == ["sonuç", "sonuç"]
+    assert flight.stats()["coalesced"] == 1
@@ -0,0 +1,22 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from agents.spotify_agent import SpotifyAgent
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX izinleri")
+def test_token_cache_is_owner_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPOTIFY_CLIENT_ID", "id")
+    monkeypatch.setenv("SPOTIFY_CLIENT_SECRET", "secret")
+    path = tmp_path / "token.json"
+    (tmp_path / "token.json.tmp").write_text("eski")
+    os.chmod(tmp_path / "token.json.tmp", 0o644)
+
+    agent = SpotifyAgent(token_cache_path=str(path), use_catalog=False)
+    agent.token = "abc"
+    agent._save_token_cache()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
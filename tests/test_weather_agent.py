@@ -0,0 +1,14 @@
+from benchmarks import fakes
+from agents import resilience
+from agents.resilience import CLOSED
+
+
+def test_unknown_city_does_not_open_breaker(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+    with fakes.StubServer() as stub:
+        agent = fakes.make_weather_agent(stub)
+        for i in range(5):
+            assert agent.get_weather(f"Bilinmeyen {i}") == agent.FALLBACK
+        assert agent._breaker.state == CLOSED
+        assert agent.get_weather("Bursa")["weather"] == "cloudy"